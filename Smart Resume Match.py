@@ -1,548 +1,73 @@
 import streamlit as st
-import os
-import re
-import spacy
-from pdfminer.high_level import extract_text
-import requests
-import time
-from bs4 import BeautifulSoup
-from anthropic import Anthropic
+import logging
+import queue
+import tracing
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from resume_core import (
+    analysis_job_keys, get_analysis_jobs, get_job_store, get_response_cache, hydrate_job, logger, submit_analysis
+)
+
+# Seconds between checks on a running analysis job
+ANALYSIS_POLL_SECONDS = 0.5
 
 # Page configuration
 st.set_page_config(page_title="📄 AI-Powered Job Finder", layout="wide")
 st.title("📄 AI-Powered Job Finder")
 st.write("Upload your resume and get matched with job opportunities!")
 
-# Initialize Anthropic Client (Claude API)
-anthropic_api_key = "API Key"
-client = Anthropic(api_key=anthropic_api_key)
+# Show warnings and errors logged by the analysis core in the session that caused them
+class StreamlitLogHandler(logging.Handler):
+    def emit(self, record):
+        if get_script_run_ctx() is None:
+            return
+        if record.levelno >= logging.ERROR:
+            st.error(record.getMessage())
+        else:
+            st.warning(record.getMessage())
 
-# Load NLP model - make this optional to prevent immediate loading errors
 @st.cache_resource
-def load_nlp_model():
-    try:
-        return spacy.load("en_core_web_lg")
-    except:
-        st.warning("SpaCy model not found. Some features may be limited.")
-        return None
-
-nlp = load_nlp_model()
-
-# Function to extract text from a PDF
-def extract_resume_text(pdf_bytes):
-    try:
-        with open("temp_resume.pdf", "wb") as f:
-            f.write(pdf_bytes)
-        return extract_text("temp_resume.pdf")
-    except Exception as e:
-        st.error(f"Error extracting text from PDF: {e}")
-        return ""
-
-# Identify resume domain (tech vs non-tech) using Claude AI with expanded industry recognition
-def identify_resume_domain(resume_text):
-    try:
-        response = client.messages.create(
-            model="claude-3-haiku-20240307",
-            max_tokens=300,
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"""Analyze this resume and determine if it's for a technical or non-technical role.
-                    Return just "technical" or "non-technical", and the primary industry domain.
-                    
-                    For industry, be specific and choose from categories including but not limited to:
-                    - software development
-                    - data science
-                    - artificial intelligence
-                    - cybersecurity
-                    - healthcare
-                    - pharmaceuticals
-                    - biotech
-                    - finance
-                    - banking
-                    - insurance
-                    - real estate
-                    - education
-                    - marketing
-                    - advertising
-                    - media
-                    - entertainment
-                    - hospitality
-                    - retail
-                    - e-commerce
-                    - manufacturing
-                    - construction
-                    - logistics
-                    - transportation
-                    - telecommunications
-                    - energy
-                    - environmental
-                    - legal
-                    - consulting
-                    - human resources
-                    - government
-                    - nonprofit
-                    - consumer goods
-                    - agriculture
-                    - automotive
-                    
-                    Format: domain_type|industry
-                    Example: technical|software development or non-technical|healthcare
-                    
-                    Resume:
-                    {resume_text}"""
-                }
-            ]
-        )
-        domain_info = response.content[0].text.strip()
-        # Extract domain parts
-        parts = domain_info.split('|')
-        if len(parts) >= 2:
-            return {
-                "type": parts[0].strip().lower(),
-                "industry": parts[1].strip().lower()
-            }
-        return {
-            "type": "technical" if "technical" in domain_info.lower() else "non-technical", 
-            "industry": "general"
-        }
-    except Exception as e:
-        st.error(f"Error identifying resume domain: {e}")
-        return {"type": "unknown", "industry": "general"}
-
-# Extract past job titles with emphasis on timeline and role specificity
-def extract_job_titles_detailed(resume_text):
-    try:
-        response = client.messages.create(
-            model="claude-3-haiku-20240307",
-            max_tokens=1000,
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"""Extract ALL job titles from this resume with the following details:
-                    1. Include the exact job title as written
-                    2. For each job title, note if it's current or past
-                    3. Include the industry/domain for each role
-                    4. Add any level indicator (junior, senior, etc.)
-                    
-                    Format your response as a JSON array of objects with these fields:
-                    - title: The exact job title
-                    - current: true/false
-                    - industry: The industry/domain
-                    - level: Junior/Mid/Senior/Executive (if determinable)
-                    
-                    DO NOT include any explanatory text. ONLY return the JSON array.
-                    
-                    Resume:
-                    {resume_text}"""
-                }
-            ]
-        )
-        
-        response_text = response.content[0].text.strip()
-        
-        # Find JSON content between triple backticks if present
-        json_match = re.search(r'```json\s*(.*?)\s*```', response_text, re.DOTALL)
-        if json_match:
-            import json
-            try:
-                return json.loads(json_match.group(1))
-            except:
-                pass
-        
-        # Try to parse as JSON directly if not in backticks
-        try:
-            import json
-            return json.loads(response_text)
-        except:
-            # If JSON parsing fails, return a structured placeholder
-            return [{"title": "Could not parse job titles", "current": False, "industry": "unknown", "level": "unknown"}]
-            
-    except Exception as e:
-        st.error(f"Error extracting job titles: {e}")
-        return [{"title": "Error extracting job titles", "current": False, "industry": "unknown", "level": "unknown"}]
-
-# Extract key resume attributes using Claude AI
-def extract_key_resume_attributes(resume_text, domain_info, job_titles):
-    try:
-        # Prepare job titles information for Claude
-        job_titles_text = "\n".join([
-            f"- {job['title']} " + 
-            f"({'Current' if job['current'] else 'Past'}, {job['industry']}, {job['level']})"
-            for job in job_titles
-        ])
-        
-        response = client.messages.create(
-            model="claude-3-haiku-20240307",
-            max_tokens=1500,
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"""Analyze this resume for a {domain_info['type']} role in the {domain_info['industry']} industry.
-                    
-                    The identified job titles are:
-                    {job_titles_text}
-                    
-                    Extract the following key attributes in a structured format:
-                    
-                    1. Professional Skills (technical and soft skills)
-                    2. Experience Level (entry, mid, senior)
-                    3. Core Expertise Areas (main domains of expertise)
-                    4. Industries (sectors the person has worked in)
-                    5. Education Background
-                    6. Key Achievements
-                    7. Years of Experience
-                    8. Related Job Titles (other roles this person would be qualified for)
-                    
-                    Format your response as JSON with these category keys. For each category, provide an array of values.
-                    
-                    Resume:
-                    {resume_text}"""
-                }
-            ]
-        )
-        
-        # Extract the JSON part from Claude's response
-        response_text = response.content[0].text
-        
-        # Find JSON content between triple backticks if present
-        json_match = re.search(r'```json\s*(.*?)\s*```', response_text, re.DOTALL)
-        if json_match:
-            import json
-            try:
-                return json.loads(json_match.group(1))
-            except:
-                pass
-                
-        # If no JSON found or parsing failed, try to extract structured data using regex
-        attributes = {}
-        categories = [
-            "Professional Skills", "Experience Level", "Core Expertise Areas", 
-            "Industries", "Education Background", "Key Achievements",
-            "Years of Experience", "Related Job Titles"
-        ]
-        
-        for category in categories:
-            pattern = rf'{category}[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)'
-            match = re.search(pattern, response_text, re.DOTALL)
-            if match:
-                # Convert to list by splitting on commas, semicolons, or newlines
-                items = re.split(r'[,;\n]+', match.group(1).strip())
-                attributes[category] = [item.strip() for item in items if item.strip()]
-            else:
-                attributes[category] = []
-                
-        return attributes
-        
-    except Exception as e:
-        st.error(f"Error calling Claude API for resume attributes: {e}")
-        return {
-            "Professional Skills": [],
-            "Experience Level": [],
-            "Core Expertise Areas": [],
-            "Industries": [],
-            "Education Background": [],
-            "Key Achievements": [],
-            "Years of Experience": [],
-            "Related Job Titles": []
-        }
-
-# Get resume summary
-def summarize_resume(resume_text, domain_info):
-    try:
-        response = client.messages.create(
-            model="claude-3-haiku-20240307",
-            max_tokens=800,
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"Summarize the following resume for a {domain_info['type']} role in the {domain_info['industry']} industry. Focus on career trajectory, key skills, and qualifications. Be concise and highlight the most impressive aspects:\n\n{resume_text}"
-                }
-            ]
-        )
-        return response.content[0].text
-    except Exception as e:
-        st.error(f"Error calling Claude API for summarization: {e}")
-        return "Could not generate resume summary. Please check your API key."
-
-# Get resume improvements
-def get_resume_improvements(resume_text, domain_info):
-    try:
-        response = client.messages.create(
-            model="claude-3-haiku-20240307",
-            max_tokens=1000,
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"You are a professional resume reviewer for {domain_info['type']} roles in the {domain_info['industry']} industry. Based on the following resume, suggest 3-5 specific areas of improvement. Focus on content, structure, and presentation. Be constructive and specific. Here's the resume text:\n\n{resume_text}"
-                }
-            ]
-        )
-        return response.content[0].text
-    except Exception as e:
-        st.error(f"Error calling Claude API for improvements: {e}")
-        return "Could not generate improvement suggestions. Please check your API key."
-
-# Extract Contact Info
-def extract_contact_info(text):
-    email_pattern = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-    phone_pattern = r'\+?\d{1,3}[-.\s]?\(?\d{2,4}\)?[-.\s]?\d{2,4}[-.\s]?\d{4}'
-    linkedin_pattern = r'linkedin\.com/in/[a-zA-Z0-9_-]+'
-    
-    emails = re.findall(email_pattern, text)
-    phones = re.findall(phone_pattern, text)
-    linkedin = re.findall(linkedin_pattern, text)
-    
-    return {
-        "Email": emails[0] if emails else "Not Found",
-        "Phone": phones[0] if phones else "Not Found",
-        "LinkedIn": linkedin[0] if linkedin else "Not Found"
-    }
-
-# Generate search terms based on job titles and domain
-def generate_search_terms(job_titles, resume_attributes, domain_info):
-    search_terms = []
-    
-    # Always prioritize the most recent job titles
-    current_jobs = [job["title"] for job in job_titles if job.get("current", False)]
-    if current_jobs:
-        search_terms.extend(current_jobs[:2])
-    
-    # Add past job titles if we need more terms
-    past_jobs = [job["title"] for job in job_titles if not job.get("current", False)]
-    if past_jobs and len(search_terms) < 2:
-        search_terms.extend(past_jobs[:2 - len(search_terms)])
-    
-    # Add related job titles from attributes
-    if "Related Job Titles" in resume_attributes and resume_attributes["Related Job Titles"] and len(search_terms) < 3:
-        search_terms.extend(resume_attributes["Related Job Titles"][:3 - len(search_terms)])
-    
-    # Add industry-specific terms for non-tech roles
-    if domain_info["type"] == "non-technical" and domain_info["industry"] != "general":
-        industry_term = f"{domain_info['industry']} {job_titles[0]['title'] if job_titles else ''}"
-        search_terms.append(industry_term.strip())
-    
-    # Ensure we have at least one search term
-    if not search_terms:
-        search_terms = ["entry level"] if "entry" in str(resume_attributes.get("Experience Level", [])).lower() else ["experienced"]
-    
-    # Remove duplicates and limit
-    return list(set(search_terms))[:4]
-
-
-def find_job_details(job_url):
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-    }
+def install_log_handler():
+    handler = StreamlitLogHandler(level=logging.WARNING)
+    logger.addHandler(handler)
+    return handler
+
+install_log_handler()
+
+# Render one scored job into its slot
+def render_job_card(slot, job_match):
+    job = job_match["job"]
+    score = job_match["score"]
+    factors = job_match["factors"]
+    match = job_match.get("match")
+    # Jobs whose requirements could not be read are only ranked on their title
+    label = f"Match: {score}%" if not match or match.get("scored", True) else "Not scored"
     
-    try:
-        response = requests.get(job_url, headers=headers, timeout=10)
-        if response.status_code != 200:
-            return "Description not available"
+    with slot.container():
+        with st.expander(f"🚀 {job['Job Title']} at {job['Company']} - {label}"):
+            st.markdown(f"""
+            **Company:** {job['Company']}  
+            **Location:** {job['Location']}  
+            **Found via search term:** {job['Search Term']}
             
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        # Try to extract job description
-        description_element = soup.find("div", class_="description__text")
-        if description_element:
-            description = description_element.get_text(strip=True)
-        else:
-            # If not found, try alternative selectors
-            description_element = soup.find("section", class_="show-more-less-html")
-            description = description_element.get_text(strip=True) if description_element else "Description not available"
+            **Match Analysis:**
+            """)
             
-        return description
-    except Exception as e:
-        return "Description not available"
-
-def find_linkedin_jobs(search_terms, location, domain_info, num_jobs=6):
-    job_results = []
-    
-    # Safety check
-    if not search_terms:
-        return job_results
-    
-    st.write(f"Searching for jobs using terms: {', '.join(search_terms)}")
-    
-    for search_term in search_terms:
-        search_query = search_term.replace(" ", "%20")
-        location_query = location.replace(" ", "%20")
-        
-        # Add domain/industry context for non-tech roles
-        if domain_info["type"] == "non-technical" and domain_info["industry"] != "general":
-            if domain_info["industry"] not in search_term.lower():
-                search_query = f"{domain_info['industry']}%20{search_query}"
-        
-        url = f"https://www.linkedin.com/jobs/search?keywords={search_query}&location={location_query}"
-
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        }
-        
-        try:
-            response = requests.get(url, headers=headers, timeout=10)
+            # Display match factors
+            for factor in factors:
+                st.markdown(f"- {factor}")
             
-            if response.status_code != 200:
-                continue
-
-            soup = BeautifulSoup(response.text, "html.parser")
-            job_cards = soup.find_all("div", class_="base-card")[:num_jobs]
-
-            for job in job_cards:
-                try:
-                    title_tag = job.find("h3", class_="base-search-card__title")
-                    company_tag = job.find("h4", class_="base-search-card__subtitle")
-                    location_tag = job.find("span", class_="job-search-card__location")
-                    link_tag = job.find("a", class_="base-card__full-link")
-                    
-                    # Check if we already have this job to avoid duplicates
-                    job_title_text = title_tag.text.strip() if title_tag else "Not Found"
-                    company_text = company_tag.text.strip() if company_tag else "Not Found"
-                    job_link = link_tag["href"] if link_tag else "#"
-                    
-                    # Simple duplicate check
-                    duplicate = False
-                    for existing_job in job_results:
-                        if (existing_job["Job Title"] == job_title_text and 
-                            existing_job["Company"] == company_text):
-                            duplicate = True
-                            break
-                    
-                    if not duplicate:
-                        description = find_job_details(job_link)
-                        
-                        job_results.append({
-                            "Job Title": job_title_text,
-                            "Company": company_text,
-                            "Location": location_tag.text.strip() if location_tag else location,
-                            "Description": description,
-                            "Job Link": job_link,
-                            "Search Term": search_term
-                        })
-                except:
-                    # Skip this job card if there's an error parsing it
-                    continue
-
-            # Add a small delay between requests
-            time.sleep(1)
-        
-        except Exception as e:
-            st.warning(f"Error scraping jobs for {search_term}")
-            continue
-    
-    return job_results
-
-# Use Claude to analyze job matches with domain awareness
-def analyze_job_match(resume_attributes, job_info, domain_info, job_titles):
-    try:
-        # Format resume attributes for Claude
-        attributes_text = "\n".join([
-            f"{key}:\n- " + "\n- ".join(values) 
-            for key, values in resume_attributes.items() if values
-        ])
-        
-        # Format job titles specifically
-        job_titles_text = "\n".join([
-            f"- {job['title']} ({'Current' if job['current'] else 'Past'}, {job['industry']}, {job['level']})"
-            for job in job_titles
-        ])
-        
-        job_text = f"""
-        Job Title: {job_info['Job Title']}
-        Company: {job_info['Company']}
-        Location: {job_info['Location']}
-        Description: {job_info['Description']}
-        """
-        
-        response = client.messages.create(
-            model="claude-3-haiku-20240307",
-            max_tokens=800,
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"""Analyze how well the following job matches with the candidate's profile. This candidate has a {domain_info['type']} background in the {domain_info['industry']} industry.
-                    
-                    Candidate's Job History:
-                    {job_titles_text}
-                    
-                    Resume Attributes:
-                    {attributes_text}
-                    
-                    Job Information:
-                    {job_text}
-                    
-                    Score the match from 0-100 with 100 being a perfect match. Put extra emphasis on past job titles and industry alignment.
-                    
-                    Then provide exactly three bullet points explaining why this job is or isn't a good match.
-                    
-                    Format your response as follows:
-                    Match Score: [number]
-                    
-                    Key Match Factors:
-                    • [first point]
-                    • [second point]
-                    • [third point]
-                    """
-                }
-            ]
-        )
-        
-        # Parse the response to extract score and match factors
-        response_text = response.content[0].text
-        
-        # Extract score
-        score_match = re.search(r'Match Score:\s*(\d+)', response_text)
-        score = int(score_match.group(1)) if score_match else 50
-        
-        # Extract key factors
-        factors_section = re.search(r'Key Match Factors:(.*?)($|(?=\n\n))', response_text, re.DOTALL)
-        factors = []
-        if factors_section:
-            # Extract bullet points
-            bullet_points = re.findall(r'•\s*(.*?)(?=\n•|\n\n|$)', factors_section.group(1), re.DOTALL)
-            factors = [point.strip() for point in bullet_points if point.strip()]
-        
-        return {
-            "score": score,
-            "factors": factors if factors else ["No specific factors identified"]
-        }
-    except Exception as e:
-        st.error(f"Error analyzing job match: {str(e)}")
-        return {
-            "score": 50,  # Default middle score
-            "factors": ["Could not analyze match details"]
-        }
-
-# Rank jobs using Claude's analysis with domain awareness
-def rank_jobs(job_listings, resume_attributes, domain_info, job_titles):
-    if not job_listings:
-        return []
-    
-    ranked_jobs = []
-    
-    # Create a progress bar
-    job_analysis_progress = st.progress(0)
-    total_jobs = len(job_listings)
-    
-    # Analyze each job
-    for i, job in enumerate(job_listings):
-        job_analysis_progress.progress((i) / total_jobs)
-        match_result = analyze_job_match(resume_attributes, job, domain_info, job_titles)
-        ranked_jobs.append({
-            "job": job,
-            "score": match_result["score"],
-            "factors": match_result["factors"]
-        })
-        # Update progress
-        job_analysis_progress.progress((i + 1) / total_jobs)
-    
-    # Sort by score descending
-    ranked_jobs.sort(key=lambda x: x["score"], reverse=True)
-    
-    # Complete the progress
-    job_analysis_progress.progress(1.0)
-    
-    return ranked_jobs
+            if match and (match["matched_skills"] or match["missing_skills"]):
+                st.caption(f"✅ Skills matched: {', '.join(match['matched_skills']) or 'none'}  \n"
+                           f"❌ Skills missing: {', '.join(match['missing_skills']) or 'none'}")
+            
+            # Display job description preview (truncated)
+            if job['Description'] and job['Description'] != "Description not available":
+                preview = job['Description'][:300] + "..." if len(job['Description']) > 300 else job['Description']
+                st.markdown("**Description Preview:**")
+                st.markdown(f"{preview}")
+            
+            # Apply button
+            st.markdown(f"[Apply for this Job]({job['Job Link']})")
 
 # Streamlit UI
 st.sidebar.title("Resume Analyzer")
@@ -603,130 +128,233 @@ if custom_location != st.session_state.selected_location:
 # Get final location value
 location = st.session_state.selected_location
 
+# Optionally search a shortlist of further locations at the same time
+extra_locations = st.sidebar.multiselect(
+    "Also search in:",
+    [loc for loc in popular_locations if loc != location],
+    key="extra_locations"
+)
+locations = [location] + extra_locations
+location_label = ", ".join(locations)
+
+# Optionally analyze the resume with one structured Claude request instead of five separate prompts
+consolidated_extraction = st.sidebar.checkbox(
+    "⚡ Single-request analysis",
+    value=False,
+    help="Extract domain, job history, attributes, summary and improvements with one Claude call"
+)
+
+# Optionally show where the time of the last analysis went
+show_diagnostics = st.sidebar.checkbox(
+    "🩺 Show diagnostics",
+    value=False,
+    help="Per-stage timings, Claude token usage, HTTP requests and cache hit rates of the last analysis"
+)
+
+# Analyses run as background jobs (see analysis_jobs), submitted only when Analyze is clicked. The
+# job ID is kept in the page URL, so later reruns, a refresh or another tab just follow that job.
+# Analyzing the same resume for another location reuses its analysis and only searches and ranks
+# again; clicking Analyze on the job already shown runs it afresh, resume analysis included.
 if uploaded_file and st.sidebar.button("🔍 Analyze Resume"):
+    _, job_id = analysis_job_keys(uploaded_file.getvalue(), locations, consolidated=consolidated_extraction)
     try:
-        with st.spinner("Processing your resume..."):
-            # Extract text
-            resume_text = extract_resume_text(uploaded_file.getvalue())
-            
-            if not resume_text:
-                st.error("Could not extract text from the uploaded PDF. Please try another file.")
-            else:
-                # Step 1: Identify resume domain (tech vs non-tech)
-                with st.spinner("Identifying resume domain..."):
-                    domain_info = identify_resume_domain(resume_text)
-                    st.write(f"📊 Resume Domain: **{domain_info['type'].title()}** in **{domain_info['industry'].title()}** industry")
-                
-                # Step 2: Extract job titles with detailed information
-                with st.spinner("Extracting job history..."):
-                    job_titles = extract_job_titles_detailed(resume_text)
-                
-                # Step 3: Extract all other resume attributes
-                with st.spinner("Extracting key resume attributes..."):
-                    resume_attributes = extract_key_resume_attributes(resume_text, domain_info, job_titles)
-                    
-                # Step 4: Generate insights
-                with st.spinner("Generating insights..."):
-                    resume_summary = summarize_resume(resume_text, domain_info)
-                    improvement_suggestions = get_resume_improvements(resume_text, domain_info)
-                
-                # Step 5: Extract contact info
-                contact_info = extract_contact_info(resume_text)
-                
-                # Step 6: Generate search terms based on job titles and domain
-                search_terms = generate_search_terms(job_titles, resume_attributes, domain_info)
-                
-                # Step 7: Fetch job listings based on search terms and domain
-                with st.spinner(f"Finding matching jobs in {location}..."):
-                    job_listings = find_linkedin_jobs(search_terms, location, domain_info)
-                    
-                    if job_listings:
-                        with st.spinner("Analyzing job matches... This may take a moment"):
-                            ranked_jobs = rank_jobs(job_listings, resume_attributes, domain_info, job_titles)
-                    else:
-                        ranked_jobs = []
-                
-                # Display results in two columns
-                col1, col2 = st.columns([1, 1])
-                
-                with col1:
-                    # Resume Domain
-                    st.subheader("🌐 Resume Profile")
-                    st.write(f"**Domain:** {domain_info['type'].title()}")
-                    st.write(f"**Industry:** {domain_info['industry'].title()}")
-                    
-                    # Job History
-                    st.subheader("💼 Job History")
-                    
-                    for job in job_titles:
-                        status = "🟢 Current" if job.get("current", False) else "🔵 Past"
-                        st.write(f"{status}: **{job['title']}** ({job['industry']}, {job['level']})")
-                    
-                    # Resume Summary
-                    st.subheader("🌟 Resume Summary")
-                    st.info(resume_summary)
-                    
-                    # Improvement Suggestions
-                    st.subheader("✨ Areas for Improvement")
-                    st.info(improvement_suggestions)
-                    
-                    # Key Resume Attributes (in expanders to save space)
-                    st.subheader("📊 Key Resume Attributes")
-                    
-                    for category, items in resume_attributes.items():
-                        if items and category not in ["Years of Experience", "Experience Level"]:
-                            with st.expander(f"{category}"):
-                                st.write(", ".join(items))
-                    
-                    # Contact Info
-                    if contact_info:
-                        with st.expander("📝 Contact Information"):
-                            for key, value in contact_info.items():
-                                if value != "Not Found":
-                                    st.write(f"{key}: {value}")
-                
-                with col2:
-                    st.subheader("🎯 Job Matches")
-                    
-                    # Show search location and terms used
-                    st.caption(f"Location: **{location}**")
-                    st.caption(f"Search terms: {', '.join(search_terms)}")
-                    
-                    if ranked_jobs:
-                        for job_match in ranked_jobs:
-                            job = job_match["job"]
-                            score = job_match["score"]
-                            factors = job_match["factors"]
-                            
-                            # Create a color based on the score (from red to green)
-                            color = f"hsl({min(score * 1.2, 120)}, 70%, 50%)"
-                            
-                            with st.expander(f"🚀 {job['Job Title']} at {job['Company']} - Match: {score}%"):
-                                st.markdown(f"""
-                                **Company:** {job['Company']}  
-                                **Location:** {job['Location']}  
-                                **Found via search term:** {job['Search Term']}
-                                
-                                **Match Analysis:**
-                                """)
-                                
-                                # Display match factors
-                                for factor in factors:
-                                    st.markdown(f"- {factor}")
-                                
-                                # Display job description preview (truncated)
-                                if job['Description'] and job['Description'] != "Description not available":
-                                    preview = job['Description'][:300] + "..." if len(job['Description']) > 300 else job['Description']
-                                    st.markdown("**Description Preview:**")
-                                    st.markdown(f"{preview}")
-                                
-                                # Apply button
-                                st.markdown(f"[Apply for this Job]({job['Job Link']})")
-                    else:
-                        st.error(f"No job matches found in {location}. Try a different location or update your resume with more relevant keywords.")
-                
-                st.success("🎉 Analysis Complete! Your resume has been analyzed and job matches have been found.")
+        st.query_params["job"] = submit_analysis(
+            uploaded_file.getvalue(), locations, consolidated=consolidated_extraction,
+            owner=get_script_run_ctx().session_id, force=job_id == st.query_params.get("job")
+        )
+    except queue.Full:
+        st.error("Too many analyses are waiting to run. Please try again in a minute.")
+
+# Render an analysis job, complete or as far as it has got
+def render_analysis(job, progress_area, col1, col2):
+    result = job["result"]
+    if job["status"] == "queued":
+        progress_area.progress(0.0, text=f"Waiting for a free worker ({job['position']} analyses ahead)...")
+    elif job["status"] == "running":
+        progress_area.progress(job["progress"], text=job["message"])
+    else:
+        progress_area.empty()
+    
+    with col1.container():
+        if "domain_info" in result:
+            domain_info = result["domain_info"]
+            st.subheader("🌐 Resume Profile")
+            st.write(f"**Domain:** {domain_info['type'].title()}")
+            st.write(f"**Industry:** {domain_info['industry'].title()}")
+        
+        if "job_titles" in result:
+            st.subheader("💼 Job History")
+            for job_title in result["job_titles"]:
+                status = "🟢 Current" if job_title.get("current", False) else "🔵 Past"
+                st.write(f"{status}: **{job_title['title']}** ({job_title['industry']}, {job_title['level']})")
+        
+        # Summary and improvements appear as they are written
+        if "resume_summary" in result:
+            st.subheader("🌟 Resume Summary")
+            st.info(result["resume_summary"])
+        if "improvement_suggestions" in result:
+            st.subheader("✨ Areas for Improvement")
+            st.info(result["improvement_suggestions"])
+        
+        if "resume_attributes" in result:
+            # Key Resume Attributes (in expanders to save space)
+            st.subheader("📊 Key Resume Attributes")
+            for category, items in result["resume_attributes"].items():
+                if items and category not in ["Years of Experience", "Experience Level"]:
+                    with st.expander(f"{category}"):
+                        st.write(", ".join(items))
+        
+        contact_info = result.get("contact_info")
+        if contact_info:
+            with st.expander("📝 Contact Information"):
+                for key, value in contact_info.items():
+                    if value != "Not Found":
+                        st.write(f"{key}: {value}")
+    
+    with col2.container():
+        st.subheader("🎯 Job Matches")
+        if "search_terms" not in result or "locations" not in result:
+            st.caption("Job matches will appear here once the resume has been analyzed.")
+            return
+        
+        # Show search location and terms used
+        st.caption(f"Location: **{', '.join(result['locations'])}**")
+        st.caption(f"Search terms: {', '.join(result['search_terms'])}")
+        
+        # Scored jobs best first, then the jobs still being scored
+        ranked_jobs = result.get("ranked_jobs", [])
+        scored = {job_match["job"]["Job Link"] for job_match in ranked_jobs}
+        for job_match in ranked_jobs:
+            render_job_card(st.empty(), job_match)
+        for listing in result.get("job_listings", []):
+            if listing["Job Link"] not in scored:
+                st.caption(f"⏳ {listing['Job Title']} at {listing['Company']} - scoring...")
+        if "job_listings" not in result and result.get("jobs_found"):
+            st.caption(f"Found {result['jobs_found']} job listings so far...")
+        
+        if job["status"] == "done" and not ranked_jobs:
+            st.error(f"No job matches found in {', '.join(result['locations'])}. Try a different location or update your resume with more relevant keywords.")
+
+# A queued or running job as far as it has got. Only this fragment re-runs while the job runs, every
+# ANALYSIS_POLL_SECONDS, so the script thread is free in between and the sidebar stays responsive;
+# once the job has finished, the whole page runs again to show the final results.
+def follow_analysis(job_id):
+    job = get_analysis_jobs().status(job_id)
+    if job is None or job["status"] in ("done", "failed"):
+        st.rerun()
+    progress_area = st.empty()
+    col1, col2 = st.columns([1, 1])
+    render_analysis(job, progress_area, col1, col2)
+
+job_id = st.query_params.get("job")
+job = get_analysis_jobs().status(job_id) if job_id else None
+if job_id and job is None:
+    st.warning("This analysis is no longer available. Please upload your resume and analyze it again.")
+elif job and job["status"] in ("queued", "running"):
+    st.fragment(follow_analysis, run_every=ANALYSIS_POLL_SECONDS)(job_id)
+elif job:
+    progress_area = st.empty()
+    col1, col2 = st.columns([1, 1])
+    render_analysis(job, progress_area, col1, col2)
     
-    except Exception as e:
-        st.error(f"An error occurred: {str(e)}")
+    if job["status"] == "failed":
+        st.error(f"An error occurred: {job['error']}")
         st.error("Please try again with a different resume file or contact support.")
+    else:
+        for message in job["result"].get("notices", []) + job["result"].get("errors", []):
+            st.warning(message)
+        st.success("🎉 Analysis Complete! Your resume has been analyzed and job matches have been found.")
+    
+    # Listings that did not make the shortlist; their descriptions are only fetched when asked for
+    more_listings = job["result"].get("more_listings") if job["status"] == "done" else None
+    if more_listings:
+        with col2:
+            st.subheader("🔎 More Listings")
+            st.caption("Ranked on title, company and location only, without being scored against your resume.")
+            descriptions = st.session_state.setdefault("descriptions", {})
+            for number, listing in enumerate(more_listings):
+                with st.expander(f"{listing['Job Title']} at {listing['Company']} - Quick match: {listing['Card Score']}%"):
+                    st.markdown(f"**Location:** {listing['Location']}  \n"
+                                f"**Found via search term:** {listing['Search Term']}")
+                    link = listing["Job Link"]
+                    if link not in descriptions and st.button("Load description", key=f"describe_{number}"):
+                        descriptions[link] = hydrate_job(listing)["Description"]
+                    if link in descriptions:
+                        st.markdown(descriptions[link])
+                    st.markdown(f"[Apply for this Job]({link})")
+    if job.get("trace") is not None:
+        st.session_state.last_trace = job["trace"]
+
+# Diagnostics of the last analysis in this session
+if show_diagnostics and "last_trace" in st.session_state:
+    trace = st.session_state.last_trace
+    summary = trace.summary()
+    with st.expander("🩺 Diagnostics", expanded=True):
+        st.write(
+            f"**Total:** {summary['seconds']:.2f}s · **Claude:** {summary['claude_requests']} requests, "
+            f"{summary['input_tokens']} input / {summary['output_tokens']} output tokens, "
+            f"{summary['claude_wait_seconds']:.2f}s queued · **HTTP:** {summary['http_requests']} requests, "
+            f"p50 {summary['http_p50_seconds']:.2f}s, max {summary['http_max_seconds']:.2f}s"
+        )
+        if summary["prompt_tokens_original"]:
+            st.caption(
+                f"Prompt budgets saved ~{summary['prompt_tokens_saved']} of "
+                f"{summary['prompt_tokens_original']} estimated resume and job description tokens"
+            )
+        
+        st.markdown("**Stages**")
+        st.dataframe(
+            [{"Stage": span["name"], "Start (s)": span["start"], "Seconds": span["seconds"]}
+             for span in sorted(trace.spans, key=lambda span: span["start"])],
+            use_container_width=True
+        )
+        
+        if trace.claude_calls:
+            st.markdown("**Claude requests**")
+            st.dataframe(
+                [{"Function": call["function"], "Seconds": call["seconds"], "Queued (s)": call["wait_seconds"],
+                  "Input tokens": call["input_tokens"], "Output tokens": call["output_tokens"],
+                  "Error": call.get("error", "")}
+                 for call in sorted(trace.claude_calls, key=lambda call: call["start"])],
+                use_container_width=True
+            )
+        
+        if summary["http_status"]:
+            st.markdown("**HTTP status codes:** " + ", ".join(
+                f"{status}: {count}" for status, count in sorted(summary["http_status"].items())
+            ))
+        
+        for cache, outcomes in summary["caches"].items():
+            counts = ", ".join(f"{outcome} {count}" for outcome, count in outcomes.items() if outcome != "hit_rate")
+            st.caption(f"{cache}: {outcomes['hit_rate']:.0%} hit rate ({counts})")
+        
+        col1, col2 = st.columns(2)
+        col1.download_button(
+            "Download trace (JSON lines)", trace.to_jsonl(),
+            file_name=f"trace-{trace.trace_id}.jsonl", mime="application/jsonl"
+        )
+        col2.download_button(
+            "Download metrics (Prometheus)", tracing.metrics.prometheus_text(),
+            file_name="resume_match.prom", mime="text/plain"
+        )
+
+# Claude response cache statistics
+cache_stats = get_response_cache().stats()
+st.sidebar.caption(
+    f"Claude cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+    f"({cache_stats['entries']} stored responses)"
+)
+
+# Background analysis jobs
+job_stats = get_analysis_jobs().stats()
+st.sidebar.caption(
+    f"Analyses: {job_stats['running']} running, {job_stats['queued']} waiting, "
+    f"{job_stats['coalesced']} shared with an identical running analysis"
+)
+
+# Job posting store statistics
+store_stats = get_job_store().stats()
+st.sidebar.caption(
+    f"Job store: {store_stats['postings']} postings, {store_stats['hits']} reused / "
+    f"{store_stats['revalidated']} revalidated / {store_stats['misses']} downloaded"
+)
@@ -0,0 +1,244 @@
+import copy
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+# Background jobs for resume analyses.
+# Jobs wait in a bounded queue and run on a fixed pool of worker threads instead of inside a
+# browser session's script run, so a slow analysis does not pin the session and survives a page
+# refresh. Queued jobs are taken round-robin across owners (browser sessions), so one user
+# submitting several analyses cannot hold up everyone else. A job's ID is derived from its
+# inputs by the caller: submitting a job that is already queued or running returns the same ID
+# instead of running it twice. Finished results are kept in SQLite for keep_seconds, where any
+# session (or a later process) finds them by ID, unless they carry "errors": a result that fell
+# back to defaults is only shown, never reused, so submitting the job again retries it.
+# Resume analyses are saved separately (save_analysis) for analysis_keep_seconds, so a new job on
+# the same resume can reuse a successful analysis without reusing the rest of an earlier result.
+# run(payload, update) does the work and returns the result dict; update(progress, message,
+# trace, **fields) publishes progress and partial results while it runs.
+class AnalysisJobs:
+    def __init__(self, run, path, max_workers=4, max_queued=32, keep_seconds=24 * 3600,
+                 analysis_keep_seconds=7 * 24 * 3600, keep_finished=64):
+        self.run = run
+        self.max_queued = max_queued
+        self.keep_seconds = keep_seconds
+        self.analysis_keep_seconds = analysis_keep_seconds
+        self.keep_finished = keep_finished
+        self.submitted = 0
+        self.coalesced = 0
+        self._jobs = {}  # job ID -> state of queued and running jobs
+        self._finished = OrderedDict()  # job ID -> state of recently finished jobs, oldest first
+        self._queues = {}  # owner -> deque of queued job IDs
+        self._owners = deque()  # owners with queued jobs, in round-robin order
+        self._condition = threading.Condition()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS results (
+                job_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                finished_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS analyses (
+                analysis_key TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                saved_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("DELETE FROM results WHERE finished_at < ?", (time.time() - keep_seconds,))
+        self._conn.execute("DELETE FROM analyses WHERE saved_at < ?", (time.time() - analysis_keep_seconds,))
+        self._conn.commit()
+
+        self._workers = [
+            threading.Thread(target=self._work, name=f"analysis-worker-{number}", daemon=True)
+            for number in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _stored(self, job_id):
+        with self._condition:
+            row = self._conn.execute(
+                "SELECT data, finished_at FROM results WHERE job_id = ? AND finished_at >= ?",
+                (job_id, time.time() - self.keep_seconds)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"id": job_id, "status": DONE, "progress": 1.0, "message": "Done", "result": json.loads(row[0]),
+                "error": None, "finished_at": row[1]}
+
+    # A finished job whose result can be served again instead of running the job
+    def _reusable(self, job):
+        return (job["status"] == DONE and not job["result"].get("errors")
+                and time.time() - job["finished_at"] <= self.keep_seconds)
+
+    # Queue a job and return its ID. A job with this ID that is queued or running is joined, and
+    # one that finished successfully is not run again unless force is set (a failed or degraded
+    # one always is). Raises queue.Full when max_queued jobs are already waiting.
+    def submit(self, job_id, payload, owner=None, force=False):
+        with self._condition:
+            if job_id in self._jobs:
+                self.coalesced += 1
+                return job_id
+            finished = self._finished.get(job_id)
+            if not force and finished is not None and self._reusable(finished):
+                return job_id
+        if not force and self._stored(job_id) is not None:
+            return job_id
+
+        with self._condition:
+            if job_id in self._jobs:
+                self.coalesced += 1
+                return job_id
+            if sum(len(jobs) for jobs in self._queues.values()) >= self.max_queued:
+                raise queue.Full(f"{self.max_queued} analyses are already waiting")
+            self._finished.pop(job_id, None)
+            self._jobs[job_id] = {
+                "id": job_id, "status": QUEUED, "progress": 0.0, "message": "Waiting for a free worker",
+                "result": {}, "error": None, "submitted_at": time.time(), "trace": None,
+                "owner": owner, "payload": payload,
+            }
+            if owner not in self._queues:
+                self._queues[owner] = deque()
+                self._owners.append(owner)
+            self._queues[owner].append(job_id)
+            self.submitted += 1
+            self._condition.notify()
+        return job_id
+
+    # A snapshot of the job: id, status, progress (0-1), message, result (partial while it runs),
+    # error, and while queued its position in the queue. None for unknown (or expired) jobs.
+    def status(self, job_id):
+        with self._condition:
+            job = self._jobs.get(job_id) or self._finished.get(job_id)
+            if job is not None:
+                snapshot = {key: value for key, value in job.items() if key not in ("payload", "owner", "trace")}
+                snapshot = copy.deepcopy(snapshot)
+                snapshot["trace"] = job["trace"]
+                if job["status"] == QUEUED:
+                    snapshot["position"] = self._position(job_id)
+                return snapshot
+        return self._stored(job_id)
+
+    # Jobs that will start before this one, given the round-robin order of owners
+    def _position(self, job_id):
+        queues = {owner: deque(jobs) for owner, jobs in self._queues.items()}
+        owners = deque(self._owners)
+        position = 0
+        while owners:
+            owner = owners.popleft()
+            if queues[owner].popleft() == job_id:
+                break
+            position += 1
+            if queues[owner]:
+                owners.append(owner)
+        return position
+
+    # Save a resume analysis that completed without errors, for later jobs on the same resume
+    def save_analysis(self, analysis_key, analysis):
+        try:
+            with self._condition:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO analyses (analysis_key, data, saved_at) VALUES (?, ?, ?)",
+                    (analysis_key, json.dumps(analysis), time.time()),
+                )
+                self._conn.commit()
+        except (sqlite3.Error, TypeError, ValueError):
+            pass
+
+    # The saved analysis with this key, or None
+    def latest_analysis(self, analysis_key):
+        with self._condition:
+            row = self._conn.execute(
+                "SELECT data FROM analyses WHERE analysis_key = ? AND saved_at >= ?",
+                (analysis_key, time.time() - self.analysis_keep_seconds)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _next_job(self):
+        owner = self._owners.popleft()
+        job_id = self._queues[owner].popleft()
+        if self._queues[owner]:
+            self._owners.append(owner)
+        else:
+            del self._queues[owner]
+        return self._jobs[job_id]
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._owners:
+                    self._condition.wait()
+                job = self._next_job()
+                job["status"] = RUNNING
+                job["message"] = "Starting"
+                job["started_at"] = time.time()
+
+            try:
+                result = self.run(job["payload"], self._updater(job))
+            except Exception as e:
+                self._finish(job, FAILED, error=str(e) or type(e).__name__)
+                continue
+
+            if not result.get("errors"):
+                try:
+                    with self._condition:
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO results (job_id, data, finished_at) VALUES (?, ?, ?)",
+                            (job["id"], json.dumps(result), time.time()),
+                        )
+                        self._conn.commit()
+                except (sqlite3.Error, TypeError, ValueError):
+                    pass  # the result is still served from memory for as long as it is kept there
+            self._finish(job, DONE, result=result)
+
+    def _updater(self, job):
+        def update(progress=None, message=None, trace=None, **fields):
+            with self._condition:
+                if progress is not None:
+                    job["progress"] = progress
+                if message is not None:
+                    job["message"] = message
+                if trace is not None:
+                    job["trace"] = trace
+                job["result"].update(fields)
+        return update
+
+    def _finish(self, job, status, result=None, error=None):
+        with self._condition:
+            job["status"] = status
+            job["progress"] = 1.0
+            job["message"] = "Done" if status == DONE else "Failed"
+            job["error"] = error
+            job["finished_at"] = time.time()
+            if result is not None:
+                job["result"] = result
+            job["payload"] = None
+            del self._jobs[job["id"]]
+            self._finished[job["id"]] = job
+            while len(self._finished) > self.keep_finished:
+                self._finished.popitem(last=False)
+
+    def stats(self):
+        with self._condition:
+            return {
+                "queued": sum(len(jobs) for jobs in self._queues.values()),
+                "running": sum(job["status"] == RUNNING for job in self._jobs.values()),
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+            }
@@ -0,0 +1,199 @@
+"""Analyze a directory of resumes headlessly and stream the results to JSONL.
+
+Usage:
+    ANTHROPIC_API_KEY=... python batch_analyze.py resumes/ --output results.jsonl
+    python batch_analyze.py resumes/ --output results.jsonl --match-jobs --location "Seattle"
+
+PDF text is extracted in a process pool, the Claude stages run for several resumes at once with
+a process-wide cap on concurrent Claude requests, and one JSON line is appended per resume as soon
+as it finishes. Re-running with the same --output skips resumes (by content hash) that already
+have a successful record, so an interrupted run picks up where it stopped.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from pdf_extract import extract_pdf_text
+
+logger = logging.getLogger("batch_analyze")
+
+
+def find_resumes(directory, recursive):
+    walk = os.walk(directory) if recursive else [(directory, [], os.listdir(directory))]
+    paths = []
+    for root, _, files in walk:
+        paths.extend(os.path.join(root, name) for name in files if name.lower().endswith(".pdf"))
+    return sorted(paths)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Content hashes of resumes that already have a successful record in the output file.
+# A truncated last line from an interrupted run is ignored.
+def completed_hashes(output_path):
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "ok":
+                done.add(record.get("sha256"))
+    return done
+
+
+# Runs in the process pool: only pdf_extract is imported there
+def extract_file(path, max_pages, time_budget):
+    with open(path, "rb") as f:
+        return extract_pdf_text(f.read(), max_pages=max_pages, time_budget=time_budget)
+
+
+# Runs in the thread pool: every Claude stage for one resume, optionally followed by job matching.
+# Each resume gets its own trace; its summary (stage timings, tokens, HTTP and cache counts) is
+# returned with the analysis.
+def analyze_text(resume_text, args, name):
+    import resume_core
+    import tracing
+
+    start = time.monotonic()
+
+    def run():
+        analysis = resume_core.analyze_resume(resume_text, consolidated=args.consolidated)
+        if args.match_jobs:
+            search_terms, ranked_jobs = resume_core.match_jobs(analysis, args.location)
+            analysis["search_terms"] = search_terms
+            analysis["job_matches"] = ranked_jobs
+        return analysis
+
+    with tracing.trace(name) as trace:
+        analysis, errors = resume_core.collect_errors(run)
+    return analysis, errors, round(time.monotonic() - start, 3), trace.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", help="directory containing resume PDFs")
+    parser.add_argument("--output", default="results.jsonl", help="JSONL file to append results to")
+    parser.add_argument("--recursive", action="store_true", help="also look in subdirectories")
+    parser.add_argument("--extract-workers", type=int, default=os.cpu_count() or 2,
+                        help="processes used for PDF text extraction")
+    parser.add_argument("--resume-workers", type=int, default=8, help="resumes analyzed at the same time")
+    parser.add_argument("--claude-concurrency", type=int, default=8,
+                        help="maximum Claude requests in flight across all resumes")
+    parser.add_argument("--consolidated", action="store_true",
+                        help="use one structured Claude request per resume instead of five")
+    parser.add_argument("--match-jobs", action="store_true", help="also search, pre-rank and score LinkedIn jobs")
+    parser.add_argument("--location", nargs="+", default=["Remote"], help="job search locations for --match-jobs")
+    parser.add_argument("--max-pages", type=int, default=10)
+    parser.add_argument("--time-budget", type=float, default=15.0, help="seconds allowed per PDF extraction")
+    parser.add_argument("--trace-log", help="append every resume's trace events to this JSONL file")
+    parser.add_argument("--metrics-file", help="keep Prometheus metrics for the run in this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    import resume_core
+    import tracing
+    resume_core.set_claude_concurrency(args.claude_concurrency)
+    tracing.TRACE_LOG = args.trace_log or tracing.TRACE_LOG
+    tracing.METRICS_FILE = args.metrics_file or tracing.METRICS_FILE
+
+    done = completed_hashes(args.output)
+    todo = []
+    skipped = 0
+    for path in find_resumes(args.directory, args.recursive):
+        sha256 = file_sha256(path)
+        if sha256 in done:
+            skipped += 1
+            continue
+        todo.append((path, sha256))
+        done.add(sha256)  # identical files in the same run are analyzed once
+    logger.info("%d resumes to analyze, %d already done", len(todo), skipped)
+
+    # Keep a bounded window of work in flight so extracted text does not pile up ahead of Claude
+    window = args.resume_workers * 2 + args.extract_workers
+    queue = iter(todo)
+    succeeded = failed = 0
+
+    # Start the output on a fresh line if an interrupted run left a partial record
+    if os.path.exists(args.output) and os.path.getsize(args.output):
+        with open(args.output, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+    else:
+        needs_newline = False
+
+    with open(args.output, "a", encoding="utf-8") as output, \
+            ProcessPoolExecutor(max_workers=args.extract_workers) as extract_pool, \
+            ThreadPoolExecutor(max_workers=args.resume_workers) as analysis_pool:
+        if needs_newline:
+            output.write("\n")
+
+        def write(record):
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+
+        pending = {}
+
+        def refill():
+            while len(pending) < window:
+                item = next(queue, None)
+                if item is None:
+                    return
+                future = extract_pool.submit(extract_file, item[0], args.max_pages, args.time_budget)
+                pending[future] = ("extract", item)
+
+        refill()
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, (path, sha256) = pending.pop(future)
+                record = {"file": os.path.relpath(path, args.directory), "sha256": sha256}
+
+                if stage == "extract":
+                    try:
+                        resume_text = future.result()
+                    except Exception as e:
+                        resume_text, error = "", f"Error extracting text from PDF: {e}"
+                    else:
+                        error = "Could not extract text from the PDF"
+                    if resume_text.strip():
+                        pending[analysis_pool.submit(analyze_text, resume_text, args, record["file"])] = ("analyze", (path, sha256))
+                        continue
+                    write({**record, "status": "error", "errors": [error]})
+                    failed += 1
+                else:
+                    try:
+                        analysis, errors, elapsed, trace_summary = future.result()
+                    except Exception as e:
+                        analysis, errors, elapsed, trace_summary = {}, [f"Analysis failed: {e}"], None, None
+                    status = "error" if errors else "ok"
+                    write({**record, "status": status, "errors": errors, "elapsed_seconds": elapsed,
+                           "trace": trace_summary, **analysis})
+                    if errors:
+                        failed += 1
+                    else:
+                        succeeded += 1
+                    logger.info("%s %s (%d/%d)", status, record["file"], succeeded + failed, len(todo))
+            refill()
+
+    logger.info("Finished: %d succeeded, %d failed", succeeded, failed)
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
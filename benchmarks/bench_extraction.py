@@ -0,0 +1,126 @@
+"""Compare tokens and latency of the multi-call resume analysis against the consolidated single request.
+
+Usage:
+    ANTHROPIC_API_KEY=... python benchmarks/bench_extraction.py resume1.pdf resume2.txt --runs 3
+
+Each resume is analyzed with a cold response cache in three modes:
+  multi-sequential  the five resume prompts one after another
+  multi-graph       the same prompts through the concurrent stage graph
+  consolidated      one schema-constrained extract_resume_profile request
+and one JSON object per resume and mode is printed with median wall time and token usage.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import resume_core
+from llm_cache import ResponseCache
+
+
+# Wraps an Anthropic client and records token usage and latency of every messages.create call
+class RecordingClient:
+    def __init__(self, client):
+        self._client = client
+        self._lock = threading.Lock()
+        self.calls = []
+        self.messages = self
+
+    def create(self, **kwargs):
+        start = time.perf_counter()
+        response = self._client.messages.create(**kwargs)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.calls.append({
+                "seconds": elapsed,
+                "input_tokens": response.usage.input_tokens,
+                "output_tokens": response.usage.output_tokens,
+            })
+        return response
+
+    def reset(self):
+        with self._lock:
+            self.calls = []
+
+
+def read_resume(app, path):
+    if path.lower().endswith(".pdf"):
+        with open(path, "rb") as f:
+            return app.extract_resume_text(f.read())
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def run_multi_sequential(app, resume_text):
+    domain_info = app.identify_resume_domain(resume_text)
+    job_titles = app.extract_job_titles_detailed(resume_text)
+    app.extract_key_resume_attributes(resume_text, domain_info, job_titles)
+    app.summarize_resume(resume_text, domain_info)
+    app.get_resume_improvements(resume_text, domain_info)
+
+
+def run_multi_graph(app, resume_text):
+    app.build_analysis_graph(resume_text).run(max_workers=app.ANALYSIS_WORKERS)
+
+
+def run_consolidated(app, resume_text):
+    app.extract_resume_profile(resume_text)
+
+
+MODES = {
+    "multi-sequential": run_multi_sequential,
+    "multi-graph": run_multi_graph,
+    "consolidated": run_consolidated,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("resumes", nargs="+", help="PDF or plain-text resumes")
+    parser.add_argument("--runs", type=int, default=3, help="runs per resume and mode (default: 3)")
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=list(MODES))
+    args = parser.parse_args()
+
+    from anthropic import Anthropic
+
+    app = resume_core
+    recorder = RecordingClient(Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"]))
+    app.client = recorder
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        app.response_cache = ResponseCache(os.path.join(cache_dir, "bench.sqlite3"))
+
+        for path in args.resumes:
+            resume_text = read_resume(app, path)
+            for mode in args.modes:
+                walls, input_tokens, output_tokens, calls = [], [], [], []
+                for _ in range(args.runs):
+                    app.response_cache.clear()
+                    recorder.reset()
+                    start = time.perf_counter()
+                    MODES[mode](app, resume_text)
+                    walls.append(time.perf_counter() - start)
+                    input_tokens.append(sum(call["input_tokens"] for call in recorder.calls))
+                    output_tokens.append(sum(call["output_tokens"] for call in recorder.calls))
+                    calls.append(len(recorder.calls))
+
+                print(json.dumps({
+                    "resume": os.path.basename(path),
+                    "mode": mode,
+                    "runs": args.runs,
+                    "claude_calls": statistics.median(calls),
+                    "wall_seconds_median": round(statistics.median(walls), 3),
+                    "input_tokens_median": statistics.median(input_tokens),
+                    "output_tokens_median": statistics.median(output_tokens),
+                }), flush=True)
+
+
+if __name__ == "__main__":
+    main()
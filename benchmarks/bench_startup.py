@@ -0,0 +1,99 @@
+"""Report import time and resident memory of a fresh process, before and after lazy loading.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5
+    SPACY_MODEL=en_core_web_md python benchmarks/bench_startup.py
+
+Every scenario runs in its own interpreter and reports wall time and peak RSS:
+  eager-baseline   what every server process used to pay at startup: import anthropic, spacy,
+                   pdfminer, bs4, requests and numpy, then load the full spaCy pipeline
+  lazy-import      import resume_core as the app does now
+  lazy-first-use   import resume_core, then load the trimmed NLP model on first use
+Add --importtime to list the slowest imports of the lazy-import scenario.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEASURE = """
+import json, resource, sys, time
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# ru_maxrss is in KiB on Linux and bytes on macOS
+rss_mib = maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+print(json.dumps({{"seconds": elapsed, "rss_mib": rss_mib}}))
+"""
+
+SCENARIOS = {
+    "eager-baseline": """
+import anthropic, bs4, numpy, requests, spacy
+from pdfminer.high_level import extract_text
+import os
+try:
+    spacy.load(os.environ.get("SPACY_MODEL", "en_core_web_lg"))
+except OSError:
+    pass
+""",
+    "lazy-import": """
+import resume_core
+""",
+    "lazy-first-use": """
+import resume_core
+resume_core.load_nlp_model()
+""",
+}
+
+
+def run_scenario(body):
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE.format(body=body)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(limit):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import resume_core"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        rows.append((int(cumulative_us), name))
+    rows.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": round(us / 1000, 1)} for us, name in rows[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--importtime", type=int, nargs="?", const=15, default=0, metavar="N",
+                        help="also print the N slowest imports of resume_core")
+    args = parser.parse_args()
+
+    for name in args.scenarios:
+        samples = [run_scenario(SCENARIOS[name]) for _ in range(args.runs)]
+        print(json.dumps({
+            "scenario": name,
+            "runs": args.runs,
+            "seconds_median": round(statistics.median(sample["seconds"] for sample in samples), 3),
+            "rss_mib_median": round(statistics.median(sample["rss_mib"] for sample in samples), 1),
+        }), flush=True)
+
+    if args.importtime:
+        print(json.dumps({"slowest_imports": slowest_imports(args.importtime)}))
+
+
+if __name__ == "__main__":
+    main()
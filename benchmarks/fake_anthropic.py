@@ -0,0 +1,217 @@
+"""Offline stand-in for the Anthropic client used by resume_core.
+
+FakeAnthropic answers messages.create (and messages.stream) with recorded responses (benchmarks/fixtures/claude_recordings.json)
+after a configurable latency, and reports token usage estimated from the prompt and response sizes:
+
+    import resume_core
+    from fake_anthropic import FakeAnthropic
+    resume_core.client = FakeAnthropic(latency=0.4, latency_per_output_token=0.002)
+
+Job requirements are generated per job from its text (known skill names, industry words, "N+ years"
+and the seniority word in the title), so local scores vary between jobs. fail_every=N makes every Nth request fail, with a
+RuntimeError or, given fail_status (e.g. 429 or 529), an error shaped like the SDK's APIStatusError.
+"""
+import json
+import os
+import re
+import threading
+import time
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+DEFAULT_RECORDINGS = os.path.join(FIXTURES, "claude_recordings.json")
+
+JOB_BLOCK_PATTERN = re.compile(r"Job (\d+):(.*?)(?=Job \d+:|\Z)", re.DOTALL)
+JOB_TITLE_PATTERN = re.compile(r"Job Title:\s*(.+)")
+YEARS_PATTERN = re.compile(r"(\d+)\+? years")
+SENIORITY_WORDS = {"junior": "Junior", "senior": "Senior", "lead": "Senior", "staff": "Senior",
+                   "principal": "Executive", "director": "Executive", "head": "Executive"}
+
+
+# Shaped like anthropic.APIStatusError: status_code plus a response with headers
+class FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class FakeAPIStatusError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"Simulated Anthropic API error {status_code}")
+        self.status_code = status_code
+        self.response = FakeResponse({"retry-after": str(retry_after)} if retry_after is not None else {})
+
+
+class TextBlock:
+    type = "text"
+
+    def __init__(self, text):
+        self.text = text
+
+
+class ToolUseBlock:
+    type = "tool_use"
+
+    def __init__(self, name, input):
+        self.id = "toolu_fake"
+        self.name = name
+        self.input = input
+
+
+class Usage:
+    def __init__(self, input_tokens, output_tokens):
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+
+
+class Message:
+    def __init__(self, content, usage, stop_reason):
+        self.content = content
+        self.usage = usage
+        self.stop_reason = stop_reason
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+def job_blocks(prompt):
+    return [(int(number), block) for number, block in JOB_BLOCK_PATTERN.findall(prompt)]
+
+
+class FakeMessages:
+    def __init__(self, client):
+        self._client = client
+
+    def create(self, model, max_tokens, messages, tools=None, tool_choice=None, **kwargs):
+        return self._client._respond(messages, tools)
+
+    def stream(self, model, max_tokens, messages, **kwargs):
+        return FakeStream(self._client, messages)
+
+
+# Mimics the SDK's MessageStream: text arrives word by word, spread over the simulated latency
+class FakeStream:
+    def __init__(self, client, messages):
+        self._client = client
+        self._messages = messages
+        self._message = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    @property
+    def text_stream(self):
+        self._message = self._client._respond(self._messages, None, sleep=False)
+        text = self._message.content[0].text
+        chunks = re.findall(r"\S+\s*|\s+", text) or [text]
+        first_token = self._client.latency
+        per_chunk = self._client.latency_per_output_token * self._message.usage.output_tokens / len(chunks)
+        time.sleep(first_token)
+        for chunk in chunks:
+            time.sleep(per_chunk)
+            yield chunk
+
+    def get_final_message(self):
+        if self._message is None:
+            for _ in self.text_stream:
+                pass
+        return self._message
+
+
+class FakeAnthropic:
+    def __init__(self, recordings_path=DEFAULT_RECORDINGS, latency=0.0, latency_per_output_token=0.0, fail_every=0,
+                 fail_status=None, retry_after=None):
+        with open(recordings_path, encoding="utf-8") as f:
+            recordings = json.load(f)
+        self.text_responses = recordings["text_responses"]
+        self.tool_responses = recordings["tool_responses"]
+        self.latency = latency
+        self.latency_per_output_token = latency_per_output_token
+        self.fail_every = fail_every
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.messages = FakeMessages(self)
+        self.calls = []
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self.calls = []
+            self.requests = 0
+
+    def _respond(self, messages, tools, sleep=True):
+        prompt = "\n".join(
+            message["content"] if isinstance(message["content"], str) else json.dumps(message["content"])
+            for message in messages
+        )
+        with self._lock:
+            self.requests += 1
+            call_number = self.requests
+        if self.fail_every and call_number % self.fail_every == 0:
+            with self._lock:
+                self.calls.append({"name": "error", "input_tokens": 0, "output_tokens": 0})
+            if self.fail_status is not None:
+                raise FakeAPIStatusError(self.fail_status, self.retry_after)
+            raise RuntimeError("Simulated Anthropic API error")
+
+        if tools:
+            name = tools[0]["name"]
+            content = [ToolUseBlock(name, self._tool_input(name, prompt))]
+            output_text = json.dumps(content[0].input)
+            stop_reason = "tool_use"
+        else:
+            name, output_text = self._text(prompt)
+            content = [TextBlock(output_text)]
+            stop_reason = "end_turn"
+
+        usage = Usage(estimate_tokens(prompt), estimate_tokens(output_text))
+        if sleep:
+            time.sleep(self.latency + self.latency_per_output_token * usage.output_tokens)
+        with self._lock:
+            self.calls.append({"name": name, "input_tokens": usage.input_tokens, "output_tokens": usage.output_tokens})
+        return Message(content, usage, stop_reason)
+
+    def _text(self, prompt):
+        for response in self.text_responses:
+            if response["match"] in prompt:
+                return response["name"], response["text"]
+        return "unmatched", "I'm not sure how to answer that."
+
+    def _tool_input(self, name, prompt):
+        if name == "record_job_requirements":
+            return {"jobs": [self._job_requirements(number, block) for number, block in job_blocks(prompt)]}
+        if name == "record_job_explanations":
+            factors = self.tool_responses["record_job_explanations"]["factors"]
+            return {"explanations": [{"job_number": number, "factors": factors} for number, _ in job_blocks(prompt)]}
+        return self.tool_responses[name]
+
+    # Requirements found by keyword in a job's text: known skill names, industry words,
+    # "N+ years" and the seniority word in the title
+    def _job_requirements(self, number, block):
+        recording = self.tool_responses["record_job_requirements"]
+        required, preferred = [], []
+        for line in block.splitlines():
+            lowered = f" {line.lower()} "
+            found = [skill for skill in recording["skills"]
+                     if re.search(rf"(?<![\w+#]){re.escape(skill.lower())}(?![\w+#])", lowered)]
+            if any(marker in lowered for marker in recording["preferred_markers"]):
+                preferred.extend(skill for skill in found if skill not in preferred)
+            else:
+                required.extend(skill for skill in found if skill not in required)
+
+        title = JOB_TITLE_PATTERN.search(block)
+        title_words = title.group(1).lower().split() if title else []
+        seniority = next((SENIORITY_WORDS[word] for word in title_words if word in SENIORITY_WORDS), "Mid")
+        industry = next((industry for word, industry in recording["industries"].items() if word in block.lower()), "")
+        years = YEARS_PATTERN.search(block)
+        return {
+            "job_number": number,
+            "required_skills": required,
+            "preferred_skills": [skill for skill in preferred if skill not in required],
+            "seniority": seniority,
+            "industry": industry,
+            "min_years": int(years.group(1)) if years else None,
+        }
@@ -0,0 +1,236 @@
+"""Local stand-in for LinkedIn's guest job search and job view pages.
+
+Serves canned HTML with the same markup the scraper parses, so scraping can be exercised
+and measured without touching linkedin.com:
+
+    python benchmarks/linkedin_standin.py --port 8765 --latency 0.2 --throttle-rate 0.1
+    LINKEDIN_BASE_URL=http://127.0.0.1:8765 streamlit run "Smart Resume Match.py"
+
+or from Python:
+
+    server, base_url = start_standin(latency=0.05)
+    ...
+    server.shutdown()
+
+By default pages are generated from templates. With --fixtures (or fixtures_dir=) recorded pages
+are replayed instead: search/<keywords-slug>.html for the first results page of a search and
+jobs/<job id>.html for job pages, with linkedin.com links rewritten to the stand-in.
+benchmarks/fixtures/linkedin holds a set whose descriptions differ the way real postings do.
+"""
+import argparse
+import hashlib
+import html
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Health", "Stark Industries", "Wayne Enterprises",
+             "Hooli", "Vandelay Industries", "Soylent", "Cyberdyne Systems", "Tyrell", "Wonka Foods"]
+SENIORITIES = ["", "Senior ", "Lead ", "Junior ", "Staff ", "Principal "]
+
+SEARCH_PAGE = """<!DOCTYPE html>
+<html><head><title>{keywords} jobs in {location}</title></head>
+<body><ul class="jobs-search__results-list">
+{cards}
+</ul></body></html>"""
+
+EMPTY_SEARCH_PAGE = SEARCH_PAGE.format(keywords="", location="", cards="")
+
+JOB_CARD = """<li><div class="base-card relative base-search-card job-search-card" data-entity-urn="urn:li:jobPosting:{job_id}">
+  <a class="base-card__full-link" href="{base_url}/jobs/view/{slug}-{job_id}?refId=abc&amp;trackingId=xyz&amp;position={position}&amp;pageNum=0">
+    <span class="sr-only">{title}</span>
+  </a>
+  <div class="base-search-card__info">
+    <h3 class="base-search-card__title">
+          {title}
+    </h3>
+    <h4 class="base-search-card__subtitle"><a class="hidden-nested-link">
+          {company}
+    </a></h4>
+    <div class="base-search-card__metadata">
+      <span class="job-search-card__location">
+          {location}
+      </span>
+      <time class="job-search-card__listdate" datetime="2024-05-01">1 week ago</time>
+    </div>
+  </div>
+</div></li>"""
+
+JOB_PAGE = """<!DOCTYPE html>
+<html><head><title>{title} - {company}</title></head>
+<body>
+<h1 class="top-card-layout__title">{title}</h1>
+<section class="show-more-less-html">
+  <div class="description__text description__text--rich">
+    <p>{company} is hiring a {title} to join our growing team.</p>
+    <p><strong>Responsibilities</strong></p>
+    <ul><li>Design, build and maintain {keyword} solutions used by thousands of customers.</li>
+    <li>Collaborate with product, design and engineering partners.</li>
+    <li>Mentor teammates and contribute to technical planning.</li></ul>
+    <p><strong>Requirements</strong></p>
+    <ul><li>{years}+ years of experience as a {title} or similar role.</li>
+    <li>Strong communication and problem-solving skills.</li>
+    <li>Experience with Python, SQL and cloud platforms is a plus.</li></ul>
+    <p>We offer competitive pay, health benefits and flexible work.</p>
+  </div>
+</section>
+</body></html>"""
+
+
+def _stable_int(*parts):
+    return int(hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:12], 16)
+
+
+def _slug(text):
+    return "-".join("".join(ch.lower() if ch.isalnum() else " " for ch in text).split())
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server_version = "LinkedInStandin/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.request_count += 1
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if server.throttle_rate and server.random.random() < server.throttle_rate:
+            with server.lock:
+                server.throttled_count += 1
+            self._send(429, "Too Many Requests", headers={"Retry-After": "0"})
+            return
+
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/jobs/search":
+            self._send(200, self._search_page(query))
+        elif url.path.startswith("/jobs/view/"):
+            # Job pages carry an ETag so conditional revalidation can be exercised
+            body = self._job_page(url.path.rsplit("/", 1)[-1])
+            if body is None:
+                self._send(404, "Not Found")
+                return
+            etag = '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:16] + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, "", headers={"ETag": etag})
+            else:
+                self._send(200, body, headers={"ETag": etag})
+        else:
+            self._send(404, "Not Found")
+
+    def _send(self, status, body, headers=None):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        if status != 304:
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _search_page(self, query):
+        keywords = query.get("keywords", ["jobs"])[0]
+        location = query.get("location", ["Remote"])[0]
+        start = int(query.get("start", ["0"])[0] or 0)
+
+        if self.server.fixtures is not None:
+            if start:
+                return EMPTY_SEARCH_PAGE
+            page = self.server.fixtures["search"].get(_slug(keywords), EMPTY_SEARCH_PAGE)
+            return page.replace("https://www.linkedin.com", self.server.base_url)
+
+        cards = []
+        for position in range(start, start + self.server.cards_per_page):
+            seed = _stable_int(keywords.lower(), location.lower(), str(position))
+            # Overlapping pools across keywords produce the cross-term duplicates LinkedIn returns
+            job_id = str(3_900_000_000 + seed % self.server.job_pool_size)
+            title = f"{SENIORITIES[seed % len(SENIORITIES)]}{keywords.title()}"
+            company = COMPANIES[_stable_int(job_id) % len(COMPANIES)]
+            cards.append(JOB_CARD.format(
+                base_url=self.server.base_url,
+                job_id=job_id,
+                slug=_slug(title),
+                position=position + 1,
+                title=html.escape(title),
+                company=html.escape(company),
+                location=html.escape(location),
+            ))
+        return SEARCH_PAGE.format(keywords=html.escape(keywords), location=html.escape(location), cards="\n".join(cards))
+
+    def _job_page(self, slug_and_id):
+        slug, _, job_id = slug_and_id.rpartition("-")
+        if self.server.fixtures is not None:
+            return self.server.fixtures["jobs"].get(job_id)
+        title = slug.replace("-", " ").title() or "Software Engineer"
+        seed = _stable_int(job_id)
+        return JOB_PAGE.format(
+            title=html.escape(title),
+            company=html.escape(COMPANIES[seed % len(COMPANIES)]),
+            keyword=html.escape(title.split()[-1].lower()),
+            years=2 + seed % 8,
+        )
+
+
+# Read {"search": {slug: html}, "jobs": {job id: html}} from a fixtures directory
+def load_fixtures(fixtures_dir):
+    fixtures = {}
+    for kind in ("search", "jobs"):
+        directory = os.path.join(fixtures_dir, kind)
+        fixtures[kind] = {}
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".html"):
+                with open(os.path.join(directory, name), encoding="utf-8") as f:
+                    fixtures[kind][name[:-len(".html")]] = f.read()
+    return fixtures
+
+
+# Start the stand-in on a background thread; returns (server, base_url)
+def start_standin(host="127.0.0.1", port=0, latency=0.0, throttle_rate=0.0, cards_per_page=10,
+                  job_pool_size=40, seed=0, fixtures_dir=None):
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    server.daemon_threads = True
+    server.base_url = f"http://{host}:{server.server_address[1]}"
+    server.latency = latency
+    server.throttle_rate = throttle_rate
+    server.cards_per_page = cards_per_page
+    server.job_pool_size = job_pool_size
+    server.fixtures = load_fixtures(fixtures_dir) if fixtures_dir else None
+    server.random = random.Random(seed)
+    server.lock = threading.Lock()
+    server.request_count = 0
+    server.throttled_count = 0
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--cards-per-page", type=int, default=10)
+    parser.add_argument("--fixtures", metavar="DIR", help="replay recorded pages from DIR instead of generating them")
+    args = parser.parse_args()
+
+    server, base_url = start_standin(args.host, args.port, args.latency, args.throttle_rate, args.cards_per_page,
+                                     fixtures_dir=args.fixtures)
+    print(f"LinkedIn stand-in listening on {base_url}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""Concurrent-session load test: many users uploading a resume, analyzing it and getting job matches at once.
+
+Usage:
+    python benchmarks/load_test.py --concurrency 1 2 4 8 16
+    python benchmarks/load_test.py --concurrency 8 --jobs-per-user 5 --claude-requests-per-minute 50 --output load.json
+    python benchmarks/load_test.py --concurrency 4 --claude-fail-every 10 --claude-fail-status 529
+    python benchmarks/load_test.py --concurrency 16 --workers 4 --queue-size 8
+
+Each simulated user drives the app's path: it submits --jobs-per-user analyses with submit_analysis
+under its own owner ID, as a browser session does, and polls get_analysis_jobs().status() until
+they finish. The analyses run on the shared AnalysisJobs pool (--workers threads, --queue-size
+waiting jobs, round-robin across owners), recreated empty for every concurrency level. Every job
+uploads a different resume, so Claude responses are not shared through the response cache. Claude
+is FakeAnthropic and LinkedIn the stand-in server (see run_benchmarks.py); the job store is emptied
+before each concurrency level.
+
+For every concurrency level (number of users) the report gives throughput (jobs per second),
+p50/p95/p99 seconds spent waiting in the queue, per stage (from each job's trace) and end to end
+(submit to finish), the share of jobs rejected with queue.Full, failed or fell back to defaults,
+Claude and LinkedIn error counts and the process RSS (peak while the level ran). The ramp stops
+early once the end-to-end p95 exceeds --stop-p95 seconds.
+"""
+import argparse
+import json
+import math
+import os
+import queue
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# run_benchmarks puts the repository root on sys.path
+from run_benchmarks import FIXTURES, LOCATION, Environment, git_commit, try_load_nlp
+
+import resume_core
+from analysis_jobs import AnalysisJobs
+from bench_pdf_extract import make_sample_pdf
+from claude_scheduler import ClaudeScheduler
+
+STAGES = ["queue", "upload", "analyze", "search", "results", "total"]
+
+# Traced functions that make up each stage of a job
+STAGE_SPANS = {
+    "upload": ["extract_resume_text"],
+    "analyze": ["analyze_resume"],
+    "search": ["find_linkedin_jobs", "shortlist_linkedin_jobs", "prerank_jobs"],
+    "results": ["rank_jobs"],
+}
+
+# Seconds between status checks of a simulated user
+POLL_SECONDS = 0.02
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def rss_mib():
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+# Peak RSS while a block runs, sampled on a background thread
+class RssSampler:
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = rss_mib()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, rss_mib())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_mib())
+
+
+# A different resume PDF per session: the fixture resume plus a line naming the session
+def session_resumes(count, offset):
+    with open(os.path.join(FIXTURES, "resume.txt"), encoding="utf-8") as f:
+        lines = [line for line in f.read().splitlines() if line.strip()]
+    return [
+        make_sample_pdf(1, lines_per_page=len(lines) + 1, lines=lines + [f"Reference: load test session {offset + n}"])
+        for n in range(count)
+    ]
+
+
+# One user: submit jobs_per_user analyses under its own owner ID and poll them until they finish.
+# Returns one record per job: its status ("ok", "degraded" when a stage fell back to defaults,
+# "failed" when the job raised, "rejected" when the queue was full), seconds per stage and the
+# Claude and LinkedIn errors it ran into.
+def run_user(owner, resumes, consolidated):
+    records, job_ids = [], []
+    for resume_pdf in resumes:
+        try:
+            job_ids.append(resume_core.submit_analysis(resume_pdf, [LOCATION], consolidated=consolidated, owner=owner))
+        except queue.Full:
+            records.append({"status": "rejected", "stages": {}, "claude_errors": 0, "http_errors": 0})
+
+    for job_id in job_ids:
+        job = resume_core.get_analysis_jobs().status(job_id)
+        while job["status"] in ("queued", "running"):
+            time.sleep(POLL_SECONDS)
+            job = resume_core.get_analysis_jobs().status(job_id)
+        records.append(job_record(job))
+    return records
+
+
+def job_record(job):
+    stages = {"total": job["finished_at"] - job["submitted_at"]}
+    if job.get("started_at"):
+        stages["queue"] = job["started_at"] - job["submitted_at"]
+    trace = job.get("trace")
+    if trace is None:
+        return {"status": "failed", "stages": stages, "claude_errors": 0, "http_errors": 0}
+
+    for name, span_names in STAGE_SPANS.items():
+        seconds = [span["seconds"] for span in trace.spans if span["name"] in span_names]
+        if seconds:
+            stages[name] = sum(seconds)
+
+    if job["status"] == "failed":
+        status = "failed"
+    else:
+        status = "degraded" if job["result"].get("errors") else "ok"
+    summary = trace.summary()
+    return {
+        "status": status,
+        "stages": stages,
+        "claude_errors": sum(1 for call in trace.claude_calls if call.get("error")),
+        "http_errors": sum(count for status_code, count in summary["http_status"].items()
+                           if status_code not in ("200", "304")),
+    }
+
+
+def run_level(env, work_dir, concurrency, jobs_per_user, consolidated, offset, workers, queue_size):
+    env.reset_job_store()
+    resume_core.analysis_jobs = AnalysisJobs(
+        resume_core.run_analysis_job, os.path.join(work_dir, f"analysis_jobs-{offset}.sqlite3"),
+        max_workers=workers, max_queued=queue_size
+    )
+    jobs = concurrency * jobs_per_user
+    resumes = session_resumes(jobs, offset)
+
+    with RssSampler() as rss, ThreadPoolExecutor(max_workers=concurrency) as executor:
+        start = time.perf_counter()
+        futures = [
+            executor.submit(run_user, f"user-{user}", resumes[user * jobs_per_user:(user + 1) * jobs_per_user],
+                            consolidated)
+            for user in range(concurrency)
+        ]
+        results = [record for future in futures for record in future.result()]
+        seconds = time.perf_counter() - start
+
+    statuses = {"ok": 0, "degraded": 0, "failed": 0, "rejected": 0}
+    for result in results:
+        statuses[result["status"]] += 1
+
+    stages = {}
+    for name in STAGES:
+        values = [result["stages"][name] for result in results if name in result["stages"]]
+        if values:
+            stages[name] = {
+                "p50": round(percentile(values, 0.50), 4),
+                "p95": round(percentile(values, 0.95), 4),
+                "p99": round(percentile(values, 0.99), 4),
+                "max": round(max(values), 4),
+            }
+
+    return {
+        "concurrency": concurrency,
+        "jobs": jobs,
+        "seconds": round(seconds, 4),
+        "throughput": round((jobs - statuses["rejected"]) / seconds, 4),
+        "status": statuses,
+        "rejected_rate": round(statuses["rejected"] / jobs, 4),
+        "error_rate": round(statuses["failed"] / jobs, 4),
+        "degraded_rate": round(statuses["degraded"] / jobs, 4),
+        "claude_errors": sum(result["claude_errors"] for result in results),
+        "http_errors": sum(result["http_errors"] for result in results),
+        "stages": stages,
+        "rss_mib_peak": round(rss.peak, 1),
+    }
+
+
+def print_level(level):
+    stages = "  ".join(
+        f"{name} {level['stages'][name]['p50']:.2f}/{level['stages'][name]['p95']:.2f}/{level['stages'][name]['p99']:.2f}"
+        for name in STAGES if name in level["stages"]
+    )
+    print(
+        f"concurrency {level['concurrency']:3d}  {level['throughput']:6.2f} jobs/s  "
+        f"rejected {level['rejected_rate']:.0%}  failed {level['error_rate']:.0%}  degraded {level['degraded_rate']:.0%}  "
+        f"RSS {level['rss_mib_peak']:.0f} MiB  p50/p95/p99 s: {stages}",
+        file=sys.stderr
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="concurrent users at each step of the ramp")
+    parser.add_argument("--jobs-per-user", type=int, default=2, help="analyses each user submits at once")
+    parser.add_argument("--workers", type=int, default=resume_core.ANALYSIS_JOB_WORKERS,
+                        help="analysis worker threads (default: the app's)")
+    parser.add_argument("--queue-size", type=int, default=resume_core.ANALYSIS_JOB_QUEUE_SIZE,
+                        help="analyses allowed to wait for a worker (default: the app's)")
+    parser.add_argument("--consolidated", action="store_true", help="analyze with the single-request mode")
+    parser.add_argument("--claude-latency", type=float, default=0.05,
+                        help="simulated seconds per Claude request (plus a per-output-token share)")
+    parser.add_argument("--linkedin-latency", type=float, default=0.01,
+                        help="simulated seconds per LinkedIn request")
+    parser.add_argument("--claude-requests-per-minute", type=int, default=0,
+                        help="rate limit the Claude scheduler like a real account (default: unlimited)")
+    parser.add_argument("--claude-fail-every", type=int, default=0, help="make every Nth Claude request fail")
+    parser.add_argument("--claude-fail-status", type=int, default=None,
+                        help="HTTP status of the failed Claude requests (e.g. 429 or 529)")
+    parser.add_argument("--linkedin-throttle-rate", type=float, default=0.0,
+                        help="share of LinkedIn requests answered with 429")
+    parser.add_argument("--stop-p95", type=float, default=0.0,
+                        help="stop ramping once the end-to-end p95 exceeds this many seconds")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    nlp = try_load_nlp()  # loaded before timing, as the app has it after its first job
+    levels = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        env = Environment(work_dir, args.claude_latency, args.linkedin_latency)
+        env.fake.fail_every = args.claude_fail_every
+        env.fake.fail_status = args.claude_fail_status
+        env.server.throttle_rate = args.linkedin_throttle_rate
+        if args.claude_requests_per_minute:
+            resume_core.claude_scheduler = ClaudeScheduler(
+                requests_per_minute=args.claude_requests_per_minute,
+                max_concurrency=resume_core.CLAUDE_MAX_CONCURRENCY
+            )
+        try:
+            offset = 0
+            for concurrency in args.concurrency:
+                level = run_level(env, work_dir, concurrency, args.jobs_per_user, args.consolidated, offset,
+                                  args.workers, args.queue_size)
+                offset += level["jobs"]
+                levels.append(level)
+                print_level(level)
+                if args.stop_p95 and level["stages"]["total"]["p95"] > args.stop_p95:
+                    print(f"End-to-end p95 above {args.stop_p95}s, stopping the ramp", file=sys.stderr)
+                    break
+        finally:
+            env.close()
+
+    report = {
+        "git_commit": git_commit(),
+        "settings": {
+            "consolidated": args.consolidated,
+            "jobs_per_user": args.jobs_per_user,
+            "workers": args.workers,
+            "queue_size": args.queue_size,
+            "claude_latency": args.claude_latency,
+            "linkedin_latency": args.linkedin_latency,
+            "claude_requests_per_minute": args.claude_requests_per_minute or None,
+            "claude_fail_every": args.claude_fail_every,
+            "claude_fail_status": args.claude_fail_status,
+            "linkedin_throttle_rate": args.linkedin_throttle_rate,
+            "spacy_model": resume_core.SPACY_MODEL if nlp is not None else None,
+        },
+        "levels": levels,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
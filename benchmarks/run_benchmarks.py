@@ -0,0 +1,289 @@
+"""Offline benchmark suite: microbenchmarks of the hot paths plus the end-to-end pipeline.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output baseline.json
+    python benchmarks/run_benchmarks.py --compare baseline.json --threshold 0.15
+
+Nothing leaves the machine. Claude is replaced by FakeAnthropic (recorded responses from
+benchmarks/fixtures/claude_recordings.json with simulated latency and token usage), LinkedIn by
+the stand-in server replaying benchmarks/fixtures/linkedin, and the response cache and job
+store live in a temporary directory. The resume in benchmarks/fixtures/resume.txt is rendered
+to a PDF so text extraction is part of the pipeline.
+
+Microbenchmarks: PDF text extraction, contact extraction, local resume parsing, search term
+generation, job card and description parsing, near-duplicate removal, vector pre-ranking (when a
+spaCy model with vectors is installed), job ranking and recruiter-mode shortlisting of a
+few hundred candidates against a few hundred jobs.
+End-to-end: extract -> analyze_resume -> search -> pre-rank -> rank, once with a cold cache and
+job store and once warm, with per-stage timings.
+
+Results are written as one JSON document with the git commit, Python version and median, p95
+and min seconds per benchmark. --compare exits with status 1 when any median is more than
+--threshold (a fraction) slower than in the given baseline file.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+FIXTURES = os.path.join(BENCHMARKS, "fixtures")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCHMARKS)
+
+import resume_core
+from bench_pdf_extract import make_sample_pdf
+from claude_scheduler import ClaudeScheduler
+from fake_anthropic import FakeAnthropic
+from job_dedup import remove_near_duplicates
+from job_index import JobIndex
+from job_store import JobStore
+from linkedin_scraper import LinkedInScraper, parse_job_cards, parse_job_description
+from linkedin_standin import load_fixtures, start_standin
+from llm_cache import ResponseCache
+from recruiter_match import shortlist_matches
+from resume_parser import parse_resume, parse_resume_as_of
+
+LOCATION = "Seattle, WA"
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))
+    return {
+        "runs": len(ordered),
+        "median": round(statistics.median(ordered), 6),
+        "p95": round(ordered[p95_index], 6),
+        "min": round(ordered[0], 6),
+    }
+
+
+def timed(func, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# spaCy models are optional here: pre-ranking is skipped when none is installed
+def try_load_nlp():
+    try:
+        return resume_core.load_nlp_model()
+    except (ImportError, OSError):
+        return None
+
+
+class Environment:
+    def __init__(self, work_dir, claude_latency, linkedin_latency):
+        self.work_dir = work_dir
+        self.fake = FakeAnthropic(latency=claude_latency, latency_per_output_token=claude_latency / 200)
+        self.server, self.base_url = start_standin(latency=linkedin_latency,
+                                                   fixtures_dir=os.path.join(FIXTURES, "linkedin"))
+        self.fixtures = load_fixtures(os.path.join(FIXTURES, "linkedin"))
+        self.store_number = 0
+
+        resume_core.client = self.fake
+        # The fake has no rate limits to respect
+        resume_core.claude_scheduler = ClaudeScheduler(
+            requests_per_minute=10 ** 6, tokens_per_minute=10 ** 9, max_concurrency=resume_core.CLAUDE_MAX_CONCURRENCY
+        )
+        resume_core.response_cache = ResponseCache(os.path.join(work_dir, "claude_responses.sqlite3"))
+        self.reset_job_store()
+
+        with open(os.path.join(FIXTURES, "resume.txt"), encoding="utf-8") as f:
+            lines = [line for line in f.read().splitlines() if line.strip()]
+        self.resume_pdf = make_sample_pdf(1, lines_per_page=len(lines), lines=lines)
+
+    # A fresh job store, search index and scraper, so the next search downloads every posting again
+    def reset_job_store(self):
+        self.store_number += 1
+        resume_core.job_store = JobStore(os.path.join(self.work_dir, f"job_postings_{self.store_number}.sqlite3"))
+        resume_core.job_index = JobIndex(os.path.join(self.work_dir, f"job_index_{self.store_number}"))
+        resume_core.scraper = LinkedInScraper(
+            base_url=self.base_url, requests_per_second=1000.0, burst=100, job_store=resume_core.job_store
+        )
+
+    def reset_all(self):
+        resume_core.response_cache.clear()
+        self.reset_job_store()
+
+    def close(self):
+        self.server.shutdown()
+
+
+def run_microbenchmarks(env, runs, nlp):
+    results = {}
+    resume_text = resume_core.extract_resume_text(env.resume_pdf)
+    analysis = resume_core.analyze_resume(resume_text)
+    search_pages = list(env.fixtures["search"].values())
+    job_pages = list(env.fixtures["jobs"].values())
+
+    jobs = []
+    for page in search_pages:
+        for card in parse_job_cards(page, LOCATION):
+            job_id = card["Job Link"].split("?")[0].rsplit("-", 1)[-1]
+            jobs.append({**card, "Description": parse_job_description(env.fixtures["jobs"][job_id])})
+
+    results["extract_resume_text"] = timed(lambda: resume_core.extract_resume_text(env.resume_pdf), runs)
+    results["extract_contact_info"] = timed(lambda: resume_core.extract_contact_info(resume_text), runs)
+    parse_resume(resume_text)  # load the phrase matcher outside the timings
+    results["parse_resume"] = timed(lambda: (parse_resume_as_of.cache_clear(), parse_resume(resume_text)), runs)
+    results["generate_search_terms"] = timed(lambda: resume_core.generate_search_terms(
+        analysis["job_titles"], analysis["resume_attributes"], analysis["domain_info"]), runs)
+    results["parse_job_cards"] = timed(lambda: [parse_job_cards(page, LOCATION) for page in search_pages], runs)
+    results["parse_job_description"] = timed(lambda: [parse_job_description(page) for page in job_pages], runs)
+    results["remove_near_duplicates"] = timed(lambda: remove_near_duplicates(jobs), runs)
+    if nlp is not None:
+        results["prerank_jobs"] = timed(lambda: resume_core.prerank_jobs(
+            nlp, jobs, analysis["resume_attributes"], analysis["job_titles"]), runs)
+    results["rank_jobs"] = timed(lambda: resume_core.rank_jobs(
+        jobs[:resume_core.PRERANK_TOP_K], analysis["resume_attributes"], analysis["domain_info"],
+        analysis["job_titles"]), runs)
+
+    # Recruiter pool: variations of the resume's skills against copies of the fixture jobs
+    requirements = [requirement or {} for requirement in resume_core.get_job_requirements(jobs)]
+    skills = analysis["resume_attributes"].get("Professional Skills", [])
+    candidates = [
+        {**analysis["resume_attributes"], "Professional Skills": skills[index % max(1, len(skills)):]}
+        for index in range(300)
+    ]
+    copies = max(1, 300 // max(1, len(jobs)))
+    results["shortlist_matches"] = timed(lambda: shortlist_matches(
+        candidates, jobs * copies, requirements * copies), runs)
+    return results
+
+
+# One pass of the app's pipeline, returning seconds per stage
+def run_pipeline(env, nlp, consolidated):
+    stages = {}
+
+    def stage(name, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        stages[name] = time.perf_counter() - start
+        return result
+
+    start = time.perf_counter()
+    resume_text = stage("extract", resume_core.extract_resume_text, env.resume_pdf)
+    analysis = stage("analyze", resume_core.analyze_resume, resume_text, consolidated=consolidated)
+    search_terms = resume_core.generate_search_terms(
+        analysis["job_titles"], analysis["resume_attributes"], analysis["domain_info"])
+    job_listings, _ = stage("search", resume_core.search_jobs, analysis, search_terms, LOCATION)
+    job_listings = stage("prerank", resume_core.prerank_jobs, nlp, job_listings,
+                         analysis["resume_attributes"], analysis["job_titles"])
+    stage("rank", resume_core.rank_jobs, job_listings, analysis["resume_attributes"],
+          analysis["domain_info"], analysis["job_titles"])
+    stages["total"] = time.perf_counter() - start
+    return stages
+
+
+# Returns (timings, Claude requests per pipeline run) keyed by mode and cache temperature
+def run_end_to_end(env, runs, nlp):
+    results, claude_calls = {}, {}
+    for mode, consolidated in (("graph", False), ("consolidated", True)):
+        for temperature in ("cold", "warm"):
+            samples = {}
+            for _ in range(runs):
+                if temperature == "cold":
+                    env.reset_all()
+                else:
+                    run_pipeline(env, nlp, consolidated)  # make sure everything is cached
+                env.fake.reset()
+                for name, seconds in run_pipeline(env, nlp, consolidated).items():
+                    samples.setdefault(name, []).append(seconds)
+            claude_calls[f"{mode}.{temperature}"] = len(env.fake.calls)
+            for name, values in samples.items():
+                results[f"pipeline.{mode}.{temperature}.{name}"] = summarize(values)
+    return results, claude_calls
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["benchmarks"]
+    regressions = []
+    for name, stats in sorted(results.items()):
+        if name not in baseline or not baseline[name]["median"]:
+            continue
+        change = stats["median"] / baseline[name]["median"] - 1
+        print(f"{name:50s} {baseline[name]['median']:10.4f}s -> {stats['median']:10.4f}s  {change:+7.1%}",
+              file=sys.stderr)
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="samples per benchmark")
+    parser.add_argument("--claude-latency", type=float, default=0.05,
+                        help="simulated seconds per Claude request (plus a per-output-token share)")
+    parser.add_argument("--linkedin-latency", type=float, default=0.01,
+                        help="simulated seconds per LinkedIn request")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-pipeline", action="store_true")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file to compare medians against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown before failing")
+    args = parser.parse_args()
+
+    nlp = try_load_nlp()
+    results, claude_calls = {}, {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        env = Environment(work_dir, args.claude_latency, args.linkedin_latency)
+        try:
+            if not args.skip_micro:
+                results.update(run_microbenchmarks(env, args.runs, nlp))
+            if not args.skip_pipeline:
+                env.reset_all()
+                pipeline_results, claude_calls = run_end_to_end(env, args.runs, nlp)
+                results.update(pipeline_results)
+        finally:
+            env.close()
+
+    report = {
+        "git_commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "runs": args.runs,
+            "claude_latency": args.claude_latency,
+            "linkedin_latency": args.linkedin_latency,
+            "spacy_model": resume_core.SPACY_MODEL if nlp is not None else None,
+        },
+        "claude_calls_per_pipeline": claude_calls,
+        "benchmarks": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"Slower than baseline by more than {args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
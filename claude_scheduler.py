@@ -0,0 +1,155 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+
+import tracing
+from rate_limit import TokenBucket
+
+# Process-wide scheduler for Claude requests, shared by every session and worker thread.
+# Requests wait in one priority queue (interactive resume analysis ahead of bulk job scoring),
+# then take from two token buckets: requests per minute and tokens per minute (estimated prompt
+# tokens plus max_tokens). Failed requests that are worth retrying (throttling, overload, server
+# and connection errors) are retried with exponential backoff and full jitter, honouring
+# Retry-After. Concurrency adapts: it is halved when Claude throttles and grows by one after a
+# run of successful requests, up to max_concurrency; throttling also pauses every waiting request.
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+
+THROTTLING_STATUS = {429, 529}
+RETRYABLE_STATUS = THROTTLING_STATUS | {408, 409, 500, 502, 503, 504}
+RETRYABLE_ERRORS = {"APIConnectionError", "APITimeoutError"}
+
+
+def error_status(error):
+    return getattr(error, "status_code", None)
+
+
+def is_throttling_error(error):
+    return error_status(error) in THROTTLING_STATUS
+
+
+def is_retryable_error(error):
+    return error_status(error) in RETRYABLE_STATUS or type(error).__name__ in RETRYABLE_ERRORS
+
+
+# Seconds the server asked us to wait (Retry-After header), if it said
+def retry_after_seconds(error):
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return None
+
+
+class ClaudeScheduler:
+    def __init__(self, requests_per_minute=50, tokens_per_minute=80000, max_concurrency=8, min_concurrency=1,
+                 max_retries=4, base_delay=1.0, max_delay=30.0):
+        self.request_bucket = TokenBucket(requests_per_minute / 60.0, max(1, requests_per_minute // 6))
+        self.token_bucket = TokenBucket(tokens_per_minute / 60.0, tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.limit = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.in_flight = 0
+        self.retries = 0
+        self.throttled = 0
+        self._successes = 0
+        self._paused_until = 0.0
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    def set_max_concurrency(self, limit):
+        with self._condition:
+            self.max_concurrency = limit
+            self.limit = min(max(self.limit, self.min_concurrency), limit)
+            self._condition.notify_all()
+
+    # Wait for our turn in the queue, a concurrency slot and the rate limits
+    def _acquire(self, priority, tokens):
+        with self._condition:
+            entry = (priority, next(self._sequence))
+            heapq.heappush(self._waiting, entry)
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause <= 0 and self._waiting[0] == entry and self.in_flight < self.limit:
+                    break
+                self._condition.wait(timeout=pause if pause > 0 else None)
+            heapq.heappop(self._waiting)
+            self.in_flight += 1
+            self._condition.notify_all()
+        try:
+            self.request_bucket.acquire()
+            self.token_bucket.acquire(tokens)
+        except BaseException:
+            self._release("error")
+            raise
+
+    def _release(self, outcome):
+        with self._condition:
+            self.in_flight -= 1
+            if outcome == "throttled":
+                self.throttled += 1
+                self.limit = max(self.min_concurrency, self.limit // 2)
+                self._successes = 0
+            elif outcome == "ok":
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.max_concurrency:
+                    self.limit += 1
+                    self._successes = 0
+            self._condition.notify_all()
+
+    # Stop starting requests for a while after Claude throttled us
+    def _pause(self, seconds):
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def backoff_seconds(self, attempt, error):
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            delay = min(self.max_delay, retry_after + delay / 2)
+        return delay
+
+    # Run send() (one Claude request) when the scheduler allows, retrying retryable errors.
+    # tokens is the request's estimated token cost; can_retry, when given, is asked before each
+    # retry (a streamed response that already produced text cannot be retried).
+    def call(self, send, priority=PRIORITY_INTERACTIVE, tokens=1, can_retry=None, function_name="claude"):
+        attempt = 0
+        while True:
+            self._acquire(priority, tokens)
+            try:
+                result = send()
+            except Exception as e:
+                throttled = is_throttling_error(e)
+                self._release("throttled" if throttled else "error")
+                if (not is_retryable_error(e) or attempt >= self.max_retries
+                        or (can_retry is not None and not can_retry())):
+                    raise
+                delay = self.backoff_seconds(attempt, e)
+                if throttled:
+                    self._pause(delay)
+                with self._condition:
+                    self.retries += 1
+                tracing.metrics.inc("claude_retries_total", "Claude requests retried by function and status",
+                                    function=function_name, status=error_status(e) or type(e).__name__)
+                attempt += 1
+                time.sleep(delay)
+                continue
+            self._release("ok")
+            return result
+
+    def stats(self):
+        with self._condition:
+            return {
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiting),
+                "concurrency_limit": self.limit,
+                "retries": self.retries,
+                "throttled": self.throttled,
+            }
@@ -0,0 +1,122 @@
+import hashlib
+import re
+
+import numpy as np
+
+from job_store import linkedin_job_id
+
+COMPANY_SUFFIXES = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "company", "plc", "gmbh", "group"}
+NON_DESCRIPTIONS = {"", "Description not available"}
+
+# MinHash parameters: 64 permutations split into 16 LSH bands of 4 rows finds pairs with
+# Jaccard similarity above roughly 0.5 as candidates; candidates are then checked against the threshold
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+MERSENNE_PRIME = (1 << 61) - 1
+
+
+def normalize_text(text):
+    return " ".join(re.sub(r"[^a-z0-9+#]+", " ", text.lower()).split())
+
+
+def normalize_company(company):
+    words = normalize_text(company).split()
+    while words and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+# Exact-duplicate keys of a search card: its canonical LinkedIn job ID (so tracking-parameter
+# variants of a URL collide, in any location) and its normalized title+company+location (so reposts
+# under a new ID collide, while the same role in another city stays a separate posting)
+def card_keys(card):
+    keys = [("title_company", normalize_text(card.get("Job Title", "")), normalize_company(card.get("Company", "")),
+             normalize_text(card.get("Location", "")))]
+    job_id = linkedin_job_id(card.get("Job Link", ""))
+    if job_id:
+        keys.append(("job_id", job_id))
+    return keys
+
+
+# Hash-set deduplication of search cards, O(1) per card
+class CardDeduplicator:
+    def __init__(self):
+        self.seen = set()
+
+    # Returns True the first time a card (or any card sharing one of its keys) is seen
+    def add(self, card):
+        keys = card_keys(card)
+        if any(key in self.seen for key in keys):
+            return False
+        self.seen.update(keys)
+        return True
+
+
+# Word 3-gram shingles of a text, hashed to stable 32-bit integers
+def shingle_hashes(text, size=3):
+    words = normalize_text(text).split()
+    if len(words) < size:
+        shingles = {" ".join(words)} if words else set()
+    else:
+        shingles = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little") for shingle in shingles],
+        dtype=np.uint64,
+    )
+
+
+# MinHash signatures with LSH banding for near-duplicate detection of job descriptions
+class NearDuplicateIndex:
+    def __init__(self, threshold=0.8, permutations=MINHASH_PERMUTATIONS, bands=LSH_BANDS, seed=7):
+        if permutations % bands:
+            raise ValueError("permutations must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = permutations // bands
+        rng = np.random.default_rng(seed)
+        # a, b < 2**32 and 32-bit shingle hashes keep a * x + b inside uint64
+        self.a = rng.integers(1, 1 << 32, size=permutations, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, size=permutations, dtype=np.uint64)
+        self.buckets = {}
+        self.signatures = {}
+
+    def signature(self, text):
+        hashes = shingle_hashes(text)
+        if hashes.size == 0:
+            return None
+        # (permutations, shingles) matrix of permuted hashes; the signature is each row's minimum
+        permuted = (np.outer(self.a, hashes) + self.b[:, None]) % MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+    # Index a text; returns the id of an already-indexed near duplicate, or None if it is new
+    def add(self, item_id, text):
+        signature = self.signature(text)
+        if signature is None:
+            return None
+
+        band_keys = [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+        candidates = set()
+        for key in band_keys:
+            candidates.update(self.buckets.get(key, ()))
+        for candidate in candidates:
+            if np.mean(self.signatures[candidate] == signature) >= self.threshold:
+                return candidate
+
+        self.signatures[item_id] = signature
+        for key in band_keys:
+            self.buckets.setdefault(key, []).append(item_id)
+        return None
+
+
+# Drop jobs whose description is a near duplicate of an earlier job's (first occurrence wins)
+def remove_near_duplicates(jobs, threshold=0.8):
+    index = NearDuplicateIndex(threshold=threshold)
+    unique_jobs = []
+    for position, job in enumerate(jobs):
+        description = job.get("Description", "")
+        if description in NON_DESCRIPTIONS or index.add(position, description) is None:
+            unique_jobs.append(job)
+    return unique_jobs
@@ -0,0 +1,270 @@
+import json
+import math
+import os
+import re
+import shutil
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+# Local BM25 full-text index over the postings in the job store.
+# The index on disk is one generation directory holding flat arrays that are memory-mapped at
+# startup: for every term a contiguous run of (document ID, term frequency) postings, plus
+# document lengths and a small JSON vocabulary and document table. Postings added since the last
+# save live in an in-memory delta segment that is searched together with the mapped one, and a
+# save merges both into a new generation (dropping replaced documents) and switches the CURRENT
+# pointer atomically, so readers never see a half-written index.
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the this to we will "
+    "with you your".split()
+)
+
+# Title words count this many times, so a match in the title outranks one in the description
+TITLE_WEIGHT = 3
+MAX_TERM_FREQUENCY = np.iinfo(np.uint16).max
+
+
+def tokenize(text):
+    return [token for token in TOKEN_PATTERN.findall((text or "").lower()) if token not in STOPWORDS]
+
+
+class JobIndex:
+    def __init__(self, path, k1=1.2, b=0.75, flush_every=50):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.flush_every = flush_every
+        self._lock = threading.RLock()
+        os.makedirs(path, exist_ok=True)
+        self._load()
+
+    def _generation_dir(self):
+        try:
+            with open(os.path.join(self.path, "CURRENT"), encoding="utf-8") as f:
+                return os.path.join(self.path, f.read().strip())
+        except FileNotFoundError:
+            return None
+
+    def _load(self):
+        # Mapped segment
+        self.vocabulary = {}  # term -> (start, count) into the postings arrays
+        self.postings_docs = np.zeros(0, dtype=np.uint32)
+        self.postings_tf = np.zeros(0, dtype=np.uint16)
+        self.base_lengths = np.zeros(0, dtype=np.uint32)
+        self.docs = []  # [key, url, title, company, location, fetched_at] by document ID
+        self.synced_until = 0.0
+
+        generation = self._generation_dir()
+        if generation and os.path.isdir(generation):
+            with open(os.path.join(generation, "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(os.path.join(generation, "vocabulary.json"), encoding="utf-8") as f:
+                self.vocabulary = {term: tuple(run) for term, run in json.load(f).items()}
+            with open(os.path.join(generation, "docs.json"), encoding="utf-8") as f:
+                self.docs = json.load(f)
+            self.synced_until = meta["synced_until"]
+            if meta["postings"]:
+                self.postings_docs = np.load(os.path.join(generation, "postings_docs.npy"), mmap_mode="r")
+                self.postings_tf = np.load(os.path.join(generation, "postings_tf.npy"), mmap_mode="r")
+            if self.docs:
+                self.base_lengths = np.load(os.path.join(generation, "doc_lengths.npy"), mmap_mode="r")
+
+        # Delta segment and bookkeeping
+        self.delta = {}  # term -> ([document IDs], [term frequencies])
+        self.delta_lengths = []
+        self.deleted = set()
+        self.doc_ids = {doc[0]: doc_id for doc_id, doc in enumerate(self.docs)}
+        self._lengths = None
+        self._location_masks = {}
+
+    def __len__(self):
+        with self._lock:
+            return len(self.docs) - len(self.deleted)
+
+    # Index one posting, replacing any earlier version with the same key
+    def add(self, key, url, title, company, location, description, fetched_at):
+        with self._lock:
+            previous = self.doc_ids.get(key)
+            if previous is not None:
+                if self.docs[previous][5] >= fetched_at:
+                    return
+                self.deleted.add(previous)
+
+            doc_id = len(self.docs)
+            self.docs.append([key, url, title or "", company or "", location or "", fetched_at])
+            self.doc_ids[key] = doc_id
+
+            tokens = tokenize(title) * TITLE_WEIGHT + tokenize(company) + tokenize(description)
+            for term, frequency in Counter(tokens).items():
+                doc_ids, frequencies = self.delta.setdefault(term, ([], []))
+                doc_ids.append(doc_id)
+                frequencies.append(min(frequency, MAX_TERM_FREQUENCY))
+            self.delta_lengths.append(len(tokens))
+            self._lengths = None
+            self._location_masks.clear()
+
+    # Drop a posting from the index (it stops matching at once and is left out of the next save)
+    def remove(self, key):
+        with self._lock:
+            doc_id = self.doc_ids.pop(key, None)
+            if doc_id is not None:
+                self.deleted.add(doc_id)
+
+    # Index every posting the store has (re)fetched since the last sync and drop those it no longer
+    # has (pruned); returns how many were added. The index is saved once flush_every postings have
+    # accumulated in memory.
+    def sync(self, job_store):
+        with self._lock:
+            stored = job_store.keys()
+            for key in [key for key in self.doc_ids if key not in stored]:
+                self.remove(key)
+            postings = job_store.postings_since(self.synced_until)
+            for posting in postings:
+                self.add(posting["key"], posting["url"], posting["title"], posting["company"],
+                         posting["location"], posting["description"], posting["fetched_at"])
+                self.synced_until = max(self.synced_until, posting["fetched_at"])
+            if len(self.delta_lengths) >= self.flush_every:
+                self.save()
+            return len(postings)
+
+    def _all_lengths(self):
+        if self._lengths is None:
+            self._lengths = np.concatenate([
+                np.asarray(self.base_lengths, dtype=np.float32),
+                np.asarray(self.delta_lengths, dtype=np.float32),
+            ])
+        return self._lengths
+
+    def _postings(self, term):
+        parts_docs, parts_tf = [], []
+        if term in self.vocabulary:
+            start, count = self.vocabulary[term]
+            parts_docs.append(self.postings_docs[start:start + count])
+            parts_tf.append(self.postings_tf[start:start + count])
+        if term in self.delta:
+            doc_ids, frequencies = self.delta[term]
+            parts_docs.append(np.asarray(doc_ids, dtype=np.uint32))
+            parts_tf.append(np.asarray(frequencies, dtype=np.uint16))
+        if not parts_docs:
+            return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.float32)
+        return np.concatenate(parts_docs), np.concatenate(parts_tf).astype(np.float32)
+
+    # Documents whose location contains every word of the requested location ("Seattle" matches
+    # "Seattle, WA") or that are remote; no location matches everything
+    def _location_mask(self, location):
+        words = set(tokenize(location))
+        if not words:
+            return None
+        if location not in self._location_masks:
+            doc_words = (set(tokenize(doc[4])) for doc in self.docs)
+            self._location_masks[location] = np.fromiter(
+                (words <= found or "remote" in found for found in doc_words), dtype=bool, count=len(self.docs)
+            )
+        return self._location_masks[location]
+
+    # Best BM25 matches for query as [(document, score)], best first. A document must contain at
+    # least min_match (a fraction) of the query's terms; documents are dicts with key, url, title,
+    # company, location and fetched_at.
+    def search(self, query, location=None, limit=10, min_match=0.67):
+        terms = list(dict.fromkeys(tokenize(query)))
+        with self._lock:
+            if not terms or not self.docs:
+                return []
+
+            lengths = self._all_lengths()
+            live = np.ones(len(self.docs), dtype=bool)
+            if self.deleted:
+                live[list(self.deleted)] = False
+            live_docs = int(live.sum())
+            if not live_docs:
+                return []
+            # Replaced and removed documents count neither in document frequencies nor average length
+            average_length = float(lengths[live].mean()) or 1.0
+            scores = np.zeros(len(self.docs), dtype=np.float32)
+            matched = np.zeros(len(self.docs), dtype=np.uint16)
+
+            for term in terms:
+                doc_ids, frequencies = self._postings(term)
+                if self.deleted:
+                    kept = live[doc_ids]
+                    doc_ids, frequencies = doc_ids[kept], frequencies[kept]
+                if not len(doc_ids):
+                    continue
+                document_frequency = len(doc_ids)
+                idf = math.log(1 + (live_docs - document_frequency + 0.5) / (document_frequency + 0.5))
+                norms = self.k1 * (1 - self.b + self.b * lengths[doc_ids] / average_length)
+                # A term occurs at most once per document's postings, so plain fancy indexing is safe
+                scores[doc_ids] += idf * frequencies * (self.k1 + 1) / (frequencies + norms)
+                matched[doc_ids] += 1
+
+            mask = (matched >= max(1, math.ceil(min_match * len(terms)))) & live
+            location_mask = self._location_mask(location)
+            if location_mask is not None:
+                mask &= location_mask
+
+            candidates = np.flatnonzero(mask)
+            if len(candidates) > limit:
+                candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+            candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+            fields = ("key", "url", "title", "company", "location", "fetched_at")
+            return [(dict(zip(fields, self.docs[doc_id])), float(scores[doc_id])) for doc_id in candidates]
+
+    # Merge the delta into a new on-disk generation, drop replaced documents and map it back in
+    def save(self):
+        with self._lock:
+            if not self.delta_lengths and not self.deleted and self._generation_dir():
+                return
+
+            keep = np.array([doc_id not in self.deleted for doc_id in range(len(self.docs))], dtype=bool)
+            new_ids = np.cumsum(keep, dtype=np.int64) - 1
+            docs = [doc for doc, kept in zip(self.docs, keep) if kept]
+            lengths = self._all_lengths()[keep].astype(np.uint32)
+
+            vocabulary, doc_runs, tf_runs, start = {}, [], [], 0
+            for term in sorted(set(self.vocabulary) | set(self.delta)):
+                doc_ids, frequencies = self._postings(term)
+                live = keep[doc_ids]
+                if not live.any():
+                    continue
+                doc_runs.append(new_ids[doc_ids[live]].astype(np.uint32))
+                tf_runs.append(frequencies[live].astype(np.uint16))
+                vocabulary[term] = (start, int(live.sum()))
+                start += int(live.sum())
+
+            generation = f"gen-{time.time_ns()}"
+            directory = os.path.join(self.path, generation)
+            os.makedirs(directory)
+            np.save(os.path.join(directory, "postings_docs.npy"),
+                    np.concatenate(doc_runs) if doc_runs else np.zeros(0, dtype=np.uint32))
+            np.save(os.path.join(directory, "postings_tf.npy"),
+                    np.concatenate(tf_runs) if tf_runs else np.zeros(0, dtype=np.uint16))
+            np.save(os.path.join(directory, "doc_lengths.npy"), lengths)
+            with open(os.path.join(directory, "vocabulary.json"), "w", encoding="utf-8") as f:
+                json.dump(vocabulary, f, separators=(",", ":"))
+            with open(os.path.join(directory, "docs.json"), "w", encoding="utf-8") as f:
+                json.dump(docs, f, separators=(",", ":"))
+            with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"synced_until": self.synced_until, "documents": len(docs), "postings": start}, f)
+
+            pointer = os.path.join(self.path, "CURRENT.tmp")
+            with open(pointer, "w", encoding="utf-8") as f:
+                f.write(generation)
+            os.replace(pointer, os.path.join(self.path, "CURRENT"))
+
+            self._load()
+            for name in os.listdir(self.path):
+                if name.startswith("gen-") and name != generation:
+                    shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "documents": len(self.docs) - len(self.deleted),
+                "terms": len(set(self.vocabulary) | set(self.delta)),
+                "unsaved": len(self.delta_lengths),
+            }
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit, urlunsplit
+
+LINKEDIN_JOB_ID_PATTERN = re.compile(r"/jobs/view/(?:[^/?#]*-)?(\d{6,})")
+
+
+# Extract the numeric LinkedIn job ID from a job URL, if there is one
+def linkedin_job_id(job_url):
+    match = LINKEDIN_JOB_ID_PATTERN.search(job_url)
+    if match:
+        return match.group(1)
+    current_job_id = parse_qs(urlsplit(job_url).query).get("currentJobId")
+    if current_job_id and current_job_id[0].isdigit():
+        return current_job_id[0]
+    return None
+
+
+# Normalize a job URL: lowercase scheme and host, no query string, fragment or trailing slash
+def normalize_job_url(job_url):
+    parts = urlsplit(job_url.strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, "", ""))
+
+
+# Stable key for a posting: its LinkedIn job ID when available, otherwise the normalized URL.
+# Tracking parameters and host variants of the same posting map to the same key.
+def posting_key(job_url):
+    job_id = linkedin_job_id(job_url)
+    return f"linkedin:{job_id}" if job_id else f"url:{normalize_job_url(job_url)}"
+
+
+def description_hash(description):
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()[:16]
+
+
+# Persistent SQLite store of scraped job postings.
+# A posting is fresh for ttl_seconds after it was last fetched or revalidated; stale postings
+# keep their ETag/Last-Modified validators so they can be refreshed with a conditional request.
+# Structured requirements extracted from a posting are kept alongside it, for as long as its
+# description is unchanged.
+class JobStore:
+    def __init__(self, path, ttl_seconds=24 * 3600, max_age_seconds=30 * 24 * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS postings (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                title TEXT,
+                company TEXT,
+                location TEXT,
+                description TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                checked_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS postings_fetched_at ON postings (fetched_at)")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS requirements (
+                key TEXT PRIMARY KEY,
+                description_hash TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                extracted_at REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def get(self, job_url):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM postings WHERE key = ?", (posting_key(job_url),)).fetchone()
+        return dict(row) if row else None
+
+    # Postings (re)fetched at or after timestamp, oldest first, for incremental indexing
+    def postings_since(self, timestamp):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, url, title, company, location, description, fetched_at FROM postings "
+                "WHERE fetched_at >= ? ORDER BY fetched_at", (timestamp,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    # Keys of every stored posting
+    def keys(self):
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT key FROM postings")}
+
+    def is_fresh(self, posting):
+        return time.time() - posting["checked_at"] <= self.ttl_seconds
+
+    # Request headers for revalidating a stale posting
+    @staticmethod
+    def conditional_headers(posting):
+        headers = {}
+        if posting.get("etag"):
+            headers["If-None-Match"] = posting["etag"]
+        if posting.get("last_modified"):
+            headers["If-Modified-Since"] = posting["last_modified"]
+        return headers
+
+    def put(self, job_url, description, title=None, company=None, location=None, etag=None, last_modified=None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO postings (key, url, title, company, location, description, etag, last_modified, fetched_at, checked_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    url = excluded.url,
+                    title = COALESCE(excluded.title, postings.title),
+                    company = COALESCE(excluded.company, postings.company),
+                    location = COALESCE(excluded.location, postings.location),
+                    description = excluded.description,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    fetched_at = excluded.fetched_at,
+                    checked_at = excluded.checked_at""",
+                (posting_key(job_url), normalize_job_url(job_url), title, company, location,
+                 description, etag, last_modified, now, now),
+            )
+            self._conn.commit()
+
+    # Requirements extracted (with the given extraction version) from this exact description, or None
+    def get_requirements(self, job_url, description, version):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM requirements WHERE key = ? AND description_hash = ? AND version = ?",
+                (posting_key(job_url), description_hash(description), version),
+            ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def put_requirements(self, job_url, description, version, requirements):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO requirements (key, description_hash, version, data, extracted_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (posting_key(job_url), description_hash(description), version, json.dumps(requirements), time.time()),
+            )
+            self._conn.commit()
+
+    # Mark a stale posting as fresh again after a 304 Not Modified
+    def touch(self, job_url):
+        with self._lock:
+            self._conn.execute("UPDATE postings SET checked_at = ? WHERE key = ?", (time.time(), posting_key(job_url)))
+            self._conn.commit()
+
+    def record(self, outcome):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    # Delete postings that have not been confirmed for max_age_seconds
+    def prune(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM postings WHERE checked_at < ?", (time.time() - self.max_age_seconds,))
+            self._conn.execute("DELETE FROM requirements WHERE key NOT IN (SELECT key FROM postings)")
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+            return {"postings": count, "hits": self.hits, "revalidated": self.revalidated, "misses": self.misses}
@@ -0,0 +1,59 @@
+import numpy as np
+
+# Long descriptions add little signal to an averaged word vector but cost tokenization time
+MAX_JOB_TEXT_CHARS = 2000
+
+
+# Build the text that represents a candidate in vector space from their job titles and attributes
+def resume_profile_text(resume_attributes, job_titles):
+    parts = [job.get("title", "") for job in job_titles]
+    for category in ("Related Job Titles", "Professional Skills", "Core Expertise Areas", "Industries"):
+        parts.extend(resume_attributes.get(category, []))
+    return ". ".join(part for part in parts if part)
+
+
+# Build the text that represents a job listing in vector space.
+# The title is repeated so it outweighs the description in the averaged vector.
+def job_text(job):
+    description = job.get("Description", "")
+    if description == "Description not available":
+        description = ""
+    return f"{job.get('Job Title', '')}. {job.get('Job Title', '')}. {description[:MAX_JOB_TEXT_CHARS]}"
+
+
+# Embed texts with the spaCy model's word vectors and return an L2-normalized (n, dim) matrix.
+# Only the tokenizer and vectors are needed, so every pipeline component is disabled.
+def embed_texts(nlp, texts):
+    with nlp.select_pipes(disable=nlp.pipe_names):
+        vectors = np.array([doc.vector for doc in nlp.pipe(texts)], dtype=np.float32)
+    if vectors.ndim != 2 or vectors.shape[1] == 0:
+        return np.zeros((len(texts), 0), dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+# Cosine similarity between every row of two normalized matrices, as one matrix product
+def cosine_similarities(query_matrix, candidate_matrix):
+    return query_matrix @ candidate_matrix.T
+
+
+# Order job listings by vector similarity to the resume and keep at most top_k of them
+# (and only those at or above min_similarity). Returns the input unchanged when no usable
+# vectors are available, so the Claude scorer still sees every job.
+def prerank_jobs(nlp, job_listings, resume_attributes, job_titles, top_k=8, min_similarity=0.0):
+    if nlp is None or not job_listings or not nlp.vocab.vectors.shape[0]:
+        return job_listings
+
+    profile = resume_profile_text(resume_attributes, job_titles)
+    if not profile:
+        return job_listings
+
+    matrix = embed_texts(nlp, [profile] + [job_text(job) for job in job_listings])
+    if matrix.shape[1] == 0:
+        return job_listings
+
+    similarities = cosine_similarities(matrix[:1], matrix[1:])[0]
+    order = np.argsort(-similarities, kind="stable")
+    keep = [index for index in order[:top_k] if similarities[index] >= min_similarity]
+    return [job_listings[index] for index in keep]
@@ -0,0 +1,291 @@
+import contextvars
+import random
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import quote, urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+import tracing
+from job_dedup import CardDeduplicator
+from rate_limit import HostRateLimiter
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# Throttling and transient server errors are retried with backoff
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+DESCRIPTION_NOT_AVAILABLE = "Description not available"
+
+BLOCK_TAGS = ["p", "li", "ul", "ol", "div", "br", "h1", "h2", "h3", "h4", "h5", "h6"]
+
+
+# Parse the job cards of a LinkedIn search results page
+def parse_job_cards(html, default_location):
+    soup = BeautifulSoup(html, "html.parser")
+    cards = []
+    for job in soup.find_all("div", class_="base-card"):
+        try:
+            title_tag = job.find("h3", class_="base-search-card__title")
+            company_tag = job.find("h4", class_="base-search-card__subtitle")
+            location_tag = job.find("span", class_="job-search-card__location")
+            link_tag = job.find("a", class_="base-card__full-link")
+
+            cards.append({
+                "Job Title": title_tag.text.strip() if title_tag else "Not Found",
+                "Company": company_tag.text.strip() if company_tag else "Not Found",
+                "Location": location_tag.text.strip() if location_tag else default_location,
+                "Job Link": link_tag["href"] if link_tag else "#",
+            })
+        except Exception:
+            # Skip this job card if there's an error parsing it
+            continue
+    return cards
+
+
+# Text of an element with one line per paragraph, list item or heading, so that section
+# headings ("Requirements", "Benefits") stay recognisable (see prompt_budget.trim_job_description)
+def block_text(element):
+    for tag in element.find_all(BLOCK_TAGS):
+        tag.insert_before("\n")
+        tag.insert_after("\n")
+    lines = (" ".join(line.split()) for line in element.get_text().splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+# Parse the description out of a LinkedIn job page
+def parse_job_description(html):
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Try to extract job description
+    description_element = soup.find("div", class_="description__text")
+    if description_element:
+        return block_text(description_element)
+
+    # If not found, try alternative selectors
+    description_element = soup.find("section", class_="show-more-less-html")
+    return block_text(description_element) if description_element else DESCRIPTION_NOT_AVAILABLE
+
+
+# Concurrent LinkedIn scraper.
+# All requests share one keep-alive connection pool, are paced by a per-host token bucket
+# instead of fixed sleeps, are bounded to max_in_flight at a time and are retried with
+# exponential backoff and jitter on 429/5xx responses and connection errors.
+# base_url can point at a local stand-in server (see benchmarks/linkedin_standin.py).
+# With a job_store, descriptions are served from the store while fresh and revalidated
+# with conditional requests once stale, so each posting is downloaded only once.
+class LinkedInScraper:
+    def __init__(self, base_url="https://www.linkedin.com", max_in_flight=6, requests_per_second=2.0,
+                 burst=4, max_retries=3, backoff_base=0.5, backoff_max=8.0, timeout=10, job_store=None):
+        self.base_url = base_url.rstrip("/")
+        self.job_store = job_store
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.limiter = HostRateLimiter(requests_per_second, burst)
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_in_flight, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def search_url(self, search_term, location, domain_info, start=0):
+        search_query = quote(search_term)
+
+        # Add domain/industry context for non-tech roles
+        if domain_info["type"] == "non-technical" and domain_info["industry"] != "general":
+            if domain_info["industry"] not in search_term.lower():
+                search_query = f"{quote(domain_info['industry'])}%20{search_query}"
+
+        url = f"{self.base_url}/jobs/search?keywords={search_query}&location={quote(location)}"
+        return f"{url}&start={start}" if start else url
+
+    def _backoff_seconds(self, attempt, response):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        # Full jitter: a random wait up to the exponential ceiling
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    # GET a URL through the pool and rate limiter, retrying throttled and failed requests.
+    # Every attempt is traced with its kind ("search" or "job"), status and latency.
+    # Returns the last response, or None if every attempt failed to connect.
+    def fetch(self, url, headers=None, kind="job"):
+        host = urlsplit(url).netloc
+        response = None
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(host)
+            started_at = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                response = None
+                tracing.record_http_request(kind, host, type(e).__name__, time.perf_counter() - started_at, attempt)
+            else:
+                tracing.record_http_request(kind, host, response.status_code, time.perf_counter() - started_at, attempt)
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+
+            if attempt < self.max_retries:
+                time.sleep(self._backoff_seconds(attempt, response))
+        return response
+
+    def _record_store_outcome(self, outcome):
+        self.job_store.record(outcome)
+        tracing.record_cache_event("job_store", outcome)
+
+    # Return a job's description, consulting the job store before making any request.
+    # card (title/company/location from the search page) is saved alongside the description.
+    def fetch_job_description(self, job_url, card=None):
+        if not job_url.startswith(("http://", "https://")):
+            return DESCRIPTION_NOT_AVAILABLE
+
+        stored = self.job_store.get(job_url) if self.job_store else None
+        if stored and self.job_store.is_fresh(stored):
+            self._record_store_outcome("hits")
+            return stored["description"]
+
+        try:
+            headers = self.job_store.conditional_headers(stored) if stored else None
+            response = self.fetch(job_url, headers=headers)
+
+            if stored and response is not None and response.status_code == 304:
+                self.job_store.touch(job_url)
+                self._record_store_outcome("revalidated")
+                return stored["description"]
+
+            if response is None or response.status_code != 200:
+                # A stale description is still better than none
+                return stored["description"] if stored else DESCRIPTION_NOT_AVAILABLE
+
+            description = parse_job_description(response.text)
+            if self.job_store and description != DESCRIPTION_NOT_AVAILABLE:
+                card = card or {}
+                self.job_store.put(
+                    job_url, description,
+                    title=card.get("Job Title"),
+                    company=card.get("Company"),
+                    location=card.get("Location"),
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified")
+                )
+                self._record_store_outcome("misses")
+            return description
+        except Exception:
+            return stored["description"] if stored else DESCRIPTION_NOT_AVAILABLE
+
+    # Descriptions of several jobs (search cards), fetched concurrently, in the order of cards
+    def fetch_job_descriptions(self, cards):
+        if not cards:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_in_flight, len(cards))) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, self.fetch_job_description, card["Job Link"], card)
+                for card in cards
+            ]
+            return [future.result() for future in futures]
+
+    # Stream jobs for every search term across every location, as their detail pages arrive.
+    # Page 0 of each (term, location) search is fetched at once. The consumer drives the rest:
+    # needed(search_term), asked from the calling thread, is how many more jobs it wants for the
+    # term (without needed, every job is wanted), and detail pages are only requested while fewer
+    # than that are in flight. Once a term's fetched cards are used up, the next result page of
+    # each of its locations is requested (start= offset), up to max_pages per location or until
+    # a page brings no new cards.
+    # Cards sharing a job ID or normalized title+company are dropped before any detail request.
+    # on_error(search_term, location) is called for every search page that could not be fetched.
+    # With hydrate=False no detail page is requested: the cards themselves are streamed as their
+    # search pages arrive, with a None description, and next pages are requested while needed
+    # is above zero (see fetch_job_descriptions to fetch the descriptions of the ones kept).
+    # Closing the generator stops all outstanding requests.
+    def iter_jobs(self, search_terms, locations, domain_info, max_pages=3, needed=None, on_error=None,
+                  hydrate=True):
+        needed = needed or (lambda search_term: float("inf"))
+        deduplicator = CardDeduplicator()
+        backlog = {search_term: deque() for search_term in search_terms}
+        in_flight = {search_term: 0 for search_term in search_terms}
+        cursors = {
+            search_term: [{"location": location, "start": 0, "pages": 0, "busy": False, "done": False}
+                          for location in locations]
+            for search_term in search_terms
+        }
+        pending = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_in_flight)
+
+        # Requests run in a copy of the caller's context so they are recorded in the caller's trace
+        def submit(task, function, *args, **kwargs):
+            pending[executor.submit(contextvars.copy_context().run, function, *args, **kwargs)] = task
+
+        def fetch_page(search_term, cursor):
+            cursor["busy"] = True
+            url = self.search_url(search_term, cursor["location"], domain_info, start=cursor["start"])
+            submit(("search", search_term, cursor), self.fetch, url, kind="search")
+
+        def top_up(search_term):
+            wanted = needed(search_term)
+            while backlog[search_term] and in_flight[search_term] < wanted:
+                card = backlog[search_term].popleft()
+                in_flight[search_term] += 1
+                submit(("job", search_term, card), self.fetch_job_description, card["Job Link"], card)
+            if not backlog[search_term] and in_flight[search_term] < wanted:
+                for cursor in cursors[search_term]:
+                    if not cursor["busy"] and not cursor["done"]:
+                        fetch_page(search_term, cursor)
+
+        try:
+            for search_term in search_terms:
+                for cursor in cursors[search_term]:
+                    fetch_page(search_term, cursor)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, search_term, item = pending.pop(future)
+                    if kind == "job":
+                        in_flight[search_term] -= 1
+                        yield {
+                            "Job Title": item["Job Title"],
+                            "Company": item["Company"],
+                            "Location": item["Location"],
+                            "Description": future.result(),
+                            "Job Link": item["Job Link"],
+                            "Search Term": search_term
+                        }
+                    else:
+                        cursor = item
+                        cursor["busy"] = False
+                        try:
+                            response = future.result()
+                        except Exception:
+                            response = None
+                        if response is None or response.status_code != 200:
+                            cursor["done"] = True
+                            if on_error:
+                                on_error(search_term, cursor["location"])
+                        else:
+                            cards = parse_job_cards(response.text, cursor["location"])
+                            new_cards = [card for card in cards if deduplicator.add(card)]
+                            if hydrate:
+                                backlog[search_term].extend(new_cards)
+                            else:
+                                for card in new_cards:
+                                    yield {
+                                        "Job Title": card["Job Title"],
+                                        "Company": card["Company"],
+                                        "Location": card["Location"],
+                                        "Description": None,
+                                        "Job Link": card["Job Link"],
+                                        "Search Term": search_term
+                                    }
+                            cursor["start"] += len(cards)
+                            cursor["pages"] += 1
+                            cursor["done"] = not new_cards or cursor["pages"] >= max_pages
+                    top_up(search_term)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,70 @@
+import io
+import time
+
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LAParams, LTTextContainer
+
+# Optional fast-path extractor; pdfminer is used when it is not installed or fails
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+# Layout analysis tuned for resumes: boxes_flow=None skips the quadratic text-box grouping
+# pass (reading order across columns matters little to the LLM prompts), and vertical text
+# detection is disabled
+RESUME_LAPARAMS = LAParams(line_margin=0.5, char_margin=2.0, word_margin=0.1, boxes_flow=None, detect_vertical=False)
+
+
+class PDFExtractionBudgetExceeded(Exception):
+    pass
+
+
+# Fast path: PDFium's native text extraction, page by page
+def extract_text_pdfium(pdf_bytes, max_pages, deadline):
+    document = pypdfium2.PdfDocument(pdf_bytes)
+    try:
+        pages = []
+        for index in range(min(len(document), max_pages)):
+            page = document[index]
+            text_page = page.get_textpage()
+            pages.append(text_page.get_text_range())
+            text_page.close()
+            page.close()
+            if time.monotonic() > deadline:
+                break
+        return "\n\f".join(pages)
+    finally:
+        document.close()
+
+
+# Fallback: pdfminer layout analysis streamed one page at a time from an in-memory buffer
+def extract_text_pdfminer(pdf_bytes, max_pages, deadline, laparams=RESUME_LAPARAMS):
+    pages = []
+    for page_layout in extract_pages(io.BytesIO(pdf_bytes), laparams=laparams, maxpages=max_pages):
+        pages.append("".join(
+            element.get_text() for element in page_layout if isinstance(element, LTTextContainer)
+        ))
+        if time.monotonic() > deadline:
+            break
+    return "\f".join(pages)
+
+
+# Extract text from PDF bytes without touching the filesystem.
+# At most max_pages pages are read and extraction stops after the page that crosses
+# time_budget seconds, returning what was extracted so far. The fast path is tried first;
+# pdfminer is the fallback when it is unavailable, fails or finds no text.
+def extract_pdf_text(pdf_bytes, max_pages=10, time_budget=15.0, laparams=RESUME_LAPARAMS):
+    deadline = time.monotonic() + time_budget
+
+    if pypdfium2 is not None:
+        try:
+            text = extract_text_pdfium(pdf_bytes, max_pages, deadline)
+            if text.strip():
+                return text
+        except Exception:
+            pass
+
+    if time.monotonic() > deadline:
+        raise PDFExtractionBudgetExceeded(f"PDF extraction exceeded {time_budget:.0f}s")
+    return extract_text_pdfminer(pdf_bytes, max_pages, deadline, laparams)
@@ -0,0 +1,163 @@
+import functools
+import math
+import re
+
+# Token budgeting for the text interpolated into Claude prompts.
+# Token counts are estimated locally (no tokenizer download or API call): words are counted in
+# chunks of about four characters, punctuation and symbols one token each, which tracks Claude's
+# tokenizer closely enough on English resumes and postings to size prompts.
+# Resumes are compressed section by section: whitespace is collapsed and boilerplate dropped first,
+# then whole low-value sections (interests, references, ...) and finally the tail of the
+# least important remaining sections until the text fits. Job descriptions keep their
+# responsibilities and requirements and lose company blurbs, benefits and legal boilerplate first.
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+|[^\sA-Za-z0-9]")
+CHARS_PER_WORD_TOKEN = 4
+
+# Resume sections in order of importance for matching: lower numbers are kept longest.
+# The text before the first recognised heading (name, title, contact details) is kept longest of all.
+RESUME_SECTIONS = [
+    (0, "experience", r"(professional |work |relevant |employment )?(experience|history)|employment|career history|work history"),
+    (1, "skills", r"(technical |core |key )?(skills|competencies|technologies|tech stack|expertise)"),
+    (2, "summary", r"(professional |career )?(summary|profile|objective)|about me"),
+    (3, "education", r"education|academic background|qualifications"),
+    (4, "projects", r"(selected |personal |key )?projects"),
+    (5, "certifications", r"certifications?|licen[cs]es( (and|&) certifications)?|training|courses"),
+    (6, "achievements", r"achievements|awards( (and|&) honou?rs)?|honou?rs|publications|patents"),
+    (7, "other", r"languages|volunteer(ing)?( experience)?|leadership|activities|affiliations|memberships"),
+    (9, "interests", r"interests|hobbies|personal( interests)?|references"),
+]
+RESUME_HEADING_PATTERN = re.compile(
+    r"^\s*(?:" + "|".join(f"(?P<{name}>{pattern})" for _, name, pattern in RESUME_SECTIONS) + r")\s*:?\s*$",
+    re.IGNORECASE,
+)
+RESUME_SECTION_PRIORITY = {name: priority for priority, name, _ in RESUME_SECTIONS}
+UNKNOWN_SECTION_PRIORITY = 8
+
+RESUME_BOILERPLATE = re.compile(
+    r"^\s*(references (are )?available( up)?on request\.?|curriculum vitae|resume|r[ée]sum[ée]|"
+    r"page \d+( of \d+)?|\d+ ?/ ?\d+|[-_=*•·.]{3,})\s*$",
+    re.IGNORECASE,
+)
+
+# Job description sections: kept (requirements, responsibilities) or dropped first (company blurb,
+# benefits, legal text). Lines before the first heading are treated as an introduction.
+JOB_KEEP_HEADINGS = re.compile(
+    r"responsibilit|requirement|qualification|what you('|’)?ll do|what you will do|what we('|’)?re looking for|"
+    r"who you are|about you|about the role|the role|your role|skills|experience|must have|nice to have|"
+    r"preferred|bonus|you have|you will|duties|key tasks|tech stack",
+    re.IGNORECASE,
+)
+JOB_DROP_HEADINGS = re.compile(
+    r"about us|about the company|who we are|our (mission|story|values|culture)|benefits|perks|"
+    r"what we offer|why join|compensation|salary|pay range|equal opportunity|eeo|diversity|"
+    r"how to apply|application process|privacy",
+    re.IGNORECASE,
+)
+JOB_BOILERPLATE = re.compile(
+    r"equal opportunity employer|without regard to (race|color)|reasonable accommodation|"
+    r"e-verify|privacy (policy|notice)|apply (now|today)|click apply|show more|show less|"
+    r"^\s*(seniority level|employment type|job function|industries)\b",
+    re.IGNORECASE,
+)
+MAX_HEADING_WORDS = 8
+
+
+def estimate_tokens(text):
+    if not text:
+        return 0
+    return sum(
+        math.ceil(len(token) / CHARS_PER_WORD_TOKEN) if token[0].isalnum() else 1
+        for token in TOKEN_PATTERN.findall(text)
+    )
+
+
+# Collapse runs of spaces and drop empty lines, boilerplate and running page headers
+# (repeats of the first lines of the document, usually the name and contact details)
+def clean_lines(text, boilerplate=RESUME_BOILERPLATE):
+    lines = []
+    for raw_line in text.splitlines():
+        line = " ".join(raw_line.split())
+        if not line or boilerplate.search(line):
+            continue
+        if line in lines[:3]:
+            continue
+        lines.append(line)
+    return lines
+
+
+# Keep whole lines from the start of text until the budget is used up
+def truncate_to_budget(lines, budget):
+    kept, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return kept
+
+
+# Fit sections [(priority, [lines])] into budget: drop the least important sections whole, then
+# cut the tail of the least important one left, keeping the original section order
+def fit_sections(sections, budget):
+    costs = [sum(estimate_tokens(line) + 1 for line in lines) for _, lines in sections]
+    total = sum(costs)
+    kept = [list(lines) for _, lines in sections]
+    by_priority = sorted(range(len(sections)), key=lambda index: (-sections[index][0], -index))
+
+    for index in by_priority:
+        if total <= budget:
+            break
+        # A section only partly over the budget keeps its head (heading and first entries)
+        if total - costs[index] < budget:
+            kept[index] = truncate_to_budget(kept[index], budget - (total - costs[index]))
+            total = total - costs[index] + sum(estimate_tokens(line) + 1 for line in kept[index])
+        else:
+            kept[index] = []
+            total -= costs[index]
+
+    lines = [line for section in kept for line in section]
+    return lines if total <= budget else truncate_to_budget(lines, budget)
+
+
+def split_resume_sections(lines):
+    sections = [(-1, [])]  # the header block: name, title and contact details
+    for line in lines:
+        match = RESUME_HEADING_PATTERN.match(line) if len(line.split()) <= MAX_HEADING_WORDS else None
+        if match:
+            sections.append((RESUME_SECTION_PRIORITY[match.lastgroup], [line]))
+        elif line.isupper() and len(line.split()) <= 4 and sections[-1][1]:
+            sections.append((UNKNOWN_SECTION_PRIORITY, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(priority, lines) for priority, lines in sections if lines]
+
+
+# Compress resume text to at most max_tokens (estimated). Returns the text unchanged apart from
+# whitespace and boilerplate clean-up when it already fits.
+@functools.lru_cache(maxsize=128)
+def compress_resume(resume_text, max_tokens):
+    lines = clean_lines(resume_text)
+    return "\n".join(fit_sections(split_resume_sections(lines), max_tokens))
+
+
+def split_job_sections(lines):
+    sections = [(1, [])]  # the introduction: usually the role in a sentence or two
+    for line in lines:
+        is_heading = len(line.split()) <= MAX_HEADING_WORDS and not line.endswith(".")
+        if is_heading and JOB_DROP_HEADINGS.search(line):
+            sections.append((3, [line]))
+        elif is_heading and JOB_KEEP_HEADINGS.search(line):
+            sections.append((0, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(priority, lines) for priority, lines in sections if lines]
+
+
+# Trim a job description to at most max_tokens (estimated), keeping responsibilities and
+# requirements ahead of the introduction, and company, benefits and legal text last
+@functools.lru_cache(maxsize=1024)
+def trim_job_description(description, max_tokens):
+    lines = clean_lines(description, JOB_BOILERPLATE)
+    return "\n".join(fit_sections(split_job_sections(lines), max_tokens))
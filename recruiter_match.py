@@ -0,0 +1,170 @@
+import numpy as np
+
+from skill_match import (
+    MAX_SENIORITY_GAP, NEUTRAL, PREFERRED_SKILL_WEIGHT, SCORE_WEIGHTS, SENIORITY_WORDS, CandidateProfile,
+    job_level, parse_years, term_words
+)
+
+# Recruiter matching: a pool of candidates against a pool of job postings.
+# Every (candidate, job) pair gets the score skill_match.score_jobs would give it, computed for
+# blocks of candidates and jobs at once. Each term component (skills, title words, industry
+# words) is a dense candidate x term 0/1 block times a term x job weight block; seniority and
+# years are compared by broadcasting. Only one block of each side is dense at a time, so memory
+# stays bounded by block_size, and the best top_k jobs of every candidate and candidates of every
+# job are merged in with argpartition as each block is scored.
+
+
+# The job side of one term component: every job's (term, weight) entries in one CSR layout
+class JobTerms:
+    def __init__(self, job_terms):
+        self.vocabulary = {}
+        indices, weights, indptr = [], [], [0]
+        for terms in job_terms:
+            for words, weight in terms:
+                indices.append(self.vocabulary.setdefault(words, len(self.vocabulary)))
+                weights.append(weight)
+            indptr.append(len(indices))
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        rows = np.repeat(np.arange(len(job_terms)), np.diff(self.indptr))
+        self.totals = np.bincount(rows, weights=self.weights, minlength=len(job_terms))
+
+        # Vocabulary terms by word, to find the terms a candidate's term can match
+        self.terms = list(self.vocabulary)
+        self.word_index = {}
+        for term_id, words in enumerate(self.terms):
+            for word in words:
+                self.word_index.setdefault(word, []).append(term_id)
+
+    # (terms, jobs) weight matrix of the jobs start:stop
+    def block(self, start, stop):
+        first, last = self.indptr[start], self.indptr[stop]
+        columns = np.repeat(np.arange(stop - start), np.diff(self.indptr[start:stop + 1]))
+        matrix = np.zeros((len(self.terms), stop - start))
+        matrix[self.indices[first:last], columns] = self.weights[first:last]
+        return matrix
+
+    # Vocabulary terms a candidate has: those all in one of its terms, or containing one of them
+    def matching(self, candidate_terms):
+        found = set()
+        for candidate_term in candidate_terms:
+            for word in candidate_term:
+                for term_id in self.word_index.get(word, ()):
+                    term = self.terms[term_id]
+                    if term <= candidate_term or candidate_term <= term:
+                        found.add(term_id)
+        return sorted(found)
+
+
+# Weighted fraction of each job's terms each candidate has, for a block of candidates and jobs
+def overlap_block(job_terms, candidate_hits, job_start, job_stop):
+    candidates = np.zeros((len(candidate_hits), len(job_terms.terms)))
+    for row, hits in enumerate(candidate_hits):
+        candidates[row, hits] = 1.0
+    matched = candidates @ job_terms.block(job_start, job_stop)
+    totals = np.broadcast_to(job_terms.totals[job_start:job_stop], matched.shape)
+    scores = np.full(matched.shape, NEUTRAL)
+    np.divide(matched, totals, out=scores, where=totals > 0)
+    return scores
+
+
+# The k best (score, column) of every row, merged block by block
+class TopK:
+    def __init__(self, rows, k):
+        self.scores = np.full((rows, k), -1, dtype=np.int64)
+        self.columns = np.full((rows, k), -1, dtype=np.int64)
+
+    def update(self, row_start, scores, column_start):
+        rows = slice(row_start, row_start + scores.shape[0])
+        columns = np.broadcast_to(np.arange(column_start, column_start + scores.shape[1]), scores.shape)
+        merged_scores = np.concatenate([self.scores[rows], scores], axis=1)
+        merged_columns = np.concatenate([self.columns[rows], columns], axis=1)
+        # Higher score first, then lower column, so ties at the cut are broken the same way every time
+        rank = merged_scores * (1 << 32) - merged_columns
+        keep = np.argpartition(-rank, self.scores.shape[1] - 1, axis=1)[:, :self.scores.shape[1]]
+        self.scores[rows] = np.take_along_axis(merged_scores, keep, axis=1)
+        self.columns[rows] = np.take_along_axis(merged_columns, keep, axis=1)
+
+    # [(column, score), ...] best first (lowest column on ties) for every row
+    def results(self):
+        order = np.lexsort((self.columns, -self.scores), axis=1)
+        scores = np.take_along_axis(self.scores, order, axis=1)
+        columns = np.take_along_axis(self.columns, order, axis=1)
+        return [
+            [(int(column), int(score)) for column, score in zip(row_columns, row_scores) if column >= 0]
+            for row_columns, row_scores in zip(columns, scores)
+        ]
+
+
+# Score every candidate (resume attributes, as extract_key_resume_attributes returns them, with
+# the domain_info of each in domain_infos if known) against every job (its listing and structured
+# requirements). Returns (by_candidate, by_job):
+# the top_k_per_candidate (job index, score) of each candidate and the top_k_per_job
+# (candidate index, score) of each job, best first.
+def shortlist_matches(candidates, job_listings, requirements, top_k_per_job=5, top_k_per_candidate=5,
+                      block_size=256, domain_infos=None):
+    domain_infos = domain_infos or [{}] * len(candidates)
+    profiles = [CandidateProfile(attributes, [], domain_info) for attributes, domain_info in zip(candidates, domain_infos)]
+
+    skill_terms = []
+    for requirement in requirements:
+        terms = []
+        for key, weight in (("required_skills", 1.0), ("preferred_skills", PREFERRED_SKILL_WEIGHT)):
+            for skill in requirement.get(key) or []:
+                words = term_words(skill)
+                if words and words not in (term for term, _ in terms):
+                    terms.append((words, weight))
+        skill_terms.append(terms)
+    skills = JobTerms(skill_terms)
+    titles = JobTerms([
+        [(frozenset([word]), 1.0) for word in term_words(job["Job Title"]) - set(SENIORITY_WORDS)]
+        for job in job_listings
+    ])
+    industries = JobTerms([
+        [(frozenset([word]), 1.0) for word in term_words(requirement.get("industry") or "")]
+        for requirement in requirements
+    ])
+
+    skill_hits = [skills.matching(profile.skills) for profile in profiles]
+    title_hits = [titles.matching([frozenset([word]) for word in profile.title_words]) for profile in profiles]
+    industry_hits = [industries.matching([frozenset([word]) for word in profile.industry_words])
+                     for profile in profiles]
+
+    job_levels = np.array([
+        np.nan if (level := job_level(job, requirement)) is None else level
+        for job, requirement in zip(job_listings, requirements)
+    ], dtype=np.float64)
+    min_years = np.array([
+        parse_years(requirement["min_years"]) if requirement.get("min_years") is not None else np.nan
+        for requirement in requirements
+    ], dtype=np.float64)
+    candidate_levels = np.array([np.nan if p.level is None else p.level for p in profiles], dtype=np.float64)
+    candidate_years = np.array([np.nan if p.years is None else p.years for p in profiles], dtype=np.float64)
+
+    best_jobs = TopK(len(profiles), max(1, top_k_per_candidate))
+    best_candidates = TopK(len(job_listings), max(1, top_k_per_job))
+    for job_start in range(0, len(job_listings), block_size):
+        job_stop = min(job_start + block_size, len(job_listings))
+        levels = job_levels[job_start:job_stop]
+        years_asked = np.maximum(min_years[job_start:job_stop], 1)
+
+        for start in range(0, len(profiles), block_size):
+            stop = min(start + block_size, len(profiles))
+            # Unknown levels or years on either side (NaN) score neutral
+            seniority = 1 - np.abs(candidate_levels[start:stop, None] - levels[None, :]) / MAX_SENIORITY_GAP
+            years = np.clip(candidate_years[start:stop, None] / years_asked[None, :], 0, 1)
+            components = {
+                "skills": overlap_block(skills, skill_hits[start:stop], job_start, job_stop),
+                "title": overlap_block(titles, title_hits[start:stop], job_start, job_stop),
+                "seniority": np.where(np.isnan(seniority), NEUTRAL, seniority),
+                "industry": overlap_block(industries, industry_hits[start:stop], job_start, job_stop),
+                "years": np.where(np.isnan(years), NEUTRAL, years),
+            }
+            total = sum(SCORE_WEIGHTS[name] * values for name, values in components.items())
+
+            scores = np.rint(100 * total).astype(np.int64)
+            best_jobs.update(start, scores, job_start)
+            best_candidates.update(job_start, scores.T, start)
+
+    return best_jobs.results(), best_candidates.results()
@@ -0,0 +1,1483 @@
+import atexit
+import contextvars
+import copy
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import tracing
+from claude_scheduler import PRIORITY_BULK, PRIORITY_INTERACTIVE, ClaudeScheduler
+from job_store import JobStore
+from llm_cache import ResponseCache
+from prompt_budget import compress_resume, estimate_tokens, trim_job_description
+from stage_graph import StageGraph
+
+# Resume analysis and job matching core, shared by the Streamlit app and the batch CLI.
+# Nothing here calls Streamlit: errors are logged (and collected, see report_error) and
+# progress is reported through callbacks.
+# Heavy dependencies (anthropic, spacy, pdfminer/pypdfium2, requests/bs4, numpy) are imported
+# on first use so that importing this module, and starting a server process, stays cheap.
+logger = logging.getLogger("resume_core")
+
+# Anthropic (Claude API) settings
+anthropic_api_key = os.environ.get("ANTHROPIC_API_KEY", "API Key")
+CLAUDE_MODEL = "claude-3-haiku-20240307"
+
+# Maximum number of Claude requests in flight across the whole process (lowered automatically
+# while Claude is throttling), the account's request and token rate limits per minute, and the
+# number of retries of a throttled or failed request
+CLAUDE_MAX_CONCURRENCY = 8
+CLAUDE_REQUESTS_PER_MINUTE = int(os.environ.get("CLAUDE_REQUESTS_PER_MINUTE", "50"))
+CLAUDE_TOKENS_PER_MINUTE = int(os.environ.get("CLAUDE_TOKENS_PER_MINUTE", "80000"))
+CLAUDE_MAX_RETRIES = 4
+
+# spaCy model used for local vector pre-ranking, loaded on first use. Only the tokenizer and
+# word vectors are needed, so every trained pipeline component is excluded from loading.
+# en_core_web_md has the same kind of vectors at a fraction of the size; en_core_web_sm has none.
+SPACY_MODEL = os.environ.get("SPACY_MODEL", "en_core_web_lg")
+SPACY_EXCLUDED_COMPONENTS = ["tok2vec", "tagger", "morphologizer", "parser", "senter",
+                             "attribute_ruler", "lemmatizer", "ner"]
+NLP_MODEL_MISSING = (f"SpaCy model {SPACY_MODEL} not found, so job listings are not pre-ranked by similarity "
+                     f"to your resume. Install it with: python -m spacy download {SPACY_MODEL}")
+
+# Resumes the local parser (see resume_parser) reads with at least this confidence (0-1) get their
+# job titles and attributes without Claude requests
+LOCAL_PARSE_MIN_CONFIDENCE = 0.75
+
+# Number of resume analysis stages allowed to call Claude at the same time
+ANALYSIS_WORKERS = 4
+
+# Analyses submitted from the app run as background jobs (see analysis_jobs): ANALYSIS_JOB_WORKERS
+# at a time, at most ANALYSIS_JOB_QUEUE_SIZE waiting. Successful resume analyses are kept for
+# ANALYSIS_JOB_KEEP_SECONDS; finished results, which include a job search, only for as long as
+# the job store keeps postings fresh (JOB_STORE_TTL_SECONDS)
+ANALYSIS_JOB_WORKERS = 4
+ANALYSIS_JOB_QUEUE_SIZE = 32
+ANALYSIS_JOB_KEEP_SECONDS = 7 * 24 * 3600
+
+# Job scoring is local (see skill_match): Claude extracts each posting's requirements once
+# (JOB_SCORING_BATCH_SIZE postings per request, JOB_SCORING_WORKERS requests in flight) and they are
+# kept in the job store. Claude only writes the explanations of the JOB_EXPLANATION_TOP_K best matches.
+# Bump JOB_REQUIREMENTS_VERSION when the extraction prompt changes so stored requirements are redone.
+JOB_SCORING_BATCH_SIZE = 6
+JOB_SCORING_WORKERS = 4
+JOB_EXPLANATION_TOP_K = 5
+JOB_REQUIREMENTS_VERSION = 1
+
+# Recruiter mode (match_candidates): the RECRUITER_TOP_K best jobs of every candidate and candidates
+# of every job are shortlisted, scoring blocks of RECRUITER_BLOCK_SIZE candidates by as many jobs
+RECRUITER_TOP_K = 5
+RECRUITER_BLOCK_SIZE = 256
+
+# Local vector pre-ranking: only the PRERANK_TOP_K listings most similar to the resume
+# (and at least PRERANK_MIN_SIMILARITY cosine similarity) are sent to Claude for scoring
+PRERANK_TOP_K = 8
+PRERANK_MIN_SIMILARITY = 0.0
+
+# LinkedIn scraping: base URL (point it at benchmarks/linkedin_standin.py for local runs),
+# maximum concurrent requests and the per-host request rate and burst size
+LINKEDIN_BASE_URL = os.environ.get("LINKEDIN_BASE_URL", "https://www.linkedin.com")
+SCRAPER_MAX_IN_FLIGHT = 6
+SCRAPER_REQUESTS_PER_SECOND = 2.0
+SCRAPER_BURST = 4
+
+# Scraped postings are reused for JOB_STORE_TTL_SECONDS before being revalidated with LinkedIn
+JOB_STORE_TTL_SECONDS = 24 * 3600
+
+# Job searches are answered from a local BM25 index of stored postings first; LinkedIn is only
+# searched for terms with fewer than LOCAL_SEARCH_MIN_HITS fresh local matches (or num_jobs, if lower)
+LOCAL_SEARCH_MIN_HITS = 4
+
+# LinkedIn searches page through up to SEARCH_MAX_PAGES result pages per location, stopping once
+# each search term has enough good candidates: listings whose title contains at least
+# SEARCH_MIN_TITLE_MATCH of the term's words
+SEARCH_MAX_PAGES = 3
+SEARCH_MIN_TITLE_MATCH = 0.5
+
+# Two-phase retrieval: search cards are ranked on their title, company and location first and only
+# the SEARCH_FETCH_TOP_K best have their detail pages fetched; the rest are fetched on demand.
+# Set SEARCH_LAZY_DESCRIPTIONS=0 to fetch every listing's description while searching instead.
+SEARCH_LAZY_DESCRIPTIONS = os.environ.get("SEARCH_LAZY_DESCRIPTIONS", "1") != "0"
+SEARCH_FETCH_TOP_K = 12
+
+# PDF extraction limits: pages read from an upload and seconds spent extracting them
+PDF_MAX_PAGES = 10
+PDF_TIME_BUDGET_SECONDS = 15.0
+
+# Token budgets (estimated, see prompt_budget) for the resume text sent with each Claude call,
+# and for each job description sent for scoring. Longer text is compressed section by section.
+RESUME_TOKEN_BUDGETS = {
+    "identify_resume_domain": 1200,
+    "extract_job_titles_detailed": 3000,
+    "extract_key_resume_attributes": 3000,
+    "summarize_resume": 2500,
+    "get_resume_improvements": 4000,
+    "extract_resume_profile": 4000,
+}
+JOB_DESCRIPTION_TOKEN_BUDGETS = {
+    "extract_job_requirements": 600,
+    "explain_job_matches": 350,
+}
+
+# Persistent caches and stores live next to this file
+CACHE_DIR = os.environ.get("RESUME_MATCH_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+
+# Bump a function's prompt version whenever its prompt changes so cached responses are invalidated
+PROMPT_VERSIONS = {
+    "identify_resume_domain": 1,
+    "extract_job_titles_detailed": 1,
+    "extract_key_resume_attributes": 2,
+    "summarize_resume": 1,
+    "get_resume_improvements": 1,
+    "extract_resume_profile": 1,
+}
+
+# The eight attribute categories shown in the UI and used for job matching
+ATTRIBUTE_CATEGORIES = [
+    "Professional Skills", "Experience Level", "Core Expertise Areas",
+    "Industries", "Education Background", "Key Achievements",
+    "Years of Experience", "Related Job Titles"
+]
+
+# JSON schemas for schema-constrained (tool use) extraction
+RESUME_ATTRIBUTES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        category: {"type": "array", "items": {"type": "string"}}
+        for category in ATTRIBUTE_CATEGORIES
+    },
+    "required": ATTRIBUTE_CATEGORIES
+}
+
+JOB_TITLES_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "title": {"type": "string", "description": "The exact job title as written"},
+            "current": {"type": "boolean"},
+            "industry": {"type": "string"},
+            "level": {"type": "string", "description": "Junior/Mid/Senior/Executive (if determinable)"}
+        },
+        "required": ["title", "current", "industry", "level"]
+    }
+}
+
+RESUME_ATTRIBUTES_TOOL = {
+    "name": "record_resume_attributes",
+    "description": "Record the key attributes extracted from a resume. Every category is an array of values.",
+    "input_schema": RESUME_ATTRIBUTES_SCHEMA
+}
+
+JOB_REQUIREMENTS_TOOL = {
+    "name": "record_job_requirements",
+    "description": "Record the structured requirements of every job in the list.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "jobs": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "job_number": {"type": "integer", "description": "The number of the job as given in the prompt"},
+                        "required_skills": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Skills, tools and technologies the job requires, each as a short name (e.g. \"Python\", \"A/B testing\")"
+                        },
+                        "preferred_skills": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Skills the job lists as preferred or nice to have"
+                        },
+                        "seniority": {"type": "string", "enum": ["Junior", "Mid", "Senior", "Executive", "Unknown"]},
+                        "industry": {"type": "string", "description": "Industry of the employer, or an empty string"},
+                        "min_years": {"type": ["integer", "null"], "description": "Minimum years of experience asked for, or null"}
+                    },
+                    "required": ["job_number", "required_skills", "preferred_skills", "seniority", "industry", "min_years"]
+                }
+            }
+        },
+        "required": ["jobs"]
+    }
+}
+
+JOB_EXPLANATIONS_TOOL = {
+    "name": "record_job_explanations",
+    "description": "Record why each job in the list is or isn't a good match for the candidate.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "explanations": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "job_number": {"type": "integer", "description": "The number of the job as given in the prompt"},
+                        "factors": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Exactly three reasons why this job is or isn't a good match"
+                        }
+                    },
+                    "required": ["job_number", "factors"]
+                }
+            }
+        },
+        "required": ["explanations"]
+    }
+}
+
+RESUME_PROFILE_TOOL = {
+    "name": "record_resume_profile",
+    "description": "Record the complete analysis of a resume: domain, job history, key attributes, summary and improvements.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "domain_type": {"type": "string", "enum": ["technical", "non-technical"]},
+            "industry": {"type": "string", "description": "Primary industry domain, e.g. software development, healthcare, finance"},
+            "job_titles": JOB_TITLES_SCHEMA,
+            "attributes": RESUME_ATTRIBUTES_SCHEMA,
+            "summary": {"type": "string", "description": "Concise summary of career trajectory, key skills and qualifications"},
+            "improvements": {"type": "string", "description": "3-5 specific, constructive areas of improvement as bullet points"}
+        },
+        "required": ["domain_type", "industry", "job_titles", "attributes", "summary", "improvements"]
+    }
+}
+
+# Shared, lazily created resources. Each can be replaced by assigning the module attribute
+# (e.g. a fake client in benchmarks) before first use.
+client = None
+response_cache = None
+job_store = None
+job_index = None
+scraper = None
+analysis_jobs = None
+claude_scheduler = ClaudeScheduler(
+    requests_per_minute=CLAUDE_REQUESTS_PER_MINUTE,
+    tokens_per_minute=CLAUDE_TOKENS_PER_MINUTE,
+    max_concurrency=CLAUDE_MAX_CONCURRENCY,
+    max_retries=CLAUDE_MAX_RETRIES
+)
+_resource_lock = threading.Lock()
+
+def get_client():
+    global client
+    with _resource_lock:
+        if client is None:
+            from anthropic import Anthropic
+            # Retries are left to claude_scheduler, which knows about every other request in flight
+            client = Anthropic(api_key=anthropic_api_key, max_retries=0)
+        return client
+
+# Persistent response cache shared by every caller in this process
+def get_response_cache():
+    global response_cache
+    with _resource_lock:
+        if response_cache is None:
+            response_cache = ResponseCache(
+                os.path.join(CACHE_DIR, "claude_responses.sqlite3"),
+                ttl_seconds=7 * 24 * 3600, max_entries=2000, max_bytes=50 * 1024 * 1024
+            )
+        return response_cache
+
+# Persistent store of scraped job postings
+def get_job_store():
+    global job_store
+    with _resource_lock:
+        if job_store is None:
+            job_store = JobStore(os.path.join(CACHE_DIR, "job_postings.sqlite3"), ttl_seconds=JOB_STORE_TTL_SECONDS)
+            job_store.prune()
+        return job_store
+
+# Local search index over the job store, brought up to date with the store when first used
+# and saved to disk when the process exits
+def get_job_index():
+    global job_index
+    store = get_job_store()
+    with _resource_lock:
+        if job_index is None:
+            from job_index import JobIndex
+            job_index = JobIndex(os.path.join(CACHE_DIR, "job_index"))
+            job_index.sync(store)
+            atexit.register(job_index.save)
+        return job_index
+
+# Shared scraper: one keep-alive connection pool and per-host rate limiter for every caller
+def get_scraper():
+    global scraper
+    store = get_job_store()
+    with _resource_lock:
+        if scraper is None:
+            from linkedin_scraper import LinkedInScraper
+            scraper = LinkedInScraper(
+                base_url=LINKEDIN_BASE_URL,
+                max_in_flight=SCRAPER_MAX_IN_FLIGHT,
+                requests_per_second=SCRAPER_REQUESTS_PER_SECOND,
+                burst=SCRAPER_BURST,
+                job_store=store
+            )
+        return scraper
+
+# Background analysis jobs, shared by every session of the app
+def get_analysis_jobs():
+    global analysis_jobs
+    with _resource_lock:
+        if analysis_jobs is None:
+            from analysis_jobs import AnalysisJobs
+            analysis_jobs = AnalysisJobs(
+                run_analysis_job, os.path.join(CACHE_DIR, "analysis_jobs.sqlite3"),
+                max_workers=ANALYSIS_JOB_WORKERS, max_queued=ANALYSIS_JOB_QUEUE_SIZE,
+                keep_seconds=JOB_STORE_TTL_SECONDS, analysis_keep_seconds=ANALYSIS_JOB_KEEP_SECONDS
+            )
+        return analysis_jobs
+
+# Limit the number of concurrent Claude requests in this process
+def set_claude_concurrency(limit):
+    claude_scheduler.set_max_concurrency(limit)
+
+# Errors reported while analyzing a resume. Callers that need to know whether an analysis
+# fell back to defaults set this to a list (see collect_errors); it follows the analysis
+# into stage and scoring worker threads because those run in a copy of the caller's context.
+analysis_errors = contextvars.ContextVar("analysis_errors", default=None)
+
+def report_error(message):
+    logger.error(message)
+    errors = analysis_errors.get()
+    if errors is not None:
+        errors.append(message)
+
+# Run func(*args) and return (result, [error messages reported while it ran])
+def collect_errors(func, *args, **kwargs):
+    def run():
+        errors = []
+        analysis_errors.set(errors)
+        return func(*args, **kwargs), errors
+    return contextvars.copy_context().run(run)
+
+# Fit resume text or a job description into the function's token budget and record the savings
+def budget_resume(function_name, resume_text):
+    budgeted = compress_resume(resume_text, RESUME_TOKEN_BUDGETS[function_name])
+    tracing.record_prompt_budget(function_name, estimate_tokens(resume_text), estimate_tokens(budgeted))
+    return budgeted
+
+def budget_job_description(function_name, description):
+    budgeted = trim_job_description(description, JOB_DESCRIPTION_TOKEN_BUDGETS[function_name])
+    tracing.record_prompt_budget(function_name, estimate_tokens(description), estimate_tokens(budgeted))
+    return budgeted
+
+# Send a prompt to Claude and return the response text.
+# With a tool, Claude is forced to call it and the schema-constrained tool input (a dict) is returned instead.
+# When resume_text is given the response is cached under the resume hash, function, model and prompt version.
+# With on_text, a text response is streamed and on_text(chunk) is called as each piece arrives
+# (once with the whole text on a cache hit).
+def ask_claude(function_name, messages, max_tokens, resume_text=None, tool=None, on_text=None,
+               priority=PRIORITY_INTERACTIVE):
+    cache_key = None
+    if resume_text is not None:
+        cache_key = ResponseCache.make_key(
+            function_name, CLAUDE_MODEL, PROMPT_VERSIONS.get(function_name, 1), resume_text, messages, tool
+        )
+        cached = get_response_cache().get(cache_key, function_name)
+        tracing.record_cache_event("claude_responses", "misses" if cached is None else "hits")
+        if cached is not None:
+            if on_text is not None and tool is None:
+                on_text(cached)
+            return cached
+
+    request = {"model": CLAUDE_MODEL, "max_tokens": max_tokens, "messages": messages}
+    if tool is not None:
+        request["tools"] = [tool]
+        request["tool_choice"] = {"type": "tool", "name": tool["name"]}
+    streamed = on_text is not None and tool is None
+    estimated_tokens = max_tokens + sum(
+        estimate_tokens(message["content"]) for message in messages if isinstance(message["content"], str)
+    )
+
+    # One attempt; time spent queueing, rate limited or backing off counts as waiting
+    queued_at = time.perf_counter()
+    sent_text = []
+
+    def send():
+        nonlocal queued_at
+        started_at = time.perf_counter()
+        try:
+            if streamed:
+                with get_client().messages.stream(**request) as stream:
+                    for text in stream.text_stream:
+                        sent_text.append(text)
+                        on_text(text)
+                    response = stream.get_final_message()
+            else:
+                response = get_client().messages.create(**request)
+        except Exception as e:
+            tracing.record_claude_call(function_name, CLAUDE_MODEL, time.perf_counter() - started_at,
+                                       started_at - queued_at, error=type(e).__name__)
+            queued_at = time.perf_counter()
+            raise
+        usage = getattr(response, "usage", None)
+        tracing.record_claude_call(
+            function_name, CLAUDE_MODEL, time.perf_counter() - started_at, started_at - queued_at,
+            input_tokens=getattr(usage, "input_tokens", 0) or 0,
+            output_tokens=getattr(usage, "output_tokens", 0) or 0
+        )
+        return response
+
+    # A stream that already showed text cannot be restarted without repeating it
+    response = claude_scheduler.call(
+        send, priority=priority, tokens=estimated_tokens, can_retry=lambda: not sent_text,
+        function_name=function_name
+    )
+    if tool is not None:
+        result = next(block.input for block in response.content if block.type == "tool_use")
+    else:
+        result = response.content[0].text
+
+    if cache_key is not None:
+        get_response_cache().set(cache_key, function_name, CLAUDE_MODEL, result)
+    return result
+
+# Load NLP model on first use - make this optional to prevent immediate loading errors
+@functools.lru_cache(maxsize=None)
+@tracing.traced
+def load_nlp_model():
+    try:
+        import spacy
+        return spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDED_COMPONENTS)
+    except Exception:
+        logger.warning(NLP_MODEL_MISSING)
+        return None
+
+# Function to extract text from a PDF, straight from the uploaded bytes
+@tracing.traced
+def extract_resume_text(pdf_bytes):
+    try:
+        from pdf_extract import extract_pdf_text
+        return extract_pdf_text(pdf_bytes, max_pages=PDF_MAX_PAGES, time_budget=PDF_TIME_BUDGET_SECONDS)
+    except Exception as e:
+        report_error(f"Error extracting text from PDF: {e}")
+        return ""
+
+# Identify resume domain (tech vs non-tech) using Claude AI with expanded industry recognition
+@tracing.traced
+def identify_resume_domain(resume_text):
+    try:
+        resume_for_prompt = budget_resume("identify_resume_domain", resume_text)
+        response_text = ask_claude(
+            "identify_resume_domain",
+            max_tokens=300,
+            resume_text=resume_text,
+            messages=[
+                {
+                    "role": "user",
+                    "content": f"""Analyze this resume and determine if it's for a technical or non-technical role.
+                    Return just "technical" or "non-technical", and the primary industry domain.
+                    
+                    For industry, be specific and choose from categories including but not limited to:
+                    - software development
+                    - data science
+                    - artificial intelligence
+                    - cybersecurity
+                    - healthcare
+                    - pharmaceuticals
+                    - biotech
+                    - finance
+                    - banking
+                    - insurance
+                    - real estate
+                    - education
+                    - marketing
+                    - advertising
+                    - media
+                    - entertainment
+                    - hospitality
+                    - retail
+                    - e-commerce
+                    - manufacturing
+                    - construction
+                    - logistics
+                    - transportation
+                    - telecommunications
+                    - energy
+                    - environmental
+                    - legal
+                    - consulting
+                    - human resources
+                    - government
+                    - nonprofit
+                    - consumer goods
+                    - agriculture
+                    - automotive
+                    
+                    Format: domain_type|industry
+                    Example: technical|software development or non-technical|healthcare
+                    
+                    Resume:
+                    {resume_for_prompt}"""
+                }
+            ]
+        )
+        domain_info = response_text.strip()
+        # Extract domain parts
+        parts = domain_info.split('|')
+        if len(parts) >= 2:
+            return {
+                "type": parts[0].strip().lower(),
+                "industry": parts[1].strip().lower()
+            }
+        return {
+            "type": "technical" if "technical" in domain_info.lower() else "non-technical", 
+            "industry": "general"
+        }
+    except Exception as e:
+        report_error(f"Error identifying resume domain: {e}")
+        return {"type": "unknown", "industry": "general"}
+
+# The local parse of a resume ({"job_titles", "resume_attributes", ...}), or None when the parser
+# is not confident enough for it to replace the Claude stages
+def parse_resume_locally(resume_text):
+    from resume_parser import parse_resume
+    
+    parsed = parse_resume(resume_text)
+    if parsed["confidence"] < LOCAL_PARSE_MIN_CONFIDENCE:
+        return None
+    return copy.deepcopy(parsed)  # parse_resume results are cached and shared
+
+# Extract past job titles with emphasis on timeline and role specificity
+@tracing.traced
+def extract_job_titles_detailed(resume_text):
+    # Well-formatted resumes are parsed locally, without a Claude request
+    parsed = parse_resume_locally(resume_text)
+    tracing.record_cache_event("local_parser", "misses" if parsed is None else "hits")
+    if parsed is not None:
+        return parsed["job_titles"]
+    
+    try:
+        resume_for_prompt = budget_resume("extract_job_titles_detailed", resume_text)
+        response_text = ask_claude(
+            "extract_job_titles_detailed",
+            max_tokens=1000,
+            resume_text=resume_text,
+            messages=[
+                {
+                    "role": "user",
+                    "content": f"""Extract ALL job titles from this resume with the following details:
+                    1. Include the exact job title as written
+                    2. For each job title, note if it's current or past
+                    3. Include the industry/domain for each role
+                    4. Add any level indicator (junior, senior, etc.)
+                    
+                    Format your response as a JSON array of objects with these fields:
+                    - title: The exact job title
+                    - current: true/false
+                    - industry: The industry/domain
+                    - level: Junior/Mid/Senior/Executive (if determinable)
+                    
+                    DO NOT include any explanatory text. ONLY return the JSON array.
+                    
+                    Resume:
+                    {resume_for_prompt}"""
+                }
+            ]
+        )
+        
+        response_text = response_text.strip()
+        
+        # Find JSON content between triple backticks if present
+        json_match = re.search(r'```json\s*(.*?)\s*```', response_text, re.DOTALL)
+        if json_match:
+            import json
+            try:
+                return json.loads(json_match.group(1))
+            except:
+                pass
+        
+        # Try to parse as JSON directly if not in backticks
+        try:
+            import json
+            return json.loads(response_text)
+        except:
+            # If JSON parsing fails, return a structured placeholder
+            return [{"title": "Could not parse job titles", "current": False, "industry": "unknown", "level": "unknown"}]
+            
+    except Exception as e:
+        report_error(f"Error extracting job titles: {e}")
+        return [{"title": "Error extracting job titles", "current": False, "industry": "unknown", "level": "unknown"}]
+
+# Extract key resume attributes using Claude AI
+@tracing.traced
+def extract_key_resume_attributes(resume_text, domain_info, job_titles):
+    parsed = parse_resume_locally(resume_text)
+    tracing.record_cache_event("local_parser", "misses" if parsed is None else "hits")
+    if parsed is not None:
+        return normalize_resume_attributes(parsed["resume_attributes"])
+    
+    try:
+        resume_for_prompt = budget_resume("extract_key_resume_attributes", resume_text)
+        # Prepare job titles information for Claude
+        job_titles_text = "\n".join([
+            f"- {job['title']} " + 
+            f"({'Current' if job['current'] else 'Past'}, {job['industry']}, {job['level']})"
+            for job in job_titles
+        ])
+        
+        attributes = ask_claude(
+            "extract_key_resume_attributes",
+            max_tokens=1500,
+            resume_text=resume_text,
+            tool=RESUME_ATTRIBUTES_TOOL,
+            messages=[
+                {
+                    "role": "user",
+                    "content": f"""Analyze this resume for a {domain_info['type']} role in the {domain_info['industry']} industry.
+                    
+                    The identified job titles are:
+                    {job_titles_text}
+                    
+                    Extract the following key attributes in a structured format:
+                    
+                    1. Professional Skills (technical and soft skills)
+                    2. Experience Level (entry, mid, senior)
+                    3. Core Expertise Areas (main domains of expertise)
+                    4. Industries (sectors the person has worked in)
+                    5. Education Background
+                    6. Key Achievements
+                    7. Years of Experience
+                    8. Related Job Titles (other roles this person would be qualified for)
+                    
+                    Record them with the record_resume_attributes tool. For each category, provide an array of values.
+                    
+                    Resume:
+                    {resume_for_prompt}"""
+                }
+            ]
+        )
+        
+        # The tool schema guarantees the structure, so no free-text parsing is needed
+        return normalize_resume_attributes(attributes)
+        
+    except Exception as e:
+        report_error(f"Error calling Claude API for resume attributes: {e}")
+        return normalize_resume_attributes({})
+
+# Make sure every attribute category is present as a list of non-empty strings
+def normalize_resume_attributes(attributes):
+    normalized = {}
+    for category in ATTRIBUTE_CATEGORIES:
+        values = attributes.get(category) or []
+        if isinstance(values, str):
+            values = [values]
+        normalized[category] = [str(value).strip() for value in values if str(value).strip()]
+    return normalized
+
+# Get resume summary
+@tracing.traced
+def summarize_resume(resume_text, domain_info, on_text=None):
+    try:
+        resume_for_prompt = budget_resume("summarize_resume", resume_text)
+        response_text = ask_claude(
+            "summarize_resume",
+            max_tokens=800,
+            resume_text=resume_text,
+            on_text=on_text,
+            messages=[
+                {
+                    "role": "user",
+                    "content": f"Summarize the following resume for a {domain_info['type']} role in the {domain_info['industry']} industry. Focus on career trajectory, key skills, and qualifications. Be concise and highlight the most impressive aspects:\n\n{resume_for_prompt}"
+                }
+            ]
+        )
+        return response_text
+    except Exception as e:
+        report_error(f"Error calling Claude API for summarization: {e}")
+        return "Could not generate resume summary. Please check your API key."
+
+# Get resume improvements
+@tracing.traced
+def get_resume_improvements(resume_text, domain_info, on_text=None):
+    try:
+        resume_for_prompt = budget_resume("get_resume_improvements", resume_text)
+        response_text = ask_claude(
+            "get_resume_improvements",
+            max_tokens=1000,
+            resume_text=resume_text,
+            on_text=on_text,
+            messages=[
+                {
+                    "role": "user",
+                    "content": f"You are a professional resume reviewer for {domain_info['type']} roles in the {domain_info['industry']} industry. Based on the following resume, suggest 3-5 specific areas of improvement. Focus on content, structure, and presentation. Be constructive and specific. Here's the resume text:\n\n{resume_for_prompt}"
+                }
+            ]
+        )
+        return response_text
+    except Exception as e:
+        report_error(f"Error calling Claude API for improvements: {e}")
+        return "Could not generate improvement suggestions. Please check your API key."
+
+# Extract domain, job titles, attributes, summary and improvements with one schema-constrained Claude call.
+# Returns the same structures the multi-call pipeline produces, keyed like its stages.
+@tracing.traced
+def extract_resume_profile(resume_text):
+    try:
+        resume_for_prompt = budget_resume("extract_resume_profile", resume_text)
+        profile = ask_claude(
+            "extract_resume_profile",
+            max_tokens=4000,
+            resume_text=resume_text,
+            tool=RESUME_PROFILE_TOOL,
+            messages=[
+                {
+                    "role": "user",
+                    "content": f"""Analyze this resume completely and record the result with the record_resume_profile tool.
+                    
+                    - domain_type: whether the resume is for a technical or non-technical role
+                    - industry: the primary industry domain, as specific as possible (e.g. software development, data science, healthcare, finance, marketing, logistics)
+                    - job_titles: ALL job titles exactly as written, whether each is current or past, its industry/domain and level (Junior/Mid/Senior/Executive if determinable)
+                    - attributes: Professional Skills (technical and soft skills), Experience Level (entry, mid, senior), Core Expertise Areas, Industries, Education Background, Key Achievements, Years of Experience and Related Job Titles (other roles this person would be qualified for), each as an array of values
+                    - summary: a concise summary focused on career trajectory, key skills and qualifications, highlighting the most impressive aspects
+                    - improvements: 3-5 specific areas of improvement in content, structure and presentation, written as a constructive professional resume reviewer
+                    
+                    Resume:
+                    {resume_for_prompt}"""
+                }
+            ]
+        )
+        
+        job_titles = [
+            {
+                "title": str(job.get("title", "")).strip() or "Unknown title",
+                "current": bool(job.get("current", False)),
+                "industry": job.get("industry") or "unknown",
+                "level": job.get("level") or "unknown"
+            }
+            for job in profile.get("job_titles") or []
+        ]
+        
+        return {
+            "domain_info": {
+                "type": (profile.get("domain_type") or "unknown").strip().lower(),
+                "industry": (profile.get("industry") or "general").strip().lower()
+            },
+            "job_titles": job_titles or [{"title": "Could not parse job titles", "current": False, "industry": "unknown", "level": "unknown"}],
+            "resume_attributes": normalize_resume_attributes(profile.get("attributes") or {}),
+            "resume_summary": profile.get("summary") or "Could not generate resume summary.",
+            "improvement_suggestions": profile.get("improvements") or "Could not generate improvement suggestions."
+        }
+    except Exception as e:
+        report_error(f"Error calling Claude API for consolidated resume analysis: {e}")
+        return {
+            "domain_info": {"type": "unknown", "industry": "general"},
+            "job_titles": [{"title": "Error extracting job titles", "current": False, "industry": "unknown", "level": "unknown"}],
+            "resume_attributes": normalize_resume_attributes({}),
+            "resume_summary": "Could not generate resume summary. Please check your API key.",
+            "improvement_suggestions": "Could not generate improvement suggestions. Please check your API key."
+        }
+
+# Extract Contact Info
+def extract_contact_info(text):
+    email_pattern = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
+    phone_pattern = r'\+?\d{1,3}[-.\s]?\(?\d{2,4}\)?[-.\s]?\d{2,4}[-.\s]?\d{4}'
+    linkedin_pattern = r'linkedin\.com/in/[a-zA-Z0-9_-]+'
+    
+    emails = re.findall(email_pattern, text)
+    phones = re.findall(phone_pattern, text)
+    linkedin = re.findall(linkedin_pattern, text)
+    
+    return {
+        "Email": emails[0] if emails else "Not Found",
+        "Phone": phones[0] if phones else "Not Found",
+        "LinkedIn": linkedin[0] if linkedin else "Not Found"
+    }
+
+# Build the dependency graph of resume analysis stages:
+# domain_info, job_titles and contact_info need only the resume text,
+# summary and improvements need domain_info, attributes need domain_info and job_titles.
+# With on_text, the summary and improvements are streamed: on_text(stage name, chunk) is called
+# from the worker thread as text arrives.
+def build_analysis_graph(resume_text, on_text=None):
+    def stream_to(stage_name):
+        return (lambda chunk: on_text(stage_name, chunk)) if on_text else None
+    
+    return (
+        StageGraph()
+        .add("domain_info", lambda: identify_resume_domain(resume_text))
+        .add("job_titles", lambda: extract_job_titles_detailed(resume_text))
+        .add("contact_info", lambda: extract_contact_info(resume_text))
+        .add("resume_attributes",
+             lambda domain, titles: extract_key_resume_attributes(resume_text, domain, titles),
+             depends_on=["domain_info", "job_titles"])
+        .add("resume_summary",
+             lambda domain: summarize_resume(resume_text, domain, on_text=stream_to("resume_summary")),
+             depends_on=["domain_info"])
+        .add("improvement_suggestions",
+             lambda domain: get_resume_improvements(resume_text, domain, on_text=stream_to("improvement_suggestions")),
+             depends_on=["domain_info"])
+    )
+
+# Generate search terms based on job titles and domain
+def generate_search_terms(job_titles, resume_attributes, domain_info):
+    search_terms = []
+    
+    # Always prioritize the most recent job titles
+    current_jobs = [job["title"] for job in job_titles if job.get("current", False)]
+    if current_jobs:
+        search_terms.extend(current_jobs[:2])
+    
+    # Add past job titles if we need more terms
+    past_jobs = [job["title"] for job in job_titles if not job.get("current", False)]
+    if past_jobs and len(search_terms) < 2:
+        search_terms.extend(past_jobs[:2 - len(search_terms)])
+    
+    # Add related job titles from attributes
+    if "Related Job Titles" in resume_attributes and resume_attributes["Related Job Titles"] and len(search_terms) < 3:
+        search_terms.extend(resume_attributes["Related Job Titles"][:3 - len(search_terms)])
+    
+    # Add industry-specific terms for non-tech roles
+    if domain_info["type"] == "non-technical" and domain_info["industry"] != "general":
+        industry_term = f"{domain_info['industry']} {job_titles[0]['title'] if job_titles else ''}"
+        search_terms.append(industry_term.strip())
+    
+    # Ensure we have at least one search term
+    if not search_terms:
+        search_terms = ["entry level"] if "entry" in str(resume_attributes.get("Experience Level", [])).lower() else ["experienced"]
+    
+    # Remove duplicates and limit
+    return list(set(search_terms))[:4]
+
+
+def find_job_details(job_url, card=None):
+    return get_scraper().fetch_job_description(job_url, card)
+
+# Stored postings matching search_term in the local index, best first, as (job, is_fresh) pairs
+def search_local_jobs(search_term, location, num_jobs):
+    store = get_job_store()
+    local_jobs = []
+    for document, _ in get_job_index().search(search_term, location=location, limit=num_jobs):
+        posting = store.get(document["url"])
+        if posting is None:  # pruned from the store since it was indexed
+            continue
+        local_jobs.append(({
+            "Job Title": posting["title"] or "",
+            "Company": posting["company"] or "",
+            "Location": posting["location"] or "",
+            "Description": posting["description"],
+            "Job Link": posting["url"],
+            "Search Term": search_term
+        }, store.is_fresh(posting)))
+    return local_jobs
+
+# Share of a search term's words that appear in a job title ("Data Engineer" in "Senior Data Engineer")
+def title_match(search_term, job_title):
+    term_words = set(re.findall(r"[a-z0-9+#]+", search_term.lower()))
+    title_words = set(re.findall(r"[a-z0-9+#]+", job_title.lower()))
+    return len(term_words & title_words) / len(term_words) if term_words else 0.0
+
+# Stream job listings for search terms across one or more locations, deduplicated as they arrive.
+# Each term is answered from the local index first and only searched on LinkedIn (paging through
+# up to max_pages results per location) while it has fewer than num_jobs good candidates: jobs
+# with a description whose title matches at least SEARCH_MIN_TITLE_MATCH of the term. The search
+# stops as soon as every term has enough.
+# With hydrate=False, LinkedIn jobs are streamed as their search cards, with a None description
+# and counted on their title alone (see shortlist_linkedin_jobs).
+def iter_linkedin_jobs(search_terms, locations, domain_info, num_jobs=6, max_pages=SEARCH_MAX_PAGES,
+                       hydrate=True):
+    from job_dedup import NON_DESCRIPTIONS, CardDeduplicator, NearDuplicateIndex
+
+    # Safety check
+    if not search_terms:
+        return
+    if isinstance(locations, str):
+        locations = [locations]
+
+    deduplicator = CardDeduplicator()
+    near_duplicates = NearDuplicateIndex()
+    found = {search_term: 0 for search_term in search_terms}
+    yielded = {search_term: 0 for search_term in search_terms}
+
+    # Keep a job unless it repeats an earlier one, and count it if it is a good candidate
+    def accept(job):
+        if not deduplicator.add(job):
+            return False
+        description = job["Description"]
+        if description not in NON_DESCRIPTIONS:
+            if description is not None and near_duplicates.add(job["Job Link"], description) is not None:
+                return False
+            if title_match(job["Search Term"], job["Job Title"]) >= SEARCH_MIN_TITLE_MATCH:
+                found[job["Search Term"]] += 1
+        yielded[job["Search Term"]] += 1
+        return True
+
+    # Fresh local hits come first; LinkedIn is only searched for terms with too few of them
+    local_jobs = {
+        search_term: [hit for location in locations for hit in search_local_jobs(search_term, location, num_jobs)]
+        for search_term in search_terms
+    }
+    min_hits = min(num_jobs, LOCAL_SEARCH_MIN_HITS)
+    scrape_terms = [
+        search_term for search_term, hits in local_jobs.items()
+        if len({job["Job Link"] for job, is_fresh in hits if is_fresh}) < min_hits
+    ]
+    for search_term in search_terms:
+        tracing.record_cache_event("job_index", "misses" if search_term in scrape_terms else "hits")
+        for job, is_fresh in local_jobs[search_term]:
+            if is_fresh and found[search_term] < num_jobs and accept(job):
+                yield job
+
+    if scrape_terms:
+        logger.info(f"Searching for jobs in {', '.join(locations)} using terms: {', '.join(scrape_terms)}")
+        # Search pages and job detail pages are fetched concurrently through the shared scraper
+        jobs = get_scraper().iter_jobs(
+            scrape_terms, locations, domain_info, max_pages=max_pages,
+            needed=lambda search_term: max(0, num_jobs - found[search_term]),
+            on_error=lambda search_term, location: logger.warning(f"Error scraping jobs for {search_term} in {location}"),
+            hydrate=hydrate
+        )
+        try:
+            for job in jobs:
+                if found[job["Search Term"]] < num_jobs and accept(job):
+                    yield job
+                if all(found[search_term] >= num_jobs for search_term in scrape_terms):
+                    break
+        finally:
+            jobs.close()
+            get_job_index().sync(get_job_store())
+
+    # Stale local hits only stand in for terms that nothing else was found for
+    for search_term in search_terms:
+        if not yielded[search_term]:
+            for job, is_fresh in local_jobs[search_term]:
+                if not is_fresh and accept(job):
+                    yield job
+
+# Job listings for search terms in one location or a list of them (see iter_linkedin_jobs).
+# on_job(job), when given, is called as each listing arrives.
+@tracing.traced
+def find_linkedin_jobs(search_terms, locations, domain_info, num_jobs=6, on_job=None):
+    job_listings = []
+    for job in iter_linkedin_jobs(search_terms, locations, domain_info, num_jobs=num_jobs):
+        job_listings.append(job)
+        if on_job:
+            on_job(job)
+    return job_listings
+
+# Two-phase job search: stream the search cards without requesting any detail page (local hits
+# keep their stored descriptions), rank them on what the cards show (skill_match.score_cards) and
+# fetch the descriptions of the fetch_top_k best concurrently. Near-duplicate postings are dropped
+# once their descriptions are known. Every job gets its "Card Score".
+# Returns (job_listings, more_listings): the fetched listings, best card first, and the other
+# cards without descriptions, for hydrate_job to fetch when they are asked for.
+@tracing.traced
+def shortlist_linkedin_jobs(search_terms, locations, domain_info, resume_attributes, job_titles, num_jobs=6,
+                            fetch_top_k=SEARCH_FETCH_TOP_K, on_job=None):
+    from job_dedup import NON_DESCRIPTIONS, NearDuplicateIndex
+    from skill_match import score_cards
+    
+    if isinstance(locations, str):
+        locations = [locations]
+    
+    cards = []
+    for card in iter_linkedin_jobs(search_terms, locations, domain_info, num_jobs=num_jobs, hydrate=False):
+        cards.append(card)
+        if on_job:
+            on_job(card)
+    
+    for card, card_score in zip(cards, score_cards(cards, resume_attributes, job_titles, domain_info, locations)):
+        card["Card Score"] = card_score["score"]
+    cards.sort(key=lambda card: card["Card Score"], reverse=True)
+    shortlist, more_listings = cards[:fetch_top_k], cards[fetch_top_k:]
+    
+    unfetched = [job for job in shortlist if job["Description"] is None]
+    if unfetched:
+        for job, description in zip(unfetched, get_scraper().fetch_job_descriptions(unfetched)):
+            job["Description"] = description
+        get_job_index().sync(get_job_store())
+    
+    near_duplicates = NearDuplicateIndex()
+    job_listings = [
+        job for job in shortlist
+        if job["Description"] in NON_DESCRIPTIONS or near_duplicates.add(job["Job Link"], job["Description"]) is None
+    ]
+    return job_listings, more_listings
+
+# A listing with its description, fetched now if it was left out of the shortlist
+def hydrate_job(job):
+    if job.get("Description") is None:
+        job = {**job, "Description": find_job_details(job["Job Link"], job)}
+    return job
+
+# Job listings for an analyzed resume's search terms: two-phase (shortlist_linkedin_jobs) when
+# SEARCH_LAZY_DESCRIPTIONS is set, otherwise every listing with its description (find_linkedin_jobs).
+# Returns (job_listings, more_listings); more_listings is empty when every description was fetched.
+def search_jobs(analysis, search_terms, locations, on_job=None):
+    if SEARCH_LAZY_DESCRIPTIONS:
+        return shortlist_linkedin_jobs(
+            search_terms, locations, analysis["domain_info"], analysis["resume_attributes"],
+            analysis["job_titles"], on_job=on_job
+        )
+    return find_linkedin_jobs(search_terms, locations, analysis["domain_info"], on_job=on_job), []
+
+# Format resume attributes for Claude
+def format_resume_attributes(resume_attributes):
+    return "\n".join([
+        f"{key}:\n- " + "\n- ".join(values) 
+        for key, values in resume_attributes.items() if values
+    ])
+
+# Format job titles specifically
+def format_job_titles(job_titles):
+    return "\n".join([
+        f"- {job['title']} ({'Current' if job['current'] else 'Past'}, {job['industry']}, {job['level']})"
+        for job in job_titles
+    ])
+
+# Format a job listing for Claude, with the description trimmed to the calling function's budget
+def format_job_info(job_info, function_name):
+    return f"""
+        Job Title: {job_info['Job Title']}
+        Company: {job_info['Company']}
+        Location: {job_info['Location']}
+        Description: {budget_job_description(function_name, job_info['Description'])}
+        """
+
+# Extract the structured requirements of several jobs in a single Claude request.
+# Returns one requirements dict per job, in the order of job_batch (None where extraction failed).
+def extract_job_requirements(job_batch):
+    try:
+        jobs_text = "\n".join([
+            f"Job {number}:{format_job_info(job, 'extract_job_requirements')}"
+            for number, job in enumerate(job_batch, start=1)
+        ])
+        
+        result = ask_claude(
+            "extract_job_requirements",
+            max_tokens=min(4000, 200 + 250 * len(job_batch)),
+            tool=JOB_REQUIREMENTS_TOOL,
+            priority=PRIORITY_BULK,
+            messages=[
+                {
+                    "role": "user",
+                    "content": f"""Extract the requirements of each of the following {len(job_batch)} job postings.
+                    
+                    Jobs:
+                    {jobs_text}
+                    
+                    For each job list the skills, tools and technologies it requires and those it only prefers, using short canonical names. Give the seniority of the role, the industry of the employer and the minimum years of experience asked for (null if none is stated).
+                    
+                    Record the results for every job with the record_job_requirements tool, using the job numbers given above.
+                    """
+                }
+            ]
+        )
+        
+        requirements = [None] * len(job_batch)
+        for entry in result.get("jobs", []):
+            index = int(entry.get("job_number", 0)) - 1
+            if 0 <= index < len(job_batch):
+                min_years = entry.get("min_years")
+                requirements[index] = {
+                    "required_skills": [str(skill).strip() for skill in entry.get("required_skills") or [] if str(skill).strip()],
+                    "preferred_skills": [str(skill).strip() for skill in entry.get("preferred_skills") or [] if str(skill).strip()],
+                    "seniority": str(entry.get("seniority") or "Unknown"),
+                    "industry": str(entry.get("industry") or ""),
+                    "min_years": int(min_years) if isinstance(min_years, (int, float)) else None
+                }
+        return requirements
+    except Exception as e:
+        report_error(f"Error extracting job requirements: {str(e)}")
+        return [None] * len(job_batch)
+
+# Structured requirements of every job: from the job store when this description was already
+# extracted, otherwise from Claude, batch_size postings per request and up to max_workers requests
+# at once. Jobs without a description get empty requirements (they are scored on their title).
+# on_extracted(requirements so far, None where still missing) is called from the calling thread.
+def get_job_requirements(job_listings, batch_size=JOB_SCORING_BATCH_SIZE, max_workers=JOB_SCORING_WORKERS,
+                         initializer=None, on_extracted=None):
+    from job_dedup import NON_DESCRIPTIONS
+    
+    store = get_job_store()
+    requirements = [None] * len(job_listings)
+    missing = []
+    for index, job in enumerate(job_listings):
+        if job.get("Description", "") in NON_DESCRIPTIONS:
+            requirements[index] = {}
+            continue
+        requirements[index] = store.get_requirements(job["Job Link"], job["Description"], JOB_REQUIREMENTS_VERSION)
+        tracing.record_cache_event("job_requirements", "misses" if requirements[index] is None else "hits")
+        if requirements[index] is None:
+            missing.append(index)
+    
+    if on_extracted and len(missing) < len(job_listings):
+        on_extracted(list(requirements))
+    
+    batch_size = max(1, batch_size)
+    batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+    
+    # Extract the batches concurrently, each in a copy of the caller's context
+    with ThreadPoolExecutor(max_workers=max_workers, initializer=initializer) as executor:
+        futures = {
+            executor.submit(contextvars.copy_context().run, extract_job_requirements,
+                            [job_listings[index] for index in batch]): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            for index, extracted in zip(futures[future], future.result()):
+                job = job_listings[index]
+                if extracted is not None:
+                    store.put_requirements(job["Job Link"], job["Description"], JOB_REQUIREMENTS_VERSION, extracted)
+                requirements[index] = extracted if extracted is not None else {}
+            if on_extracted:
+                on_extracted(list(requirements))
+    
+    return requirements
+
+# Have Claude explain several scored matches in one request.
+# Returns three factors per job match, in order ([] for any it could not explain).
+def explain_job_matches(job_matches, resume_attributes, domain_info, job_titles, priority=PRIORITY_INTERACTIVE):
+    if not job_matches:
+        return []
+    
+    try:
+        attributes_text = format_resume_attributes(resume_attributes)
+        job_titles_text = format_job_titles(job_titles)
+        jobs_text = "\n".join([
+            f"""Job {number}:{format_job_info(job_match['job'], 'explain_job_matches')}
+        Match Score: {job_match['score']}
+        Matched Skills: {', '.join(job_match['match']['matched_skills']) or 'none'}
+        Missing Skills: {', '.join(job_match['match']['missing_skills']) or 'none'}
+        """
+            for number, job_match in enumerate(job_matches, start=1)
+        ])
+        
+        # The prompt holds everything the explanations depend on, so it can be cached like a resume stage
+        result = ask_claude(
+            "explain_job_matches",
+            max_tokens=min(4000, 200 + 250 * len(job_matches)),
+            resume_text=attributes_text,
+            tool=JOB_EXPLANATIONS_TOOL,
+            priority=priority,
+            messages=[
+                {
+                    "role": "user",
+                    "content": f"""The following {len(job_matches)} jobs have been scored against the candidate's profile. This candidate has a {domain_info['type']} background in the {domain_info['industry']} industry.
+                    
+                    Candidate's Job History:
+                    {job_titles_text}
+                    
+                    Resume Attributes:
+                    {attributes_text}
+                    
+                    Jobs:
+                    {jobs_text}
+                    
+                    For each job, write exactly three short points explaining why it is or isn't a good match, consistent with its score. Put extra emphasis on past job titles and industry alignment.
+                    
+                    Record the results for every job with the record_job_explanations tool, using the job numbers given above.
+                    """
+                }
+            ]
+        )
+        
+        explanations = [[] for _ in job_matches]
+        for entry in result.get("explanations", []):
+            index = int(entry.get("job_number", 0)) - 1
+            if 0 <= index < len(job_matches):
+                explanations[index] = [str(factor).strip() for factor in entry.get("factors") or [] if str(factor).strip()]
+        return explanations
+    except Exception as e:
+        report_error(f"Error explaining job matches: {str(e)}")
+        return [[] for _ in job_matches]
+
+# Rank jobs by a local score of their requirements against the resume attributes.
+# Requirements missing from the job store are extracted first (see get_job_requirements); the
+# top explain_top_k matches then get explanations written by Claude, the rest plain factors.
+# Jobs without any requirements are ranked after every scored job (see skill_match.rank_key).
+# on_progress(fraction done) and on_scored(jobs scored so far, best first) are called from the
+# calling thread as requirements arrive; initializer runs in each worker thread.
+# Each ranked job is {"job", "score", "factors", "match"} with the score details in "match".
+@tracing.traced
+def rank_jobs(job_listings, resume_attributes, domain_info, job_titles,
+              batch_size=JOB_SCORING_BATCH_SIZE, max_workers=JOB_SCORING_WORKERS,
+              on_progress=None, initializer=None, on_scored=None, explain_top_k=JOB_EXPLANATION_TOP_K):
+    from skill_match import describe_match, rank_key, score_jobs
+    
+    if not job_listings:
+        return []
+    
+    total_steps = len(job_listings) + 1  # every job's requirements, then the explanations
+    
+    def rank(requirements):
+        known = [index for index, requirement in enumerate(requirements) if requirement is not None]
+        matches = score_jobs(
+            [job_listings[index] for index in known], [requirements[index] for index in known],
+            resume_attributes, job_titles, domain_info
+        )
+        ranked_jobs = [
+            {"job": job_listings[index], "score": match["score"],
+             "factors": describe_match(match, resume_attributes), "match": match}
+            for index, match in zip(known, matches)
+        ]
+        ranked_jobs.sort(key=rank_key)
+        return ranked_jobs
+    
+    def on_extracted(requirements):
+        if on_progress:
+            on_progress(sum(requirement is not None for requirement in requirements) / total_steps)
+        if on_scored:
+            on_scored(rank(requirements))
+    
+    requirements = get_job_requirements(job_listings, batch_size, max_workers, initializer, on_extracted)
+    ranked_jobs = rank(requirements)
+    
+    # Claude explains the best matches (unscored jobs have nothing to explain)
+    top_jobs = [job_match for job_match in ranked_jobs[:explain_top_k] if job_match["match"]["scored"]]
+    for job_match, factors in zip(top_jobs, explain_job_matches(top_jobs, resume_attributes, domain_info, job_titles)):
+        if factors:
+            job_match["factors"] = factors
+    
+    if on_progress:
+        on_progress(1.0)
+    if on_scored:
+        on_scored(ranked_jobs)
+    return ranked_jobs
+
+# Run every resume-side stage and return {domain_info, job_titles, resume_attributes,
+# resume_summary, improvement_suggestions, contact_info}, either with one consolidated
+# Claude request or through the concurrent stage graph.
+# on_complete(stage name, result) is called from the calling thread as stages finish.
+# on_text(stage name, chunk) streams the summary and improvements as they are generated
+# (multi-call mode only; the consolidated request delivers them through on_complete).
+@tracing.traced
+def analyze_resume(resume_text, consolidated=False, on_complete=None, initializer=None, on_text=None):
+    if consolidated:
+        analysis = extract_resume_profile(resume_text)
+        analysis["contact_info"] = extract_contact_info(resume_text)
+        if on_complete:
+            for stage_name, result in analysis.items():
+                on_complete(stage_name, result)
+        return analysis
+    
+    return build_analysis_graph(resume_text, on_text=on_text).run(
+        max_workers=ANALYSIS_WORKERS,
+        on_complete=on_complete,
+        initializer=initializer
+    )
+
+# Order job listings by word-vector similarity to the resume and keep the closest (see job_vectors)
+@tracing.traced
+def prerank_jobs(nlp, job_listings, resume_attributes, job_titles,
+                 top_k=PRERANK_TOP_K, min_similarity=PRERANK_MIN_SIMILARITY):
+    if nlp is None or not job_listings:
+        return job_listings
+    from job_vectors import prerank_jobs as vector_prerank_jobs
+    return vector_prerank_jobs(nlp, job_listings, resume_attributes, job_titles, top_k, min_similarity)
+
+# Find, pre-rank and score job listings for an analyzed resume.
+# The NLP model is loaded here, on first use, unless one is passed in.
+# Returns (search_terms, ranked_jobs).
+@tracing.traced
+def match_jobs(analysis, location, nlp=None, on_progress=None, initializer=None):
+    domain_info = analysis["domain_info"]
+    job_titles = analysis["job_titles"]
+    resume_attributes = analysis["resume_attributes"]
+    
+    search_terms = generate_search_terms(job_titles, resume_attributes, domain_info)
+    job_listings, _ = search_jobs(analysis, search_terms, location)
+    if job_listings and nlp is None:
+        nlp = load_nlp_model()
+    job_listings = prerank_jobs(
+        nlp, job_listings, resume_attributes, job_titles,
+        top_k=PRERANK_TOP_K, min_similarity=PRERANK_MIN_SIMILARITY
+    )
+    ranked_jobs = rank_jobs(
+        job_listings, resume_attributes, domain_info, job_titles,
+        on_progress=on_progress, initializer=initializer
+    )
+    return search_terms, ranked_jobs
+
+ANALYSIS_RESULTS = ["domain_info", "job_titles", "resume_attributes", "resume_summary", "improvement_suggestions",
+                    "contact_info"]
+
+# (analysis key, job ID) of an analysis. The analysis key names the resume analysis: the upload,
+# mode, Claude model and prompt versions, so a new model or prompt never reuses an old analysis.
+# The job ID adds the locations searched.
+def analysis_job_keys(pdf_bytes, locations, consolidated=False):
+    if isinstance(locations, str):
+        locations = [locations]
+    analysis_key = hashlib.sha256(json.dumps([
+        hashlib.sha256(pdf_bytes).hexdigest(), "consolidated" if consolidated else "graph",
+        CLAUDE_MODEL, PROMPT_VERSIONS
+    ], sort_keys=True).encode("utf-8")).hexdigest()
+    job_id = hashlib.sha256(json.dumps([analysis_key, list(locations)]).encode("utf-8")).hexdigest()[:24]
+    return analysis_key, job_id
+
+# Queue an analysis of an uploaded PDF with a job search in locations (see analysis_jobs) and
+# return its job ID. The same upload, locations and mode always get the same ID, so repeated
+# submissions share one job and its stored result, and a saved resume analysis with the same
+# analysis key is reused. force runs a finished job again and analyzes the resume afresh.
+# Raises queue.Full when too many are waiting.
+def submit_analysis(pdf_bytes, locations, consolidated=False, owner=None, force=False):
+    if isinstance(locations, str):
+        locations = [locations]
+    analysis_key, job_id = analysis_job_keys(pdf_bytes, locations, consolidated)
+    payload = {"pdf_bytes": pdf_bytes, "locations": list(locations), "consolidated": consolidated,
+               "analysis_key": analysis_key, "force": force}
+    return get_analysis_jobs().submit(job_id, payload, owner=owner, force=force)
+
+# Run one analysis job: extract, analyze, search, pre-rank and rank, publishing progress and every
+# stage's result through update as it arrives. A resume analysis that completed without errors is
+# saved and reused by later jobs on the same upload and mode, so a new location only searches and
+# ranks again; one that fell back to defaults is redone by the next job.
+# Returns the analysis results plus search_terms, locations, jobs_found, job_listings, more_listings
+# (listings left without a description, see search_jobs), ranked_jobs, notices (conditions the user
+# should know about that are not errors, such as a missing spaCy model) and the errors reported
+# along the way.
+def run_analysis_job(payload, update):
+    trace = tracing.start_trace("analysis")
+    update(trace=trace)
+    try:
+        result, errors = collect_errors(analyze_and_match, payload, update)
+    finally:
+        tracing.finish_trace(trace)
+    result["errors"] = errors
+    return result
+
+def analyze_and_match(payload, update):
+    locations = payload["locations"]
+    previous = None if payload.get("force") else get_analysis_jobs().latest_analysis(payload["analysis_key"])
+    if previous is not None:
+        analysis = {name: previous[name] for name in ANALYSIS_RESULTS}
+        update(progress=0.4, message="Reusing the earlier analysis of this resume", **analysis)
+    else:
+        update(progress=0.02, message="Extracting text from the resume")
+        resume_text = extract_resume_text(payload["pdf_bytes"])
+        if not resume_text:
+            raise ValueError("Could not extract text from the uploaded PDF. Please try another file.")
+        
+        update(progress=0.05, message="Analyzing the resume")
+        streamed, completed = {}, []
+        
+        def on_text(stage_name, chunk):
+            streamed[stage_name] = streamed.get(stage_name, "") + chunk
+            update(**{stage_name: streamed[stage_name]})
+        
+        def on_complete(stage_name, result):
+            completed.append(stage_name)
+            update(progress=0.05 + 0.35 * len(completed) / len(ANALYSIS_RESULTS), **{stage_name: result})
+        
+        analysis, stage_errors = collect_errors(
+            analyze_resume, resume_text, consolidated=payload["consolidated"], on_complete=on_complete, on_text=on_text
+        )
+        errors = analysis_errors.get()
+        if errors is not None:
+            errors.extend(stage_errors)
+        if not stage_errors:
+            get_analysis_jobs().save_analysis(payload["analysis_key"], {name: analysis[name] for name in ANALYSIS_RESULTS})
+        update(progress=0.4, **analysis)
+    
+    search_terms = generate_search_terms(analysis["job_titles"], analysis["resume_attributes"], analysis["domain_info"])
+    update(progress=0.45, message=f"Searching for jobs in {', '.join(locations)}",
+           search_terms=search_terms, locations=locations)
+    found = []
+    
+    def on_job(job):
+        found.append(job)
+        update(message=f"Found {len(found)} job listings, latest: {job['Job Title']} at {job['Company']}",
+               jobs_found=len(found))
+    
+    job_listings, more_listings = search_jobs(analysis, search_terms, locations, on_job=on_job)
+    update(more_listings=more_listings)
+    # The model is loaded (and a missing one logged) once per process, on a worker thread where no
+    # page sees the log, so a missing model is reported with every result instead
+    nlp = load_nlp_model() if job_listings else None
+    notices = [NLP_MODEL_MISSING] if job_listings and nlp is None else []
+    update(notices=notices)
+    job_listings = prerank_jobs(
+        nlp, job_listings,
+        analysis["resume_attributes"], analysis["job_titles"],
+        top_k=PRERANK_TOP_K, min_similarity=PRERANK_MIN_SIMILARITY
+    )
+    update(progress=0.6, message=f"Scoring {len(job_listings)} job listings", job_listings=job_listings)
+    
+    ranked_jobs = rank_jobs(
+        job_listings, analysis["resume_attributes"], analysis["domain_info"], analysis["job_titles"],
+        on_progress=lambda fraction: update(progress=0.6 + 0.4 * fraction),
+        on_scored=lambda scored_jobs: update(ranked_jobs=scored_jobs)
+    )
+    return {**analysis, "search_terms": search_terms, "locations": locations, "jobs_found": len(found),
+            "job_listings": job_listings, "more_listings": more_listings, "ranked_jobs": ranked_jobs,
+            "notices": notices}
+
+# Recruiter mode: match a pool of candidates (resume attributes, as extract_key_resume_attributes
+# returns them, with the domain_info of each in domain_infos if known, as analyze_resume returns it)
+# against a pool of job listings. Every pair is scored locally (see recruiter_match)
+# and only the top_k_per_candidate jobs of each candidate and top_k_per_job candidates of each job
+# are kept. With explain, Claude explains the shortlisted pairs, JOB_SCORING_BATCH_SIZE per request.
+# Returns (by_candidate, by_job), best first; each match is {"candidate" (index), "job", "score",
+# "factors", "match"} and is shared between the two lists.
+@tracing.traced
+def match_candidates(candidates, job_listings, top_k_per_job=RECRUITER_TOP_K, top_k_per_candidate=RECRUITER_TOP_K,
+                     explain=False, initializer=None, domain_infos=None):
+    from recruiter_match import shortlist_matches
+    from skill_match import describe_match, rank_key, score_jobs
+    
+    if not candidates or not job_listings:
+        return [[] for _ in candidates], [[] for _ in job_listings]
+    domain_infos = domain_infos or [{"type": "unknown", "industry": "general"}] * len(candidates)
+    
+    requirements = [requirement or {} for requirement in get_job_requirements(job_listings, initializer=initializer)]
+    with tracing.span("shortlist_matches"):
+        best_jobs, best_candidates = shortlist_matches(
+            candidates, job_listings, requirements, top_k_per_job, top_k_per_candidate, RECRUITER_BLOCK_SIZE,
+            domain_infos
+        )
+    
+    # Every shortlisted pair, scored in detail once per candidate
+    shortlisted = [{job_index for job_index, _ in jobs} for jobs in best_jobs]
+    for job_index, ranked in enumerate(best_candidates):
+        for candidate, _ in ranked:
+            shortlisted[candidate].add(job_index)
+    
+    matches = {}
+    for candidate, job_indices in enumerate(shortlisted):
+        job_indices = sorted(job_indices)
+        details = score_jobs(
+            [job_listings[index] for index in job_indices], [requirements[index] for index in job_indices],
+            candidates[candidate], [], domain_infos[candidate]
+        )
+        for job_index, match in zip(job_indices, details):
+            matches[candidate, job_index] = {
+                "candidate": candidate, "job": job_listings[job_index], "score": match["score"],
+                "factors": describe_match(match, candidates[candidate]), "match": match
+            }
+    
+    if explain:
+        batches = []
+        for candidate, job_indices in enumerate(shortlisted):
+            pairs = sorted((matches[candidate, index] for index in job_indices), key=lambda x: x["score"], reverse=True)
+            batches += [pairs[i:i + JOB_SCORING_BATCH_SIZE] for i in range(0, len(pairs), JOB_SCORING_BATCH_SIZE)]
+        
+        # Bulk requests, so interactive analyses in the same process go first
+        with ThreadPoolExecutor(max_workers=JOB_SCORING_WORKERS, initializer=initializer) as executor:
+            futures = {
+                executor.submit(contextvars.copy_context().run, explain_job_matches, batch,
+                                candidates[batch[0]["candidate"]], domain_infos[batch[0]["candidate"]], [],
+                                PRIORITY_BULK): batch
+                for batch in batches
+            }
+            for future in as_completed(futures):
+                for job_match, factors in zip(futures[future], future.result()):
+                    if factors:
+                        job_match["factors"] = factors
+    
+    # A candidate's jobs without requirements go after the scored ones, as in rank_jobs
+    by_candidate = [sorted((matches[candidate, job_index] for job_index, _ in jobs), key=rank_key)
+                    for candidate, jobs in enumerate(best_jobs)]
+    by_job = [[matches[candidate, job_index] for candidate, _ in ranked] for job_index, ranked in enumerate(best_candidates)]
+    return by_candidate, by_job
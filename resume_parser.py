@@ -0,0 +1,373 @@
+import functools
+import re
+from datetime import date
+
+from prompt_budget import RESUME_HEADING_PATTERN, clean_lines
+from skill_match import SENIORITY_NAMES, seniority_level
+
+# Local, rule-based resume parser: the fast path before the Claude job title and attribute stages.
+# Sections are found by their headings, experience entries by their date ranges (the title is the
+# part of the entry heading that names a role), and skills and expertise areas with a gazetteer
+# matched by spaCy's PhraseMatcher on a blank English tokenizer (no model download; a regex over the
+# same gazetteer when spaCy is not installed). The result has the same job_titles and
+# resume_attributes structures as the Claude stages plus a confidence score (0-1) saying how much
+# of a typical resume was recognised; callers fall back to Claude when it is low.
+
+MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+DATE = rf"(?:{MONTH}\s+)?(?:19|20)\d{{2}}|\d{{1,2}}/(?:19|20)\d{{2}}"
+PRESENT = r"present|current|now|today"
+DATE_RANGE_PATTERN = re.compile(
+    rf"\(?\s*(?P<start>{DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{DATE}|{PRESENT})\s*\)?", re.IGNORECASE
+)
+YEAR_PATTERN = re.compile(r"(19|20)\d{2}")
+MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+
+ROLE_PATTERN = re.compile(
+    r"\b(engineer|developer|programmer|scientist|analyst|manager|director|designer|consultant|architect|"
+    r"administrator|specialist|coordinator|accountant|assistant|officer|intern|nurse|teacher|technician|"
+    r"representative|executive|strategist|researcher|writer|editor|recruiter|planner|auditor|advisor|"
+    r"attorney|lawyer|paralegal|pharmacist|therapist|physician|supervisor|tester|owner|controller|"
+    r"clerk|chef|marketer|associate|lead|head|president|founder|economist|statistician|buyer|agent)s?\b",
+    re.IGNORECASE,
+)
+ENTRY_SEPARATORS = re.compile(r"\s*(?:,|\||·|•|—|–| - | at | @ )\s*")
+BULLET_PATTERN = re.compile(r"^\s*(?:[-*•·▪◦‣]|\d+[.)])\s+")
+ACHIEVEMENT_PATTERN = re.compile(r"\d+\s*%|[$€£]\s*\d|\b\d+(?:\.\d+)?\s*(?:[kmb]|x|hours?|days?|weeks?)\b", re.IGNORECASE)
+DEGREE_PATTERN = re.compile(
+    r"\b(b\.?\s?s\.?c?|m\.?\s?s\.?c?|b\.?\s?a|m\.?\s?a|b\.?\s?eng|m\.?\s?eng|b\.?\s?tech|m\.?\s?tech|ph\.?\s?d|mba|"
+    r"bachelor|master|doctor(ate)?|associate('?s)? degree|diploma)\b",
+    re.IGNORECASE,
+)
+STATED_YEARS_PATTERN = re.compile(r"(\d{1,2})\+?\s*years? of (?:professional )?experience", re.IGNORECASE)
+SKILL_ITEM_SEPARATORS = re.compile(r"\s*[,;|•·]\s*")
+MAX_SKILL_ITEM_WORDS = 4
+
+SKILLS = [
+    # Programming and data
+    "Python", "R", "SQL", "Java", "JavaScript", "TypeScript", "C", "C++", "C#", "Go", "Rust", "Scala", "Kotlin",
+    "Swift", "Ruby", "PHP", "Bash", "MATLAB", "SAS", "Stata", "HTML", "CSS", "React", "Angular", "Vue",
+    "Node.js", "Django", "Flask", "FastAPI", "Spring", ".NET", "GraphQL", "REST APIs",
+    "pandas", "NumPy", "scikit-learn", "PyTorch", "TensorFlow", "Keras", "XGBoost", "spaCy", "Hugging Face",
+    "Spark", "Hadoop", "Kafka", "Airflow", "dbt", "Snowflake", "BigQuery", "Redshift", "Databricks",
+    "PostgreSQL", "MySQL", "MongoDB", "Redis", "Elasticsearch", "Tableau", "Power BI", "Looker", "Excel",
+    "AWS", "Azure", "GCP", "SageMaker", "Docker", "Kubernetes", "Terraform", "Jenkins", "Git", "Linux",
+    "CI/CD", "A/B testing", "statistics", "SQL Server", "Jira", "Figma", "Sketch", "Adobe Photoshop",
+    "Adobe Illustrator",
+    # Business and other professions
+    "Salesforce", "HubSpot", "SAP", "QuickBooks", "Google Analytics", "SEO", "SEM", "Agile", "Scrum",
+    "financial modeling", "budgeting", "forecasting", "GAAP", "auditing", "bookkeeping", "payroll",
+    "customer service", "negotiation", "public speaking", "copywriting", "recruiting", "onboarding",
+    "patient care", "EHR", "lesson planning", "curriculum development", "inventory management",
+    "procurement", "Six Sigma", "Lean", "AutoCAD", "SolidWorks",
+]
+# Skills that are also everyday words: only taken from a skills section, never from running text
+AMBIGUOUS_SKILLS = {"R", "C", "Go", "Rust", "Ruby", "Swift", "Spring", "Sketch", "Excel", "Agile", "Lean", "Git"}
+EXPERTISE_AREAS = [
+    "machine learning", "deep learning", "natural language processing", "computer vision", "data science",
+    "data engineering", "data pipelines", "data visualization", "analytics", "business intelligence",
+    "fraud detection", "risk modeling", "recommendation systems", "forecasting", "experiment design",
+    "experimentation", "MLOps", "cloud infrastructure", "distributed systems", "backend development",
+    "frontend development", "web development", "mobile development", "DevOps", "cybersecurity",
+    "product management", "project management", "program management", "digital marketing",
+    "content marketing", "brand management", "sales", "account management", "business development",
+    "financial reporting", "financial analysis", "accounting", "tax", "supply chain", "operations",
+    "logistics", "human resources", "talent acquisition", "customer success", "UX design", "UI design",
+    "graphic design", "clinical care", "teaching", "research", "quality assurance", "compliance",
+]
+INDUSTRY_KEYWORDS = {
+    "bank": "Financial services", "financial": "Financial services", "capital": "Financial services",
+    "fintech": "Financial services", "payments": "Financial services", "insurance": "Insurance",
+    "retail": "Retail", "e-commerce": "E-commerce", "ecommerce": "E-commerce", "marketplace": "E-commerce",
+    "health": "Healthcare", "hospital": "Healthcare", "clinic": "Healthcare", "pharma": "Pharmaceuticals",
+    "software": "Software", "cloud": "Software", "saas": "Software", "telecom": "Telecommunications",
+    "media": "Media", "games": "Gaming", "gaming": "Gaming", "university": "Education", "school": "Education",
+    "consulting": "Consulting", "logistics": "Logistics", "airline": "Travel", "travel": "Travel",
+    "energy": "Energy", "manufacturing": "Manufacturing", "automotive": "Automotive", "government": "Government",
+}
+RELATED_TITLES = [
+    ("machine learning engineer", ["Data Scientist", "MLOps Engineer", "Applied Scientist"]),
+    ("data scientist", ["Machine Learning Engineer", "Data Analyst", "Applied Scientist"]),
+    ("data engineer", ["Analytics Engineer", "Software Engineer", "Data Platform Engineer"]),
+    ("data analyst", ["Business Analyst", "Analytics Engineer", "Data Scientist"]),
+    ("business analyst", ["Data Analyst", "Product Analyst", "Business Systems Analyst"]),
+    ("financial analyst", ["FP&A Analyst", "Finance Manager", "Investment Analyst"]),
+    ("software engineer", ["Backend Engineer", "Full Stack Developer", "Platform Engineer"]),
+    ("developer", ["Software Engineer", "Full Stack Developer", "Application Developer"]),
+    ("devops engineer", ["Site Reliability Engineer", "Platform Engineer", "Cloud Engineer"]),
+    ("product manager", ["Product Owner", "Program Manager", "Technical Product Manager"]),
+    ("project manager", ["Program Manager", "Operations Manager", "Scrum Master"]),
+    ("designer", ["UX Designer", "Product Designer", "UI Designer"]),
+    ("marketing", ["Marketing Manager", "Growth Marketer", "Content Strategist"]),
+    ("sales", ["Account Executive", "Business Development Manager", "Account Manager"]),
+    ("accountant", ["Staff Accountant", "Financial Analyst", "Auditor"]),
+    ("recruiter", ["Talent Acquisition Specialist", "HR Generalist", "Sourcer"]),
+    ("nurse", ["Registered Nurse", "Clinical Nurse Specialist", "Nurse Manager"]),
+    ("teacher", ["Instructional Designer", "Curriculum Developer", "Tutor"]),
+]
+
+# Share of the confidence score earned by each part of the resume being recognised
+CONFIDENCE_WEIGHTS = {
+    "experience_section": 0.1,
+    "job_titles": 0.15,
+    "all_dates_attributed": 0.15,
+    "current_title": 0.1,
+    "skills": 0.2,
+    "education": 0.1,
+    "years": 0.1,
+    "industries": 0.05,
+    "achievements": 0.05,
+}
+MIN_SKILLS = 5
+
+
+@functools.lru_cache(maxsize=None)
+def phrase_matcher():
+    try:
+        import spacy
+        from spacy.matcher import PhraseMatcher
+    except ImportError:
+        return None
+    nlp = spacy.blank("en")
+    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+    matcher.add("SKILL", [nlp.make_doc(skill) for skill in SKILLS])
+    matcher.add("EXPERTISE", [nlp.make_doc(area) for area in EXPERTISE_AREAS])
+    return nlp, matcher
+
+
+@functools.lru_cache(maxsize=None)
+def gazetteer_pattern(label):
+    names = SKILLS if label == "SKILL" else EXPERTISE_AREAS
+    alternatives = "|".join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+    return re.compile(rf"(?<![\w+#.])(?:{alternatives})(?![\w+#])", re.IGNORECASE)
+
+
+# Gazetteer entries (canonical spelling, first occurrence first) found in text, by label
+def gazetteer_matches(text):
+    canonical = {name.lower(): name for name in SKILLS + EXPERTISE_AREAS}
+    found = {"SKILL": [], "EXPERTISE": []}
+    matcher = phrase_matcher()
+    if matcher is not None:
+        nlp, phrase_matches = matcher
+        doc = nlp.make_doc(text)
+        for match_id, start, end in sorted(phrase_matches(doc), key=lambda match: match[1]):
+            label = nlp.vocab.strings[match_id]
+            name = canonical.get(doc[start:end].text.lower())
+            if name and name not in found[label]:
+                found[label].append(name)
+    else:
+        for label in found:
+            for match in gazetteer_pattern(label).finditer(text):
+                name = canonical[match.group(0).lower()]
+                if name not in found[label]:
+                    found[label].append(name)
+    return found
+
+
+# Split cleaned lines into {section name: [lines]}; lines before the first heading are "header"
+def split_sections(lines):
+    sections = {"header": []}
+    current = "header"
+    for line in lines:
+        match = RESUME_HEADING_PATTERN.match(line) if len(line.split()) <= 5 else None
+        if match:
+            current = match.lastgroup
+            sections.setdefault(current, [])
+        else:
+            sections[current].append(line)
+    return sections
+
+
+# A date from a resume as a fractional year (2019, "Mar 2019", "03/2019"); "Present" is today
+def parse_resume_date(text, today, is_end=False):
+    lowered = text.lower().strip()
+    if re.fullmatch(PRESENT, lowered):
+        return today.year + (today.month - 1) / 12
+    year = int(YEAR_PATTERN.search(lowered).group(0))
+    month = None
+    if "/" in lowered:
+        month = int(lowered.split("/")[0])
+    else:
+        month = next((index + 1 for index, name in enumerate(MONTHS) if lowered.startswith(name)), None)
+    if month is None:
+        month = 12 if is_end else 1
+    return year + (month - 1) / 12
+
+
+def find_title(text):
+    for segment in ENTRY_SEPARATORS.split(text):
+        segment = segment.strip(" ()")
+        if ROLE_PATTERN.search(segment) and len(segment.split()) <= 6:
+            return segment
+    return None
+
+
+def entry_industry(text):
+    lowered = text.lower()
+    return next((industry for keyword, industry in INDUSTRY_KEYWORDS.items()
+                 if re.search(rf"\b{re.escape(keyword)}\b", lowered)), "")
+
+
+# Experience entries: a line with a date range whose text, or one of the two lines above it
+# ("Title" / "Company" / "Jan 2020 - Present"), names a role. Returns (entries, number of date
+# ranges that could not be attributed to a role). Open ranges ("- Present") end at today.
+def parse_experience(lines, today):
+    entries, pending, unattributed = [], [], 0
+    for line in lines:
+        if BULLET_PATTERN.match(line):
+            if entries:
+                entries[-1]["details"].append(BULLET_PATTERN.sub("", line))
+            pending = []
+            continue
+        date_range = DATE_RANGE_PATTERN.search(line)
+        if not date_range:
+            if entries and not entries[-1]["details"] and not pending and not find_title(line):
+                entries[-1]["company_line"] = line
+            else:
+                pending = (pending + [line])[-2:]
+            continue
+
+        heading = (line[:date_range.start()] + " " + line[date_range.end():]).strip(" ,|-–—()")
+        candidates = [heading] + pending[::-1]
+        title = next((found for found in map(find_title, candidates) if found), None)
+        pending = []
+        if title is None:
+            unattributed += 1
+            continue
+
+        start = parse_resume_date(date_range.group("start"), today)
+        end = parse_resume_date(date_range.group("end"), today, is_end=True)
+        entries.append({
+            "title": title,
+            # Everything around the title (company, location) for industry detection
+            "company_line": " ".join(candidate for candidate in candidates if candidate).replace(title, " "),
+            "start": start,
+            "end": max(start, end),
+            "current": bool(re.fullmatch(PRESENT, date_range.group("end").strip(), re.IGNORECASE)),
+            "details": [],
+        })
+    return entries, unattributed
+
+
+# Total years covered by the entries, counting overlapping jobs once
+def years_of_experience(entries):
+    total, covered_until = 0.0, None
+    for start, end in sorted((entry["start"], entry["end"]) for entry in entries):
+        if covered_until is not None and start < covered_until:
+            start = covered_until
+        if end > start:
+            total += end - start
+        covered_until = end if covered_until is None else max(covered_until, end)
+    return total
+
+
+# Items listed in a skills section ("Languages: Python, SQL" lists Python and SQL)
+def skill_items(lines):
+    items, seen = [], set()
+    for line in lines:
+        label, _, listed = line.partition(":")
+        if listed and len(label.split()) <= 3:
+            line = listed
+        for item in SKILL_ITEM_SEPARATORS.split(BULLET_PATTERN.sub("", line)):
+            item = item.strip(" .")
+            if item and len(item.split()) <= MAX_SKILL_ITEM_WORDS and item.lower() not in seen:
+                items.append(item)
+                seen.add(item.lower())
+    return items
+
+
+def related_titles(titles):
+    known = {title.lower() for title in titles}
+    for title in titles:
+        for key, related in RELATED_TITLES:
+            if key in title.lower():
+                return [related_title for related_title in related if related_title.lower() not in known]
+    return []
+
+
+# Parse resume text into {"job_titles", "resume_attributes", "confidence", "found"}, with
+# "found" saying which parts were recognised. Years of experience count open ranges up to today
+# (date.today() unless given).
+def parse_resume(resume_text, today=None):
+    return parse_resume_as_of(resume_text, today or date.today())
+
+
+# parse_resume for a given date; results are cached per (text, date), so they never outlive the day
+@functools.lru_cache(maxsize=64)
+def parse_resume_as_of(resume_text, today):
+    lines = clean_lines(resume_text)
+    sections = split_sections(lines)
+    experience_lines = sections.get("experience") or lines
+    entries, unattributed = parse_experience(experience_lines, today)
+
+    job_titles = []
+    for entry in entries:
+        level = seniority_level(entry["title"])
+        industry_text = " ".join([entry["company_line"]] + entry["details"])
+        job_titles.append({
+            "title": entry["title"],
+            "current": entry["current"],
+            "industry": entry_industry(industry_text).lower(),
+            "level": SENIORITY_NAMES[level] if level is not None else "unknown",
+        })
+
+    gazetteer = gazetteer_matches("\n".join(lines))
+    skills = skill_items(sections.get("skills", []))
+    listed = {skill.lower() for skill in skills}
+    skills += [skill for skill in gazetteer["SKILL"] if skill.lower() not in listed and skill not in AMBIGUOUS_SKILLS]
+
+    years = years_of_experience(entries)
+    if not years:
+        stated = STATED_YEARS_PATTERN.search(resume_text)
+        years = float(stated.group(1)) if stated else 0.0
+
+    current = [entry for entry in entries if entry["current"]] or entries[:1]
+    level = seniority_level(current[0]["title"]) if current else None
+    if level is None and years:
+        level = 0 if years < 2 else 1 if years < 5 else 2
+
+    # Degree abbreviations are too ambiguous ("MA", "MS") to look for outside an education section
+    education_lines = sections.get("education", [])
+    education = [
+        re.sub(r"[\s,(—–-]*\b(19|20)\d{2}\b\)?\s*$", "", line)
+        for line in education_lines if DEGREE_PATTERN.search(line) and not BULLET_PATTERN.match(line)
+    ]
+
+    achievements = [
+        detail for entry in entries for detail in entry["details"] if ACHIEVEMENT_PATTERN.search(detail)
+    ][:3]
+    industries = []
+    for job in job_titles:
+        industry = job["industry"].capitalize()
+        if industry and industry not in industries:
+            industries.append(industry)
+
+    titles = [entry["title"] for entry in entries]
+    resume_attributes = {
+        "Professional Skills": skills[:15],
+        "Experience Level": [SENIORITY_NAMES[level]] if level is not None else [],
+        "Core Expertise Areas": gazetteer["EXPERTISE"][:6],
+        "Industries": industries,
+        "Education Background": education[:3],
+        "Key Achievements": achievements,
+        "Years of Experience": [f"{round(years)} years"] if years else [],
+        "Related Job Titles": related_titles(titles),
+    }
+
+    found = {
+        "experience_section": "experience" in sections,
+        "job_titles": bool(job_titles),
+        "all_dates_attributed": bool(job_titles) and not unattributed,
+        "current_title": any(job["current"] for job in job_titles),
+        "skills": len(skills) >= MIN_SKILLS,
+        "education": bool(education),
+        "years": bool(years),
+        "industries": bool(industries),
+        "achievements": bool(achievements),
+    }
+    confidence = sum(weight for part, weight in CONFIDENCE_WEIGHTS.items() if found[part])
+    return {
+        "job_titles": job_titles,
+        "resume_attributes": resume_attributes,
+        "confidence": round(confidence, 3),
+        "found": found,
+    }
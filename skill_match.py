@@ -0,0 +1,276 @@
+import re
+
+import numpy as np
+
+# Deterministic job scoring against structured job requirements.
+# Each job's requirements (required and preferred skills, seniority, industry, minimum years) are
+# matched against the candidate's extracted resume attributes. Skills, title words and industry
+# words are compared as sparse vectors: every job is a row of (term, weight) entries in one CSR
+# layout, the candidate is a dense 0/1 vector over the same vocabulary, and the weighted overlap
+# of every job is a single gather plus bincount. Seniority and years are compared as arrays.
+# Components without information on either side score a neutral 0.5. A job without any
+# requirements (no description, or the extraction came back empty) is marked unscored, as its
+# score then rests on its title alone and would otherwise compete with real matches.
+
+SCORE_WEIGHTS = {"skills": 0.45, "title": 0.2, "seniority": 0.15, "industry": 0.1, "years": 0.1}
+# Search cards carry no requirements, only a title, company and location
+CARD_SCORE_WEIGHTS = {"title": 0.6, "seniority": 0.2, "industry": 0.1, "location": 0.1}
+PREFERRED_SKILL_WEIGHT = 0.5
+NEUTRAL = 0.5
+REQUIREMENT_KEYS = ("required_skills", "preferred_skills", "seniority", "industry", "min_years")
+
+SENIORITY_WORDS = {
+    "intern": 0, "junior": 0, "entry": 0, "graduate": 0, "associate": 0,
+    "mid": 1, "intermediate": 1,
+    "senior": 2, "sr": 2, "lead": 2, "staff": 2,
+    "principal": 3, "director": 3, "head": 3, "executive": 3, "vp": 3, "chief": 3,
+}
+SENIORITY_NAMES = ["Junior", "Mid", "Senior", "Executive"]
+MAX_SENIORITY_GAP = len(SENIORITY_NAMES) - 1
+
+IGNORED_WORDS = frozenset(
+    "a an and or of in on for with the to experience knowledge skills skill strong proficiency working "
+    "familiarity using tools tool".split()
+)
+YEARS_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)", re.IGNORECASE)
+
+
+def normalize_term(text):
+    return " ".join(re.sub(r"[^a-z0-9+#]+", " ", str(text).lower()).split())
+
+
+def term_words(term):
+    return frozenset(word for word in normalize_term(term).split() if word not in IGNORED_WORDS)
+
+
+# Seniority level (0-3) named in free text, e.g. a job title or "Senior", or None
+def seniority_level(text):
+    levels = [SENIORITY_WORDS[word] for word in normalize_term(text).split() if word in SENIORITY_WORDS]
+    return max(levels) if levels else None
+
+
+def parse_years(value):
+    match = YEARS_PATTERN.search(str(value))
+    if match:
+        return float(match.group(1))
+    match = re.search(r"\d+(?:\.\d+)?", str(value))
+    return float(match.group(0)) if match else None
+
+
+# Whether extraction found anything to score a job on
+def has_requirements(requirement):
+    return any(requirement.get(key) not in (None, "", []) for key in REQUIREMENT_KEYS)
+
+
+# Seniority of a job: as extracted, otherwise as named in its title
+def job_level(job, requirement):
+    level = seniority_level(requirement.get("seniority") or "")
+    return level if level is not None else seniority_level(job["Job Title"])
+
+
+# The candidate side of matching, built once per resume
+class CandidateProfile:
+    def __init__(self, resume_attributes, job_titles, domain_info):
+        skill_terms = resume_attributes.get("Professional Skills", []) + resume_attributes.get("Core Expertise Areas", [])
+        self.skills = [term_words(term) for term in skill_terms if term_words(term)]
+
+        titles = [job.get("title", "") for job in job_titles] + resume_attributes.get("Related Job Titles", [])
+        self.title_words = frozenset().union(*(term_words(title) for title in titles)) - set(SENIORITY_WORDS)
+
+        industries = resume_attributes.get("Industries", []) + [job.get("industry", "") for job in job_titles]
+        if domain_info.get("industry") not in (None, "", "general"):
+            industries.append(domain_info["industry"])
+        self.industry_words = frozenset().union(*(term_words(industry) for industry in industries))
+
+        current = [job for job in job_titles if job.get("current")] or job_titles[:1]
+        levels = [seniority_level(job.get("level", "")) for job in current]
+        levels += [seniority_level(level) for level in resume_attributes.get("Experience Level", [])]
+        levels = [level for level in levels if level is not None]
+        self.level = max(levels) if levels else None
+
+        years = [parse_years(value) for value in resume_attributes.get("Years of Experience", [])]
+        years = [value for value in years if value is not None]
+        self.years = max(years) if years else None
+
+    # A job skill matches when its words are all in one of the candidate's skills ("python" in
+    # "Python programming"), or one of the candidate's skills is all in it ("spark" in "apache spark")
+    def has_skill(self, words):
+        return any(words <= skill or skill <= words for skill in self.skills)
+
+
+# Weighted fraction of each job's terms the candidate has, plus which terms matched.
+# job_terms: one list of (term words, weight) per job; has_term(words) -> bool.
+def overlap_scores(job_terms, has_term):
+    vocabulary = {}
+    indices, weights, indptr = [], [], [0]
+    for terms in job_terms:
+        for words, weight in terms:
+            indices.append(vocabulary.setdefault(words, len(vocabulary)))
+            weights.append(weight)
+        indptr.append(len(indices))
+
+    candidate = np.fromiter((has_term(words) for words in vocabulary), dtype=np.float64, count=len(vocabulary))
+    indices = np.asarray(indices, dtype=np.int64)
+    weights = np.asarray(weights, dtype=np.float64)
+    rows = np.repeat(np.arange(len(job_terms)), np.diff(indptr))
+    hits = candidate[indices] > 0 if len(indices) else np.zeros(0, dtype=bool)
+
+    total = np.bincount(rows, weights=weights, minlength=len(job_terms))
+    matched = np.bincount(rows, weights=weights * hits, minlength=len(job_terms))
+    scores = np.full(len(job_terms), NEUTRAL)
+    np.divide(matched, total, out=scores, where=total > 0)
+    return scores, [hits[start:end] for start, end in zip(indptr, indptr[1:])]
+
+
+# Score every job (0-100) from its requirements. Returns one dict per job with the score, the
+# score of every component, the matched and missing skills (as written in the requirements) and
+# whether the job had any requirements to score ("scored"; see rank_key).
+def score_jobs(job_listings, requirements, resume_attributes, job_titles, domain_info):
+    profile = CandidateProfile(resume_attributes, job_titles, domain_info)
+    job_count = len(job_listings)
+
+    skill_names, skill_terms = [], []
+    for requirement in requirements:
+        names, terms = [], []
+        for key, weight in (("required_skills", 1.0), ("preferred_skills", PREFERRED_SKILL_WEIGHT)):
+            for skill in requirement.get(key) or []:
+                words = term_words(skill)
+                if words and words not in (term for term, _ in terms):
+                    names.append(skill)
+                    terms.append((words, weight))
+        skill_names.append(names)
+        skill_terms.append(terms)
+    skills, skill_hits = overlap_scores(skill_terms, profile.has_skill)
+
+    title_terms = [
+        [(frozenset([word]), 1.0) for word in term_words(job["Job Title"]) - set(SENIORITY_WORDS)]
+        for job in job_listings
+    ]
+    title, _ = overlap_scores(title_terms, lambda words: words <= profile.title_words)
+
+    industry_terms = [
+        [(frozenset([word]), 1.0) for word in term_words(requirement.get("industry") or "")]
+        for requirement in requirements
+    ]
+    industry, _ = overlap_scores(industry_terms, lambda words: words <= profile.industry_words)
+
+    job_levels = np.array([
+        np.nan if (level := job_level(job, requirement)) is None else level
+        for job, requirement in zip(job_listings, requirements)
+    ], dtype=np.float64)
+    seniority = np.full(job_count, NEUTRAL)
+    if profile.level is not None:
+        known = ~np.isnan(job_levels)
+        seniority[known] = 1 - np.abs(job_levels[known] - profile.level) / MAX_SENIORITY_GAP
+
+    min_years = np.array([
+        parse_years(requirement["min_years"]) if requirement.get("min_years") is not None else np.nan
+        for requirement in requirements
+    ], dtype=np.float64)
+    years = np.full(job_count, NEUTRAL)
+    if profile.years is not None:
+        known = ~np.isnan(min_years)
+        years[known] = np.clip(profile.years / np.maximum(min_years[known], 1), 0, 1)
+
+    components = {"skills": skills, "title": title, "seniority": seniority, "industry": industry, "years": years}
+    total = sum(SCORE_WEIGHTS[name] * values for name, values in components.items())
+    scores = np.rint(100 * total).astype(int)
+
+    results = []
+    for index in range(job_count):
+        hits = skill_hits[index]
+        results.append({
+            "score": int(scores[index]),
+            "components": {name: round(float(values[index]), 3) for name, values in components.items()},
+            "matched_skills": [name for name, hit in zip(skill_names[index], hits) if hit],
+            "missing_skills": [name for name, hit in zip(skill_names[index], hits) if not hit],
+            "seniority": None if np.isnan(job_levels[index]) else SENIORITY_NAMES[int(job_levels[index])],
+            "min_years": None if np.isnan(min_years[index]) else float(min_years[index]),
+            "scored": has_requirements(requirements[index]),
+        })
+    return results
+
+
+# Sort key ranking scored matches ({"score", "match"}) best first, then unscored ones by score
+def rank_key(job_match):
+    return not job_match["match"]["scored"], -job_match["score"]
+
+
+# 1.0 for a card in one of the searched locations (location_words: the words of each) or a remote one;
+# a broad card location ("United States", no city) or a searched "Remote" is no evidence either way
+# (remote cards often only name a country), and anything else is elsewhere (0.0)
+def location_score(card_location, location_words):
+    if not location_words:
+        return NEUTRAL
+    words = term_words(card_location)
+    if "remote" in words or any(searched <= words for searched in location_words):
+        return 1.0
+    if "," not in card_location or any("remote" in searched for searched in location_words):
+        return NEUTRAL
+    return 0.0
+
+
+# Score search cards (0-100) before their descriptions are fetched, from what the search page shows.
+# title: best word overlap (Jaccard, seniority words aside) with one of the candidate's job titles
+# or related titles; seniority: the level named in the title against the candidate's; industry:
+# whether the title or company names one of the candidate's industries; location: see
+# location_score. Returns one {"score", "components"} dict per card.
+def score_cards(cards, resume_attributes, job_titles, domain_info, locations=()):
+    profile = CandidateProfile(resume_attributes, job_titles, domain_info)
+    titles = [job.get("title", "") for job in job_titles] + resume_attributes.get("Related Job Titles", [])
+    targets = [words for words in (term_words(title) - set(SENIORITY_WORDS) for title in titles) if words]
+    location_words = [term_words(location) for location in locations]
+    location_words = [words for words in location_words if words]
+
+    results = []
+    for card in cards:
+        words = term_words(card["Job Title"]) - set(SENIORITY_WORDS)
+        title = max((len(words & target) / len(words | target) for target in targets), default=NEUTRAL) if words else 0.0
+
+        level = seniority_level(card["Job Title"])
+        if level is None or profile.level is None:
+            seniority = NEUTRAL
+        else:
+            seniority = 1 - abs(level - profile.level) / MAX_SENIORITY_GAP
+
+        # A company name rarely names its industry, so no overlap is no evidence against the job
+        industry = 1.0 if (words | term_words(card["Company"])) & profile.industry_words else NEUTRAL
+
+        location = location_score(card["Location"], location_words)
+
+        components = {"title": title, "seniority": seniority, "industry": industry, "location": location}
+        results.append({
+            "score": int(round(100 * sum(CARD_SCORE_WEIGHTS[name] * value for name, value in components.items()))),
+            "components": {name: round(value, 3) for name, value in components.items()},
+        })
+    return results
+
+
+# Three plain factors explaining a score, used where Claude did not write an explanation
+def describe_match(match, resume_attributes):
+    matched, missing = match["matched_skills"], match["missing_skills"]
+    factors = []
+    if matched or missing:
+        factors.append(f"Matches {len(matched)} of {len(matched) + len(missing)} listed skills"
+                       + (f": {', '.join(matched[:5])}" if matched else ""))
+        factors.append(f"Missing: {', '.join(missing[:5])}" if missing else "Covers every listed skill")
+    elif not match["scored"]:
+        factors.append("No requirements could be read from the posting, so it is ranked after scored jobs")
+        factors.append(f"Title match with the candidate's job history: {match['components']['title']:.0%}")
+    else:
+        factors.append("The posting lists no specific skills")
+        factors.append(f"Title match with the candidate's job history: {match['components']['title']:.0%}")
+
+    if match["seniority"] and match["min_years"] is not None:
+        role = f"{match['seniority']} role asking for {match['min_years']:g}+ years"
+    elif match["seniority"]:
+        role = f"{match['seniority']} role"
+    elif match["min_years"] is not None:
+        role = f"Asks for {match['min_years']:g}+ years"
+    else:
+        factors.append(f"Industry alignment: {match['components']['industry']:.0%}")
+        return factors
+
+    candidate_years = ", ".join(resume_attributes.get("Years of Experience", []))
+    factors.append(f"{role}; candidate has {candidate_years}" if candidate_years else role)
+    return factors
@@ -0,0 +1,75 @@
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+# Small dependency-aware executor for the analysis pipeline.
+# Each stage is a callable that receives the results of the stages it depends on
+# (in declared order) and is submitted to a thread pool as soon as they are all done,
+# so total wall-clock time follows the critical path instead of the sum of all stages.
+# Stages run in a copy of the caller's context, so context variables follow them into the pool.
+class StageGraph:
+    def __init__(self):
+        self.stages = {}
+
+    def add(self, name, func, depends_on=()):
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' is already defined")
+        self.stages[name] = (func, tuple(depends_on))
+        return self
+
+    def _check(self):
+        for name, (_, deps) in self.stages.items():
+            for dep in deps:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+
+        # Detect cycles with a depth-first walk
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle detected at stage '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name][1]:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    # Execute every stage and return {stage name: result}.
+    # on_complete(name, result) is called from the calling thread as each stage finishes;
+    # initializer runs once in every worker thread (e.g. to attach a Streamlit script context).
+    def run(self, max_workers=4, on_complete=None, initializer=None):
+        self._check()
+        results = {}
+        pending = dict(self.stages)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers, initializer=initializer) as executor:
+            while pending or running:
+                ready = [
+                    name for name, (_, deps) in pending.items()
+                    if all(dep in results for dep in deps)
+                ]
+                for name in ready:
+                    func, deps = pending.pop(name)
+                    args = [results[dep] for dep in deps]
+                    running[executor.submit(contextvars.copy_context().run, func, *args)] = name
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception:
+                        for other in running:
+                            other.cancel()
+                        raise
+                    if on_complete:
+                        on_complete(name, results[name])
+
+        return results
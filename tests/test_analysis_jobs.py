@@ -0,0 +1,143 @@
+import queue
+import threading
+import time
+
+import pytest
+
+from analysis_jobs import DONE, FAILED, AnalysisJobs
+
+
+class Runner:
+    def __init__(self):
+        self.runs = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, payload, update):
+        self.runs.append(payload)
+        update(progress=0.5, message="halfway", partial=payload)
+        self.release.wait(5)
+        if payload == "raise":
+            raise ValueError("broken upload")
+        if payload == "degraded":
+            return {"payload": payload, "errors": ["Error extracting job titles"]}
+        return {"payload": payload, "errors": []}
+
+
+def wait(jobs, job_id):
+    deadline = time.time() + 5
+    while jobs.status(job_id)["status"] not in (DONE, FAILED):
+        assert time.time() < deadline
+        time.sleep(0.01)
+    return jobs.status(job_id)
+
+
+@pytest.fixture
+def runner():
+    return Runner()
+
+
+def make_jobs(runner, tmp_path, **kwargs):
+    return AnalysisJobs(runner, str(tmp_path / "jobs.sqlite3"), **kwargs)
+
+
+def test_done_result_is_stored_and_not_run_again(runner, tmp_path):
+    jobs = make_jobs(runner, tmp_path)
+    jobs.submit("job", "ok")
+    assert wait(jobs, "job")["result"] == {"payload": "ok", "errors": []}
+    jobs.submit("job", "ok")
+    assert runner.runs == ["ok"]
+
+    # A later process finds the result without running the job
+    restarted = make_jobs(runner, tmp_path)
+    assert restarted.status("job")["result"]["payload"] == "ok"
+    restarted.submit("job", "ok")
+    assert runner.runs == ["ok"]
+
+
+def test_force_runs_a_finished_job_again(runner, tmp_path):
+    jobs = make_jobs(runner, tmp_path)
+    jobs.submit("job", "ok")
+    wait(jobs, "job")
+    jobs.submit("job", "ok", force=True)
+    wait(jobs, "job")
+    assert runner.runs == ["ok", "ok"]
+
+
+def test_degraded_result_is_shown_but_not_stored_or_reused(runner, tmp_path):
+    jobs = make_jobs(runner, tmp_path)
+    jobs.submit("job", "degraded")
+    assert wait(jobs, "job")["result"]["errors"] == ["Error extracting job titles"]
+    assert make_jobs(runner, tmp_path).status("job") is None
+
+    jobs.submit("job", "degraded")
+    wait(jobs, "job")
+    assert runner.runs == ["degraded", "degraded"]
+
+
+def test_failed_job_is_retried_on_submit(runner, tmp_path):
+    jobs = make_jobs(runner, tmp_path)
+    jobs.submit("job", "raise")
+    job = wait(jobs, "job")
+    assert job["status"] == FAILED and job["error"] == "broken upload"
+    assert runner.runs == ["raise"]  # status alone does not run it again
+
+    jobs.submit("job", "raise")
+    wait(jobs, "job")
+    assert runner.runs == ["raise", "raise"]
+
+
+def test_expired_results_are_not_served(runner, tmp_path):
+    jobs = make_jobs(runner, tmp_path, keep_seconds=-1)
+    jobs.submit("job", "ok")
+    wait(jobs, "job")
+    assert make_jobs(runner, tmp_path, keep_seconds=-1).status("job") is None
+    jobs.submit("job", "ok")
+    wait(jobs, "job")
+    assert runner.runs == ["ok", "ok"]
+
+
+def test_running_job_is_joined_and_publishes_partial_results(runner, tmp_path):
+    runner.release.clear()
+    jobs = make_jobs(runner, tmp_path)
+    jobs.submit("job", "ok")
+    deadline = time.time() + 5
+    while jobs.status("job")["result"].get("partial") != "ok":
+        assert time.time() < deadline
+        time.sleep(0.01)
+    jobs.submit("job", "ok")
+    assert jobs.stats()["coalesced"] == 1
+
+    runner.release.set()
+    wait(jobs, "job")
+    assert runner.runs == ["ok"]
+
+
+def test_queue_is_bounded_and_shared_round_robin(runner, tmp_path):
+    runner.release.clear()
+    jobs = make_jobs(runner, tmp_path, max_workers=1, max_queued=3)
+    jobs.submit("blocker", "blocker", owner="a")
+    deadline = time.time() + 5
+    while jobs.status("blocker")["status"] != "running":
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+    jobs.submit("a1", "a1", owner="a")
+    jobs.submit("a2", "a2", owner="a")
+    jobs.submit("b1", "b1", owner="b")
+    with pytest.raises(queue.Full):
+        jobs.submit("b2", "b2", owner="b")
+    assert [jobs.status(job_id)["position"] for job_id in ("a1", "b1", "a2")] == [0, 1, 2]
+
+    runner.release.set()
+    for job_id in ("a1", "a2", "b1"):
+        wait(jobs, job_id)
+    assert runner.runs == ["blocker", "a1", "b1", "a2"]
+
+
+def test_saved_analyses_expire(runner, tmp_path):
+    jobs = make_jobs(runner, tmp_path)
+    jobs.save_analysis("resume", {"domain_info": {"type": "technical"}})
+    assert jobs.latest_analysis("resume") == {"domain_info": {"type": "technical"}}
+    assert jobs.latest_analysis("other") is None
+    assert make_jobs(runner, tmp_path, analysis_keep_seconds=-1).latest_analysis("resume") is None
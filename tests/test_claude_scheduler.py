@@ -0,0 +1,175 @@
+import threading
+import time
+
+import pytest
+
+from claude_scheduler import PRIORITY_BULK, PRIORITY_INTERACTIVE, ClaudeScheduler
+from rate_limit import TokenBucket
+
+
+class Response:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+# Shaped like the anthropic SDK's APIStatusError
+class APIStatusError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = Response({"retry-after": str(retry_after)} if retry_after is not None else {})
+
+
+class APIConnectionError(Exception):
+    pass
+
+
+# A client whose requests raise the scripted errors in order, then succeed
+class ScriptedClient:
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def send(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def make_scheduler(**kwargs):
+    settings = {"requests_per_minute": 6000, "tokens_per_minute": 10 ** 7, "base_delay": 0.01, "max_delay": 0.05}
+    settings.update(kwargs)
+    return ClaudeScheduler(**settings)
+
+
+@pytest.mark.parametrize("status", [429, 529, 500, 503])
+def test_retryable_statuses_are_retried(status):
+    scheduler = make_scheduler()
+    client = ScriptedClient(APIStatusError(status), APIStatusError(status))
+    assert scheduler.call(client.send) == "ok"
+    assert client.calls == 3
+    assert scheduler.stats()["retries"] == 2
+
+
+def test_connection_errors_are_retried():
+    scheduler = make_scheduler()
+    client = ScriptedClient(APIConnectionError())
+    assert scheduler.call(client.send) == "ok"
+    assert client.calls == 2
+
+
+def test_other_errors_are_raised_at_once():
+    scheduler = make_scheduler()
+    client = ScriptedClient(APIStatusError(400))
+    with pytest.raises(APIStatusError):
+        scheduler.call(client.send)
+    assert client.calls == 1
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def test_retries_stop_after_max_retries():
+    scheduler = make_scheduler(max_retries=2)
+    client = ScriptedClient(*[APIStatusError(503) for _ in range(5)])
+    with pytest.raises(APIStatusError):
+        scheduler.call(client.send)
+    assert client.calls == 3
+
+
+def test_no_retry_once_can_retry_says_no():
+    scheduler = make_scheduler()
+    client = ScriptedClient(APIStatusError(529))
+    with pytest.raises(APIStatusError):
+        scheduler.call(client.send, can_retry=lambda: False)
+    assert client.calls == 1
+
+
+def test_backoff_is_jittered_and_honours_retry_after(monkeypatch):
+    scheduler = ClaudeScheduler(base_delay=1.0, max_delay=30.0)
+    monkeypatch.setattr("claude_scheduler.random.uniform", lambda low, high: high)
+    assert scheduler.backoff_seconds(0, APIStatusError(503)) == 1.0
+    assert scheduler.backoff_seconds(3, APIStatusError(503)) == 8.0
+    assert scheduler.backoff_seconds(10, APIStatusError(503)) == 30.0
+    # Retry-After plus half the jitter, capped at max_delay
+    assert scheduler.backoff_seconds(0, APIStatusError(429, retry_after=5)) == 5.5
+    assert scheduler.backoff_seconds(0, APIStatusError(429, retry_after=120)) == 30.0
+
+    monkeypatch.setattr("claude_scheduler.random.uniform", lambda low, high: low)
+    assert scheduler.backoff_seconds(3, APIStatusError(503)) == 0.0
+
+
+def test_throttling_halves_concurrency_and_successes_grow_it_back():
+    scheduler = make_scheduler(max_concurrency=8)
+    scheduler.call(ScriptedClient(APIStatusError(429)).send)
+    assert scheduler.stats()["concurrency_limit"] == 4
+    assert scheduler.stats()["throttled"] == 1
+
+    # Server errors are retried without touching the limit
+    scheduler.call(ScriptedClient(APIStatusError(503)).send)
+    assert scheduler.stats()["concurrency_limit"] == 4
+
+    for _ in range(4):
+        scheduler.call(ScriptedClient().send)
+    assert scheduler.stats()["concurrency_limit"] == 5
+
+
+def test_throttling_pauses_other_requests():
+    scheduler = make_scheduler(max_delay=1.0)
+    failed = threading.Event()
+
+    def throttled():
+        if not failed.is_set():
+            failed.set()
+            raise APIStatusError(429, retry_after=0.3)
+        return "ok"
+
+    thread = threading.Thread(target=scheduler.call, args=(throttled,))
+    thread.start()
+    failed.wait(5)
+    started = time.monotonic()
+    assert scheduler.call(lambda: time.monotonic()) - started >= 0.25
+    thread.join(5)
+
+
+def test_interactive_requests_go_ahead_of_bulk_ones():
+    scheduler = make_scheduler(max_concurrency=1)
+    release, order = threading.Event(), []
+
+    def blocking():
+        release.wait(5)
+
+    blocker = threading.Thread(target=scheduler.call, args=(blocking,))
+    blocker.start()
+    threads = []
+    for name, priority in (("bulk-1", PRIORITY_BULK), ("bulk-2", PRIORITY_BULK), ("interactive", PRIORITY_INTERACTIVE)):
+        threads.append(threading.Thread(target=scheduler.call, args=(lambda name=name: order.append(name),),
+                                        kwargs={"priority": priority}))
+        threads[-1].start()
+        deadline = time.time() + 5
+        while scheduler.stats()["waiting"] < len(threads):
+            assert time.time() < deadline
+            time.sleep(0.01)
+
+    release.set()
+    for thread in [blocker] + threads:
+        thread.join(5)
+    assert order == ["interactive", "bulk-1", "bulk-2"]
+
+
+def test_requests_and_tokens_are_taken_from_the_buckets():
+    scheduler = ClaudeScheduler(requests_per_minute=60, tokens_per_minute=6000)
+    assert scheduler.request_bucket.capacity == 10
+    scheduler.call(ScriptedClient().send, tokens=1500)
+    assert scheduler.request_bucket.tokens == pytest.approx(9, abs=0.1)
+    assert scheduler.token_bucket.tokens == pytest.approx(4500, abs=5)
+
+
+def test_token_bucket_refills_at_its_rate():
+    bucket = TokenBucket(rate=100.0, capacity=10)
+    assert bucket.try_acquire(10)
+    assert not bucket.try_acquire(5)
+    started = time.monotonic()
+    bucket.acquire(5)
+    assert time.monotonic() - started >= 0.04
+    # Requests larger than the bucket wait for a full bucket instead of forever
+    bucket.acquire(50)
@@ -0,0 +1,52 @@
+from job_dedup import CardDeduplicator, NearDuplicateIndex, card_keys, remove_near_duplicates
+
+DESCRIPTION = (
+    "We are hiring a data engineer to build and operate batch and streaming pipelines on Spark and "
+    "Airflow, model warehouse tables in dbt, and work with analysts on reporting for our logistics "
+    "platform. You have several years of Python and SQL experience and care about data quality."
+)
+
+
+def card(title="Data Engineer", company="Acme", location="Boston, MA", link="https://www.linkedin.com/jobs/view/1234567"):
+    return {"Job Title": title, "Company": company, "Location": location, "Job Link": link}
+
+
+def test_card_keys_normalize_title_company_and_location():
+    assert card_keys(card(title="Data  Engineer", company="ACME Inc.", location="boston, ma"))[0] == card_keys(card())[0]
+
+
+def test_tracking_variants_of_a_job_url_are_duplicates():
+    deduplicator = CardDeduplicator()
+    assert deduplicator.add(card())
+    assert not deduplicator.add(card(title="Other", link="https://www.linkedin.com/jobs/view/data-engineer-1234567?refId=x"))
+
+
+def test_reposts_under_a_new_id_are_duplicates():
+    deduplicator = CardDeduplicator()
+    assert deduplicator.add(card())
+    assert not deduplicator.add(card(company="Acme Corp", link="https://www.linkedin.com/jobs/view/7654321"))
+
+
+def test_same_role_in_another_location_is_kept():
+    deduplicator = CardDeduplicator()
+    assert deduplicator.add(card())
+    assert deduplicator.add(card(location="Austin, TX", link="https://www.linkedin.com/jobs/view/7654321"))
+    # ... but the same posting found through another location's search is not
+    assert not deduplicator.add(card(location="Austin, TX", link="https://www.linkedin.com/jobs/view/1234567"))
+
+
+def test_near_duplicate_descriptions_are_found():
+    index = NearDuplicateIndex()
+    assert index.add("a", DESCRIPTION) is None
+    assert index.add("b", DESCRIPTION + " Apply today.") == "a"
+    assert index.add("c", "A registered nurse for our pediatric ward, working night shifts with a small team.") is None
+
+
+def test_remove_near_duplicates_keeps_first_and_jobs_without_descriptions():
+    jobs = [
+        {"Description": DESCRIPTION, "id": 1},
+        {"Description": "Description not available", "id": 2},
+        {"Description": DESCRIPTION + " Apply today.", "id": 3},
+        {"Description": "Description not available", "id": 4},
+    ]
+    assert [job["id"] for job in remove_near_duplicates(jobs)] == [1, 2, 4]
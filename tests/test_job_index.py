@@ -0,0 +1,128 @@
+import os
+import time
+
+import pytest
+
+from job_index import JobIndex
+from job_store import JobStore, posting_key
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.db"))
+
+
+def put(store, slug, title, description, location="Seattle, WA", company="Acme"):
+    url = f"https://www.linkedin.com/jobs/view/{slug}"
+    store.put(url, description, title=title, company=company, location=location)
+    return posting_key(url)
+
+
+def titles(results):
+    return [document["title"] for document, _ in results]
+
+
+def test_sync_indexes_new_postings_only_once(store, tmp_path):
+    put(store, "1", "Python Developer", "Build APIs in Python and Django")
+    put(store, "2", "Java Engineer", "Spring services in Java")
+    index = JobIndex(str(tmp_path / "index"))
+
+    assert index.sync(store) == 2
+    assert titles(index.search("python")) == ["Python Developer"]
+    assert titles(index.search("java spring")) == ["Java Engineer"]
+
+    put(store, "3", "Data Engineer", "Python pipelines on Spark")
+    index.sync(store)
+    assert set(titles(index.search("python"))) == {"Python Developer", "Data Engineer"}
+    assert len(index) == 3
+
+
+def test_newer_version_of_a_posting_replaces_the_old_one(store, tmp_path):
+    put(store, "1", "Python Developer", "Build APIs in Python")
+    index = JobIndex(str(tmp_path / "index"))
+    index.sync(store)
+
+    time.sleep(0.01)
+    put(store, "1", "Rust Developer", "Systems work in Rust")
+    index.sync(store)
+
+    assert index.search("python") == []
+    assert titles(index.search("rust")) == ["Rust Developer"]
+    assert len(index) == 1
+
+
+def test_pruned_postings_leave_the_index_and_its_statistics(store, tmp_path):
+    put(store, "1", "Python Developer", "Python services")
+    put(store, "2", "Python Analyst", "Python reports")
+    put(store, "3", "Go Developer", "Go services")
+    index = JobIndex(str(tmp_path / "index"))
+    index.sync(store)
+    before = dict((document["title"], score) for document, score in index.search("python"))["Python Developer"]
+
+    store.put("https://www.linkedin.com/jobs/view/1", "Python services", title="Python Developer")
+    store._conn.execute("UPDATE postings SET checked_at = 0 WHERE key != ?",
+                        (posting_key("https://www.linkedin.com/jobs/view/1"),))
+    store.prune()
+    index.sync(store)
+
+    assert titles(index.search("python")) == ["Python Developer"]
+    assert index.search("go") == []
+    assert len(index) == 1
+    # Document frequencies only count live documents, so the score matches a freshly saved index
+    after = index.search("python")[0][1]
+    assert after != before
+    index.save()
+    reloaded = JobIndex(str(tmp_path / "index"))
+    assert reloaded.stats()["documents"] == 1
+    assert reloaded.search("python")[0][1] == pytest.approx(after)
+
+
+def test_save_and_reload_switches_generations(store, tmp_path):
+    path = str(tmp_path / "index")
+    put(store, "1", "Python Developer", "Build APIs in Python")
+    index = JobIndex(path)
+    index.sync(store)
+    index.save()
+    first = open(os.path.join(path, "CURRENT")).read()
+
+    time.sleep(0.01)
+    put(store, "1", "Python Lead", "Lead a Python team")
+    put(store, "2", "Java Engineer", "Spring services in Java")
+    index.sync(store)
+    index.save()
+    second = open(os.path.join(path, "CURRENT")).read()
+
+    assert first != second
+    assert [name for name in os.listdir(path) if name.startswith("gen-")] == [second]
+
+    reloaded = JobIndex(path)
+    assert reloaded.stats()["documents"] == 2
+    assert titles(reloaded.search("python")) == ["Python Lead"]
+    assert titles(reloaded.search("java")) == ["Java Engineer"]
+    # Syncing again re-reads nothing older than the save
+    reloaded.sync(store)
+    assert reloaded.stats()["unsaved"] == 0
+
+
+def test_sync_saves_once_flush_every_postings_accumulate(store, tmp_path):
+    path = str(tmp_path / "index")
+    for number in range(3):
+        put(store, str(number), f"Python Developer {number}", "Python")
+    index = JobIndex(path, flush_every=3)
+    index.sync(store)
+
+    assert index.stats()["unsaved"] == 0
+    assert os.path.exists(os.path.join(path, "CURRENT"))
+
+
+def test_location_filter_matches_contained_words_and_remote(store, tmp_path):
+    put(store, "1", "Python Developer", "Python", location="Seattle, WA")
+    put(store, "2", "Python Engineer", "Python", location="Portland, OR")
+    put(store, "3", "Python Consultant", "Python", location="Remote")
+    index = JobIndex(str(tmp_path / "index"))
+    index.sync(store)
+
+    assert set(titles(index.search("python", location="Seattle"))) == {"Python Developer", "Python Consultant"}
+    assert set(titles(index.search("python", location="Portland, OR"))) == {"Python Engineer", "Python Consultant"}
+    assert len(index.search("python")) == 3
+    assert titles(index.search("python", location="Boston")) == ["Python Consultant"]
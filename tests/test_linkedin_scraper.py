@@ -0,0 +1,124 @@
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from benchmarks.linkedin_standin import start_standin
+from linkedin_scraper import LinkedInScraper
+
+DOMAIN_INFO = {"type": "technical", "industry": "general"}
+
+
+@pytest.fixture
+def standin():
+    servers = []
+
+    def start(**kwargs):
+        server, base_url = start_standin(**kwargs)
+        servers.append(server)
+        return base_url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+# A scraper that records the URL of every request it makes, by kind ("search" or "job")
+class RecordingScraper(LinkedInScraper):
+    def __init__(self, base_url):
+        super().__init__(base_url, requests_per_second=1000, burst=100, max_retries=0)
+        self.requests = {"search": [], "job": []}
+
+    def fetch(self, url, headers=None, kind="job"):
+        self.requests[kind].append(url)
+        return super().fetch(url, headers=headers, kind=kind)
+
+    def search_starts(self):
+        return sorted(int(parse_qs(urlsplit(url).query).get("start", ["0"])[0]) for url in self.requests["search"])
+
+
+def job_id(job):
+    return job["Job Link"].split("?")[0].rsplit("-", 1)[-1]
+
+
+# 1-based position of a card in the search results, from its link
+def position(job):
+    return int(parse_qs(urlsplit(job["Job Link"]).query)["position"][0])
+
+
+def test_pages_through_results_with_start_offsets(standin):
+    scraper = RecordingScraper(standin(cards_per_page=5, job_pool_size=100_000))
+
+    jobs = list(scraper.iter_jobs(["python developer"], ["Seattle"], DOMAIN_INFO, max_pages=3, hydrate=False))
+
+    assert scraper.search_starts() == [0, 5, 10]
+    # Cards repeating an earlier title and company are dropped, so a page can bring fewer than 5
+    assert {(position(job) - 1) // 5 for job in jobs} == {0, 1, 2}
+    assert scraper.requests["job"] == []
+
+
+def test_lazy_mode_yields_cards_without_descriptions(standin):
+    scraper = RecordingScraper(standin(cards_per_page=4, job_pool_size=100_000))
+
+    jobs = list(scraper.iter_jobs(["data analyst"], ["Remote"], DOMAIN_INFO, max_pages=1, hydrate=False))
+
+    assert len(jobs) == 4
+    assert all(job["Description"] is None for job in jobs)
+    assert all(job["Search Term"] == "data analyst" and job["Location"] == "Remote" for job in jobs)
+    assert scraper.requests["job"] == []
+
+
+def test_hydrated_jobs_carry_their_description(standin):
+    scraper = RecordingScraper(standin(cards_per_page=3, job_pool_size=100_000))
+
+    jobs = list(scraper.iter_jobs(["data analyst"], ["Remote"], DOMAIN_INFO, max_pages=1))
+
+    assert len(jobs) == 3
+    assert all("Requirements" in job["Description"] for job in jobs)
+    assert len(scraper.requests["job"]) == 3
+
+
+def test_stops_fetching_once_enough_jobs_arrived(standin):
+    scraper = RecordingScraper(standin(cards_per_page=10, job_pool_size=100_000))
+    received = []
+
+    for job in scraper.iter_jobs(["python developer"], ["Seattle"], DOMAIN_INFO, max_pages=3,
+                                 needed=lambda search_term: 3 - len(received)):
+        received.append(job)
+
+    assert len(received) == 3
+    assert len(scraper.requests["job"]) == 3
+    assert scraper.search_starts() == [0]
+
+
+def test_lazy_mode_stops_paging_once_enough_cards_arrived(standin):
+    scraper = RecordingScraper(standin(cards_per_page=5, job_pool_size=100_000))
+    received = []
+
+    for job in scraper.iter_jobs(["python developer"], ["Seattle"], DOMAIN_INFO, max_pages=5, hydrate=False,
+                                 needed=lambda search_term: 7 - len(received)):
+        received.append(job)
+
+    assert scraper.search_starts() == [0, 5]
+    assert 7 <= len(received) <= 10
+
+
+def test_drops_duplicate_cards_across_pages_and_stops_when_nothing_is_new(standin):
+    # A pool of 6 job IDs behind pages of 5 cards repeats jobs from one page to the next
+    scraper = RecordingScraper(standin(cards_per_page=5, job_pool_size=6))
+
+    jobs = list(scraper.iter_jobs(["python developer"], ["Seattle"], DOMAIN_INFO, max_pages=10, hydrate=False))
+
+    ids = [job_id(job) for job in jobs]
+    assert len(ids) == len(set(ids)) <= 6
+    # Paging ends on the first page that brings no new card, well before max_pages
+    assert len(scraper.requests["search"]) < 10
+
+
+def test_drops_duplicate_cards_across_search_terms(standin):
+    scraper = RecordingScraper(standin(cards_per_page=5, job_pool_size=4))
+
+    jobs = list(scraper.iter_jobs(["python developer", "python engineer"], ["Seattle"], DOMAIN_INFO, max_pages=2,
+                                  hydrate=False))
+
+    ids = [job_id(job) for job in jobs]
+    assert len(ids) == len(set(ids)) <= 4
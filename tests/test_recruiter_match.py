@@ -0,0 +1,71 @@
+import random
+
+from recruiter_match import shortlist_matches
+from skill_match import score_jobs
+
+SKILLS = ["Python", "SQL", "Spark", "AWS", "Tableau", "machine learning", "Excel", "Java", "Kubernetes", "dbt"]
+TITLES = ["Data Engineer", "Senior Data Scientist", "Junior Analyst", "Machine Learning Engineer", "Lead Java Developer"]
+INDUSTRIES = ["finance", "healthcare", "retail", "technology", ""]
+
+
+def make_pools(seed, candidate_count, job_count):
+    rng = random.Random(seed)
+    candidates = [
+        {
+            "Professional Skills": rng.sample(SKILLS, rng.randint(0, 5)),
+            "Related Job Titles": rng.sample(TITLES, rng.randint(0, 2)),
+            "Industries": rng.sample(INDUSTRIES[:-1], rng.randint(0, 2)),
+            "Experience Level": rng.choice([[], ["Junior"], ["Senior"], ["Executive"]]),
+            "Years of Experience": rng.choice([[], ["2 years"], ["7+ years"]]),
+        }
+        for _ in range(candidate_count)
+    ]
+    jobs = [{"Job Title": rng.choice(TITLES)} for _ in range(job_count)]
+    requirements = [
+        {
+            "required_skills": rng.sample(SKILLS, rng.randint(0, 4)),
+            "preferred_skills": rng.sample(SKILLS, rng.randint(0, 2)),
+            "seniority": rng.choice(["Unknown", "Mid", "Senior"]),
+            "industry": rng.choice(INDUSTRIES),
+            "min_years": rng.choice([None, 1, 5]),
+        }
+        for _ in range(job_count)
+    ]
+    return candidates, jobs, requirements
+
+
+# Best k (index, score) by score, lowest index first on ties
+def top_k(scores, k):
+    return sorted(enumerate(scores), key=lambda pair: (-pair[1], pair[0]))[:k]
+
+
+def test_shortlist_matches_brute_force_score_jobs():
+    candidates, jobs, requirements = make_pools(3, 23, 17)
+    by_candidate, by_job = shortlist_matches(candidates, jobs, requirements, top_k_per_job=4,
+                                             top_k_per_candidate=3, block_size=5)
+
+    scores = [
+        [match["score"] for match in score_jobs(jobs, requirements, attributes, [], {})]
+        for attributes in candidates
+    ]
+    assert by_candidate == [top_k(row, 3) for row in scores]
+    assert by_job == [top_k([row[job] for row in scores], 4) for job in range(len(jobs))]
+
+
+def test_shortlist_matches_with_fewer_items_than_k():
+    candidates, jobs, requirements = make_pools(5, 2, 3)
+    by_candidate, by_job = shortlist_matches(candidates, jobs, requirements, top_k_per_job=5, top_k_per_candidate=5)
+    assert [len(matches) for matches in by_candidate] == [3, 3]
+    assert [len(matches) for matches in by_job] == [2, 2, 2]
+
+
+def test_shortlist_matches_scores_with_each_candidates_domain():
+    candidates, jobs, requirements = make_pools(7, 4, 9)
+    domain_infos = [{"type": "technical", "industry": industry} for industry in ["finance", "healthcare", "general", "retail"]]
+    by_candidate, _ = shortlist_matches(candidates, jobs, requirements, top_k_per_candidate=9, domain_infos=domain_infos)
+
+    scores = [
+        [match["score"] for match in score_jobs(jobs, requirements, attributes, [], domain_info)]
+        for attributes, domain_info in zip(candidates, domain_infos)
+    ]
+    assert by_candidate == [top_k(row, 9) for row in scores]
@@ -0,0 +1,37 @@
+import os
+from datetime import date
+
+from resume_parser import parse_resume
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "resume.txt")
+# The fixture's current job runs "2019 - Present"
+TODAY = date(2026, 10, 1)
+
+
+def read_fixture():
+    with open(FIXTURE, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_well_formatted_resume_is_parsed_with_full_confidence():
+    parsed = parse_resume(read_fixture(), today=TODAY)
+
+    assert parsed["confidence"] == 1.0
+    assert [(job["title"], job["current"], job["level"]) for job in parsed["job_titles"]] == [
+        ("Senior Data Scientist", True, "Senior"),
+        ("Data Analyst", False, "unknown"),  # the title names no level
+        ("Junior Data Analyst", False, "Junior"),
+    ]
+    attributes = parsed["resume_attributes"]
+    assert {"Python", "SQL", "Spark"} <= set(attributes["Professional Skills"])
+    assert attributes["Experience Level"] == ["Senior"]
+    assert attributes["Years of Experience"] == ["12 years"]
+
+
+def test_unstructured_text_falls_back_to_claude():
+    assert parse_resume("Hello, I like building things and working with people.")["confidence"] < 0.75
+
+
+def test_open_ranges_count_up_to_the_given_date():
+    later = parse_resume(read_fixture(), today=date(TODAY.year + 3, TODAY.month, TODAY.day))
+    assert later["resume_attributes"]["Years of Experience"] == ["15 years"]
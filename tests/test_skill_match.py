@@ -0,0 +1,45 @@
+import pytest
+
+from skill_match import NEUTRAL, describe_match, rank_key, score_cards, score_jobs
+
+RESUME = {"Seniority": "Senior", "Industries": ["Software"], "Related Job Titles": []}
+JOB_TITLES = [{"title": "Python Developer"}]
+DOMAIN_INFO = {"type": "technical", "industry": "software"}
+
+
+def card_location_score(card_location, locations):
+    card = {"Job Title": "Python Developer", "Company": "Acme", "Location": card_location}
+    return score_cards([card], RESUME, JOB_TITLES, DOMAIN_INFO, locations)[0]["components"]["location"]
+
+
+@pytest.mark.parametrize("card_location, locations, expected", [
+    ("Seattle, WA", ["Seattle"], 1.0),
+    ("Portland, OR", ["Seattle"], 0.0),
+    ("Remote", ["Seattle"], 1.0),
+    ("Seattle, WA (Remote)", ["Remote"], 1.0),
+    # Remote postings often only name the country they hire in
+    ("United States", ["Remote"], NEUTRAL),
+    ("United States", ["Seattle"], NEUTRAL),
+    ("Portland, OR", ["Remote"], NEUTRAL),
+    ("Portland, OR", [], NEUTRAL),
+])
+def test_card_location_score(card_location, locations, expected):
+    assert card_location_score(card_location, locations) == expected
+
+
+def test_jobs_without_requirements_are_unscored_and_ranked_last():
+    jobs = [
+        {"Job Title": "Python Developer", "Company": "Acme", "Location": "Seattle, WA"},
+        {"Job Title": "Java Engineer", "Company": "Globex", "Location": "Seattle, WA"},
+    ]
+    requirements = [{}, {"required_skills": ["Java", "Spring"], "industry": "Finance"}]
+    resume = dict(RESUME, **{"Professional Skills": ["Python"]})
+
+    matches = score_jobs(jobs, requirements, resume, JOB_TITLES, DOMAIN_INFO)
+    assert [match["scored"] for match in matches] == [False, True]
+    # On its title alone the unscored job would come first
+    assert matches[0]["score"] > matches[1]["score"]
+    assert "No requirements" in describe_match(matches[0], resume)[0]
+
+    ranked = sorted(({"score": match["score"], "match": match} for match in matches), key=rank_key)
+    assert [entry["match"]["scored"] for entry in ranked] == [True, False]
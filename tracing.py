@@ -0,0 +1,315 @@
+import contextvars
+import functools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+# Lightweight tracing for the analysis pipeline.
+# A Trace collects what one analysis spent its time on: timed spans for pipeline stages, every
+# Claude request (latency, queueing and token usage), every HTTP request (status and latency) and
+# cache hits and misses. The active trace lives in a context variable, so it follows the work into
+# stage, scoring and scraping worker threads (they run in a copy of the caller's context).
+# Every event is also added to process-wide metrics that can be exported in the Prometheus text format.
+logger = logging.getLogger("resume_core.tracing")
+current_trace = contextvars.ContextVar("current_trace", default=None)
+
+# Optional exports for dashboards: every finished trace is appended to TRACE_LOG as JSON lines
+# and the process metrics are rewritten to METRICS_FILE in the Prometheus text format
+TRACE_LOG = os.environ.get("RESUME_MATCH_TRACE_LOG")
+METRICS_FILE = os.environ.get("RESUME_MATCH_METRICS_FILE")
+_export_lock = threading.Lock()
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Trace:
+    def __init__(self, name="analysis"):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.started_at = time.time()
+        self.seconds = None
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans = []
+        self.claude_calls = []
+        self.http_requests = []
+        self.prompt_budgets = []
+        self.cache_events = {}
+
+    def offset(self):
+        return round(time.perf_counter() - self._start, 6)
+
+    def add(self, kind, event):
+        with self._lock:
+            getattr(self, kind).append(event)
+
+    def count_cache_event(self, cache, outcome):
+        with self._lock:
+            outcomes = self.cache_events.setdefault(cache, {})
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    def finish(self):
+        self.seconds = round(time.perf_counter() - self._start, 6)
+
+    # Totals for display: seconds per stage, Claude requests and tokens, HTTP requests by status
+    # and hit rate per cache
+    def summary(self):
+        with self._lock:
+            spans = list(self.spans)
+            claude_calls = list(self.claude_calls)
+            http_requests = list(self.http_requests)
+            prompt_budgets = list(self.prompt_budgets)
+            cache_events = {cache: dict(outcomes) for cache, outcomes in self.cache_events.items()}
+
+        stages = {}
+        for span in spans:
+            stages[span["name"]] = round(stages.get(span["name"], 0.0) + span["seconds"], 6)
+
+        http_status = {}
+        for request in http_requests:
+            http_status[str(request["status"])] = http_status.get(str(request["status"]), 0) + 1
+        http_seconds = sorted(request["seconds"] for request in http_requests)
+
+        caches = {}
+        for cache, outcomes in cache_events.items():
+            total = sum(outcomes.values())
+            hits = total - outcomes.get("misses", 0)
+            caches[cache] = {**outcomes, "hit_rate": hits / total if total else 0.0}
+
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "seconds": self.seconds if self.seconds is not None else self.offset(),
+            "stages": stages,
+            "claude_requests": len(claude_calls),
+            "claude_seconds": round(sum(call["seconds"] for call in claude_calls), 6),
+            "claude_wait_seconds": round(sum(call["wait_seconds"] for call in claude_calls), 6),
+            "input_tokens": sum(call["input_tokens"] for call in claude_calls),
+            "output_tokens": sum(call["output_tokens"] for call in claude_calls),
+            "http_requests": len(http_requests),
+            "http_status": http_status,
+            "http_p50_seconds": http_seconds[len(http_seconds) // 2] if http_seconds else 0.0,
+            "http_max_seconds": http_seconds[-1] if http_seconds else 0.0,
+            "prompt_tokens_original": sum(budget["original_tokens"] for budget in prompt_budgets),
+            "prompt_tokens_saved": sum(budget["original_tokens"] - budget["sent_tokens"] for budget in prompt_budgets),
+            "caches": caches,
+        }
+
+    # One JSON object per event plus a closing summary record, all tagged with the trace ID
+    def to_jsonl(self):
+        base = {"trace_id": self.trace_id, "trace": self.name, "started_at": self.started_at}
+        with self._lock:
+            events = (
+                [{"type": "span", **span} for span in self.spans]
+                + [{"type": "claude", **call} for call in self.claude_calls]
+                + [{"type": "http", **request} for request in self.http_requests]
+                + [{"type": "prompt_budget", **budget} for budget in self.prompt_budgets]
+            )
+        events.sort(key=lambda event: event["start"])
+        lines = [json.dumps({**base, **event}) for event in events]
+        lines.append(json.dumps({**base, "type": "summary", **self.summary()}))
+        return "\n".join(lines) + "\n"
+
+    def append_jsonl(self, path):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(self.to_jsonl())
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Process-wide counters and latency histograms, exported in the Prometheus text format
+class Metrics:
+    def __init__(self, prefix="resume_match"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._help = {}
+
+    def inc(self, name, help_text, value=1, **labels):
+        key = (name, tuple(sorted((label, str(label_value)) for label, label_value in labels.items())))
+        with self._lock:
+            self._help[name] = ("counter", help_text)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, help_text, seconds, **labels):
+        key = (name, tuple(sorted((label, str(label_value)) for label, label_value in labels.items())))
+        with self._lock:
+            self._help[name] = ("histogram", help_text)
+            histogram = self._histograms.setdefault(key, [[0] * len(LATENCY_BUCKETS), 0, 0.0])
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    histogram[0][index] += 1
+            histogram[1] += 1
+            histogram[2] += seconds
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def prometheus_text(self):
+        def render_labels(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, (list(buckets), count, total)) for key, (buckets, count, total) in self._histograms.items())
+            help_texts = dict(self._help)
+
+        lines = []
+        for name in sorted(help_texts):
+            metric_type, help_text = help_texts[name]
+            full_name = f"{self.prefix}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {metric_type}")
+            if metric_type == "counter":
+                for (counter_name, labels), value in counters:
+                    if counter_name == name:
+                        lines.append(f"{full_name}{render_labels(labels)} {value}")
+            else:
+                for (histogram_name, labels), (buckets, count, total) in histograms:
+                    if histogram_name != name:
+                        continue
+                    for bound, bucket_count in zip(LATENCY_BUCKETS, buckets):
+                        lines.append(f"{full_name}_bucket{render_labels(labels, [('le', bound)])} {bucket_count}")
+                    lines.append(f"{full_name}_bucket{render_labels(labels, [('le', '+Inf')])} {count}")
+                    lines.append(f"{full_name}_sum{render_labels(labels)} {round(total, 6)}")
+                    lines.append(f"{full_name}_count{render_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    # Atomically replace path with the current metrics (for node_exporter's textfile collector)
+    def write_prometheus_textfile(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp", delete=False, encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(f.name, path)
+
+
+metrics = Metrics()
+
+
+# Make a new trace current until finish_trace is called with it (from the same context)
+def start_trace(name="analysis"):
+    active = Trace(name)
+    active.token = current_trace.set(active)
+    return active
+
+
+def finish_trace(active):
+    active.finish()
+    current_trace.reset(active.token)
+    try:
+        with _export_lock:
+            if TRACE_LOG:
+                active.append_jsonl(TRACE_LOG)
+            if METRICS_FILE:
+                metrics.write_prometheus_textfile(METRICS_FILE)
+    except OSError as e:
+        logger.warning(f"Could not export trace {active.trace_id}: {e}")
+
+
+# Make a new trace current for the duration of the block
+@contextmanager
+def trace(name="analysis"):
+    active = start_trace(name)
+    try:
+        yield active
+    finally:
+        finish_trace(active)
+
+
+# Time a block as a pipeline stage
+@contextmanager
+def span(name, **attributes):
+    active = current_trace.get()
+    start_offset = active.offset() if active else 0.0
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        metrics.observe("stage_seconds", "Wall time of pipeline stages", seconds, stage=name)
+        if active:
+            event = {"name": name, "start": start_offset, "seconds": round(seconds, 6), **attributes}
+            if error:
+                event["error"] = error
+            active.add("spans", event)
+
+
+# Decorator form of span, named after the function
+def traced(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def record_claude_call(function, model, seconds, wait_seconds=0.0, input_tokens=0, output_tokens=0, error=None):
+    outcome = "error" if error else "ok"
+    metrics.inc("claude_requests_total", "Claude requests by function and outcome", function=function, outcome=outcome)
+    metrics.inc("claude_tokens_total", "Claude tokens by function and direction", input_tokens,
+                function=function, direction="input")
+    metrics.inc("claude_tokens_total", "Claude tokens by function and direction", output_tokens,
+                function=function, direction="output")
+    metrics.observe("claude_request_seconds", "Latency of Claude requests", seconds, function=function)
+    metrics.observe("claude_wait_seconds", "Time Claude requests waited for a concurrency slot", wait_seconds,
+                    function=function)
+    active = current_trace.get()
+    if active:
+        event = {
+            "function": function, "model": model, "start": round(active.offset() - seconds, 6),
+            "seconds": round(seconds, 6), "wait_seconds": round(wait_seconds, 6),
+            "input_tokens": input_tokens, "output_tokens": output_tokens,
+        }
+        if error:
+            event["error"] = error
+        active.add("claude_calls", event)
+
+
+def record_http_request(kind, host, status, seconds, attempt=0):
+    metrics.inc("http_requests_total", "HTTP requests by kind and status", kind=kind, status=status)
+    metrics.observe("http_request_seconds", "Latency of HTTP requests", seconds, kind=kind)
+    active = current_trace.get()
+    if active:
+        active.add("http_requests", {
+            "kind": kind, "host": host, "status": status, "start": round(active.offset() - seconds, 6),
+            "seconds": round(seconds, 6), "attempt": attempt,
+        })
+
+
+# Estimated tokens of text before and after it was fitted into a prompt budget
+def record_prompt_budget(function, original_tokens, sent_tokens):
+    metrics.inc("prompt_tokens_total", "Estimated prompt text tokens by function, before and after budgeting",
+                original_tokens, function=function, stage="original")
+    metrics.inc("prompt_tokens_total", "Estimated prompt text tokens by function, before and after budgeting",
+                sent_tokens, function=function, stage="sent")
+    active = current_trace.get()
+    if active:
+        active.add("prompt_budgets", {
+            "function": function, "start": active.offset(),
+            "original_tokens": original_tokens, "sent_tokens": sent_tokens,
+        })
+
+
+def record_cache_event(cache, outcome):
+    metrics.inc("cache_events_total", "Cache lookups by cache and outcome", cache=cache, outcome=outcome)
+    active = current_trace.get()
+    if active:
+        active.count_cache_event(cache, outcome)